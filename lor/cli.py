@@ -9,14 +9,29 @@ This CLI provides multiple subcommands for managing letters of recommendation:
 
 import logging
 import click
+from click.core import ParameterSource
 import pathlib
 from dotenv import load_dotenv
 
-from lor.redact_student_info import process_all
-from lor.extract_style import extract_style_guide
-from lor.synthesize_packet import synthesize_student_packet
-from lor.generate_letter import generate_letter
-from lor.file_utils import convert_markdown_to_docx
+from lor.redact_student_info import process_all, REDACTION_MODES
+from lor.leak_scanner import verify_redaction
+from lor.extract_style import extract_style_guide, DEFAULT_TOKEN_BUDGET, STRATEGIES as STYLE_STRATEGIES
+from lor.synthesize_packet import synthesize_student_packet, DEFAULT_CONDENSE_MODEL, DEFAULT_MATERIALS_TOKEN_BUDGET
+from lor.generate_letter import generate_letter, generate_letters, parse_targets
+from lor.student_packet import LETTER_TYPES
+from lor.file_utils import (
+    convert_markdown_to_docx,
+    find_docx_files,
+    configure_pdf_backend,
+    parse_pdf_page_ranges,
+    DEFAULT_PDF_BACKEND,
+    PDF_BACKENDS,
+)
+from lor.docx_bench import benchmark_docx_conversion, format_docx_results, DEFAULT_REPEAT
+from lor.transcript_bench import benchmark_transcript_parser, format_transcript_results
+from lor.pdf_bench import benchmark_pdf_backends, format_results, recommend_backend, DEFAULT_MIN_TOKEN_RATIO
+from lor.llm import configure_cache, get_cache
+from lor.llm_scheduler import configure_scheduler, parse_model_limits, DEFAULT_MAX_IN_FLIGHT
 
 # Load environment variables
 load_dotenv()
@@ -31,20 +46,59 @@ logger = logging.getLogger(__name__)
 
 @click.group()
 @click.version_option(version="0.1.0")
-def cli():
+@click.option('--cache/--no-cache', default=False, envvar='LOR_CACHE', help='Reuse identical LLM responses from the on-disk cache (or set LOR_CACHE=1)')
+@click.option('--refresh', is_flag=True, help='Ignore cached LLM responses but store the fresh ones')
+@click.option('--cache-dir', default='data/cache/llm/', envvar='LOR_CACHE_DIR', type=click.Path(), help='Directory for cached LLM responses')
+@click.option('--max-in-flight', default=DEFAULT_MAX_IN_FLIGHT, envvar='LOR_MAX_IN_FLIGHT', type=click.IntRange(min=1), help='Maximum number of concurrent LLM requests')
+@click.option('--model-limit', multiple=True, metavar='MODEL=N', help='Per-model concurrency cap (repeatable)')
+@click.option('--pdf-backend', default=DEFAULT_PDF_BACKEND, envvar='LOR_PDF_BACKEND', type=click.Choice(list(PDF_BACKENDS)), help='PDF text extraction backend (compare them with bench-pdf)')
+def cli(cache, refresh, cache_dir, max_in_flight, model_limit, pdf_backend):
     """
     Letter of Recommendation Tools
 
     A collection of utilities for managing letters of recommendation,
     including student information redaction and document processing.
+
+    Identical LLM requests (same model, messages and temperature) can be
+    served from a persistent cache with --cache, which makes re-running a
+    phase after a crash nearly free. Use --refresh to force new responses.
+
+    Batch work is sent to the provider concurrently, at most --max-in-flight
+    requests at a time (and at most N per model for each --model-limit).
+
+    PDFs are read with --pdf-backend (or LOR_PDF_BACKEND); run bench-pdf to
+    find the fastest backend that extracts your documents completely.
     """
-    pass
+    configure_cache(enabled=cache or refresh, cache_dir=pathlib.Path(cache_dir), refresh=refresh)
+    try:
+        model_limits = parse_model_limits(model_limit)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint='--model-limit')
+    configure_scheduler(max_in_flight=max_in_flight, per_model_limits=model_limits)
+    try:
+        configure_pdf_backend(pdf_backend)
+    except ImportError as e:
+        raise click.BadParameter(str(e), param_hint='--pdf-backend')
+
+
+@cli.result_callback()
+def log_cache_stats(*args, **kwargs):
+    """Report LLM cache effectiveness once a command finishes."""
+    cache = get_cache()
+    if cache is not None:
+        stats = cache.stats()
+        logger.info(f"LLM cache: {stats['hits']} hit(s), {stats['misses']} miss(es), {stats['writes']} write(s)")
 
 
 @cli.command()
 @click.option('--in-path', default='data/original_letters/', type=click.Path(exists=True), help='Input directory or file containing .docx files')
 @click.option('--out-path', default='data/redacted_letters/', type=click.Path(), help='Output directory for redacted .md files')
-def redact(in_path, out_path):
+@click.option('--workers', default=1, type=click.IntRange(min=1), help='Number of documents to convert and redact in parallel')
+@click.option('--mode', default='rewrite', type=click.Choice(REDACTION_MODES), help='rewrite: LLM returns the whole redacted document; spans: LLM returns only the replacements, applied locally')
+@click.option('--pre-redact', is_flag=True, help='Redact emails, IDs, phone numbers and the student name locally first; only ambiguous paragraphs go to the LLM')
+@click.option('--force', is_flag=True, help='Redact every document, even ones unchanged since the last run')
+@click.option('--chunk-tokens', default=0, type=click.IntRange(min=0), help='Split documents longer than this many tokens into chunks redacted concurrently (0 disables)')
+def redact(in_path, out_path, workers, mode, pre_redact, chunk_tokens, force):
     """
     Redact student information from Word documents.
 
@@ -59,19 +113,65 @@ def redact(in_path, out_path):
     2. Use an LLM to identify and redact student information
     3. Save redacted content as .md files in OUT_PATH
 
+    Documents unchanged since the last run (same content, prompt, options and
+    model) are skipped, and outputs whose source .docx was deleted are removed.
+    Use --force to redact everything again.
+
     Examples:
 
         lor redact letter.docx
 
         lor redact ./letters/
+
+        lor redact ./letters/ --workers 8
+
+        lor redact ./letters/ --mode spans --pre-redact
+
+        lor redact letter_bundle.docx --chunk-tokens 2000
     """
-    process_all(in_path, out_path)
+    success_count, failure_count = process_all(
+        in_path, out_path, workers=workers, mode=mode, pre_redact=pre_redact,
+        chunk_tokens=chunk_tokens, force=force,
+    )
+    if failure_count:
+        raise click.ClickException(f"{failure_count} of {success_count + failure_count} document(s) failed to redact")
+
+
+@cli.command(name='verify-redaction')
+@click.option('--original-path', default='data/original_letters/', type=click.Path(exists=True), help='Original .docx file or directory')
+@click.option('--redacted-path', default='data/redacted_letters/', type=click.Path(exists=True), help='Directory of redacted .md files')
+@click.option('--workers', default=1, type=click.IntRange(min=1), help='Number of processes for converting the originals')
+def verify_redaction_cmd(original_path, redacted_path, workers):
+    """
+    Check redacted letters for student information that survived redaction.
+
+    Student names, emails, phone numbers and IDs are collected from every
+    original .docx, along with the words its redaction replaced with
+    placeholders, and searched for in every redacted .md file in a single
+    pass. Each leak is reported with its file and line; the command exits
+    non-zero if any are found.
+
+    Examples:
+
+        lor verify-redaction
+
+        lor verify-redaction --original-path ./letters/ --redacted-path ./redacted/
+    """
+    leaks = verify_redaction(pathlib.Path(original_path), pathlib.Path(redacted_path), workers=workers)
+    for leak in leaks:
+        click.echo(str(leak))
+    if leaks:
+        raise click.ClickException(f"Found {len(leaks)} leaked identifier(s)")
+    logger.info("No leaked identifiers found")
 
 
 @cli.command()
 @click.option('--redacted_letters_dir', default='data/redacted_letters/', type=click.Path(exists=True))
 @click.option('--output', default='data/style_guide/', type=click.Path(), help='Output directory for style_guide.md')
-def extract_style(redacted_letters_dir, output):
+@click.option('--token-budget', default=DEFAULT_TOKEN_BUDGET, type=click.IntRange(min=1000), help='Largest prompt (in tokens) to send in one call')
+@click.option('--strategy', default='auto', type=click.Choice(STYLE_STRATEGIES), help='single: one call with every letter; map-reduce: batch notes merged into the guide; sample: a representative subset without near-duplicates that fits the budget; stats: that subset plus local corpus statistics; auto: single if the letters fit the budget, else map-reduce')
+@click.option('--incremental', is_flag=True, help='Merge only letters added or changed since the last run into the existing style guide')
+def extract_style(redacted_letters_dir, output, token_budget, strategy, incremental):
     """
     Extract writing style guide from redacted letters.
 
@@ -89,18 +189,46 @@ def extract_style(redacted_letters_dir, output):
     - Letter structure patterns (opening, body, closing)
     - Example excerpts (reusable phrases with placeholders)
 
+    When the letters don't fit in one prompt, they are analyzed concurrently
+    in batches sized to the token budget, and the per-batch notes are merged
+    into the style guide. Batch notes are cached under OUTPUT/.style_notes/,
+    so an interrupted run resumes where it stopped. --strategy sample instead
+    drops near-duplicate letters and sends a diverse subset that fits the
+    budget; --strategy stats adds sentence/paragraph lengths, common phrases
+    and opening/closing lines computed locally over every letter.
+
+    Each run records which letters the style guide was built from. With
+    --incremental, only letters added or changed since then are analyzed and
+    merged into the existing style_guide.md, keeping any hand edits. A guide
+    with no record yet has every letter merged into it.
+
     Examples:
 
         lor extract-style data/redacted_letters/
 
+        lor extract-style data/redacted_letters/ --incremental
+
         lor extract-style data/redacted_letters/ --output custom_output/
     """
-    extract_style_guide(pathlib.Path(redacted_letters_dir), pathlib.Path(output))
+    extract_style_guide(
+        pathlib.Path(redacted_letters_dir),
+        pathlib.Path(output),
+        token_budget=token_budget,
+        strategy=strategy,
+        incremental=incremental,
+    )
 
 
 @cli.command()
 @click.argument('student_dir', type=click.Path(exists=True))
-def packet(student_dir):
+@click.option('--workers', default=None, type=click.IntRange(min=1), help='Number of materials to convert at once (default: CPU count)')
+@click.option('--pdf-workers', default=1, type=click.IntRange(min=1), help='Number of processes to extract PDF pages with')
+@click.option('--pdf-pages', multiple=True, metavar='MATERIAL=RANGE', help="Only extract these pages of a material's PDF, e.g. resume=1-2 (repeatable)")
+@click.option('--materials-token-budget', default=DEFAULT_MATERIALS_TOKEN_BUDGET, type=click.IntRange(min=1000), help='Tokens of materials to send for synthesis; larger materials are condensed first')
+@click.option('--condense-model', default=DEFAULT_CONDENSE_MODEL, help='Model for condensing oversized materials')
+@click.option('--raw-transcript', is_flag=True, help='Send the transcript text as extracted instead of the locally parsed course table')
+@click.option('--force', is_flag=True, help='Synthesize the whole packet even if only some sections are affected by changes')
+def packet(student_dir, workers, pdf_workers, pdf_pages, materials_token_budget, condense_model, raw_transcript, force):
     """
     Synthesize student packet from application materials.
 
@@ -113,8 +241,12 @@ def packet(student_dir):
         ├── transcript.pdf (or .docx, .txt)
         ├── accomplishments.txt (or .pdf, .docx)
         ├── statement.pdf (or .docx, .txt)
+        ├── paper_1.pdf, paper_2.pdf, ... (optional, any number)
         └── professor_notes.md (REQUIRED - use templates/professor_notes.md as starting point)
 
+    Any material may come as several numbered files (statement_1.pdf,
+    statement_2.pdf); each is converted and included.
+
     IMPORTANT: Before running this command, you must:
     1. Copy templates/professor_notes.md to student_dir/input/professor_notes.md
     2. Fill in the professor notes with your observations and assessment
@@ -122,7 +254,8 @@ def packet(student_dir):
     The script will:
     1. Find and convert all materials to markdown (saved in student_dir/markdown/)
     2. Send materials to LLM for analysis and extraction
-    3. Generate structured student packet (saved as student_dir/student_packet.md)
+    3. Generate structured student packet (saved as student_dir/student_packet.md,
+       with its sections in student_dir/student_packet.json)
 
     The generated packet includes:
     - Student Profile (metadata, including pronouns from professor notes)
@@ -135,20 +268,55 @@ def packet(student_dir):
 
     After generation, review the packet and verify all information is accurate.
 
+    PDF and DOCX materials are converted concurrently (--workers at a time).
+    Long PDFs are extracted page-parallel with --pdf-workers; --pdf-pages limits
+    a material to the pages that matter (e.g. the first two pages of a long CV).
+    Materials that don't fit their share of --materials-token-budget (a long
+    transcript or publication list) are condensed concurrently with
+    --condense-model first; professor notes are always sent in full.
+    The transcript is parsed locally into a compact per-term course table
+    that replaces its raw text in the prompt (--raw-transcript to disable);
+    a transcript the parser can't read confidently is sent as is.
+
+    Re-running on a student with a packet regenerates only the sections
+    whose materials changed (e.g. editing the Key Strengths in
+    professor_notes.md rewrites just the Strengths section) and splices them
+    into student_packet.md, keeping your edits to the other sections. Use
+    --force for a complete re-synthesis.
+
     Examples:
 
         lor synthesize-packet data/students/jane_smith/
 
         lor synthesize-packet data/students/john_doe/
+
+        lor packet data/students/john_doe/ --pdf-workers 4 --pdf-pages resume=1-2
     """
-    synthesize_student_packet(pathlib.Path(student_dir))
+    try:
+        pdf_page_ranges = parse_pdf_page_ranges(pdf_pages)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint='--pdf-pages')
+    synthesize_student_packet(
+        pathlib.Path(student_dir),
+        pdf_page_ranges,
+        pdf_workers,
+        workers,
+        materials_token_budget=materials_token_budget,
+        condense_model=condense_model,
+        parse_transcript=not raw_transcript,
+        force=force,
+    )
 
 
 @cli.command()
 @click.argument('student_dir', type=click.Path(exists=True))
 @click.option('--style-guide', default='data/style_guide/style_guide.md', type=click.Path(exists=True), help='Path to style guide')
 @click.option('--output', default='letter_draft.md', help='Output filename')
-def letter(student_dir, style_guide, output):
+@click.option('--letter-type', type=click.Choice(LETTER_TYPES), default=None, help="Packet sections to send: phd, ms, job or full (default: from the packet's Letter Type)")
+@click.option('--targets', default=None, metavar='TYPE|NAME=TYPE,...', help='Write one letter per target concurrently, e.g. phd,ms,google=job (saved as letter_<name>.md)')
+@click.option('--warm-cache', is_flag=True, help='With --targets, send the first letter alone so the others reuse its cached prompt prefix')
+@click.option('--stream', is_flag=True, help='Show the letter as it is written and save it progressively (Ctrl-C cancels, keeping any previous draft)')
+def letter(student_dir, style_guide, output, letter_type, targets, warm_cache, stream):
     """
     Generate letter of recommendation for a student.
 
@@ -163,6 +331,26 @@ def letter(student_dir, style_guide, output):
     5. Save as markdown in student_dir/output/
     6. Convert to DOCX
 
+    Only the packet sections the letter type needs are sent, read from
+    student_packet.json (rebuilt from student_packet.md if you edited it):
+    PhD and MS letters leave out Additional Information, job letters leave
+    out Goals. The type comes from the packet's Letter Type unless
+    --letter-type is given; --letter-type full sends every section.
+
+    --targets writes several letters at once (e.g. phd,ms,job), concurrently.
+    All of them are sent the same template, style guide and packet ahead of
+    their own target line, so the provider's prompt cache can serve that
+    prefix after the first request; cached prompt tokens are logged for each
+    letter. Add --warm-cache to send the first letter alone before the rest,
+    so the others don't race a cold cache. Each target names its own letter
+    type and is saved as output/letter_<name>.md, so --letter-type and
+    --output can't be combined with --targets.
+
+    --stream prints the letter to the terminal as it is generated and writes
+    it to output/<output>.tmp as it arrives, renamed into place when complete.
+    The opening paragraphs appear within seconds; press Ctrl-C to cancel a
+    draft that is going wrong, which leaves any previous draft untouched.
+
     Prerequisites:
     - Style guide must exist (from Phase 1: lor extract-style)
     - Student packet must exist (from Phase 2: lor synthesize-packet)
@@ -186,14 +374,52 @@ def letter(student_dir, style_guide, output):
 
         # Custom output filename
         lor generate-letter data/students/jane_smith/ --output letter_stanford.md
+
+        # Send every packet section
+        lor letter data/students/jane_smith/ --letter-type full
+
+        # PhD, MS and job letters in one go
+        lor letter data/students/jane_smith/ --targets phd,ms,google=job
+
+        # Watch the letter being written
+        lor letter data/students/jane_smith/ --stream
     """
     student_path = pathlib.Path(student_dir)
+    if targets is not None and stream:
+        raise click.UsageError("--stream writes a single letter; it can't be combined with --targets")
+    if targets is not None and letter_type is not None:
+        raise click.UsageError("--targets sets each letter's type; it can't be combined with --letter-type")
+    if targets is not None and click.get_current_context().get_parameter_source('output') != ParameterSource.DEFAULT:
+        raise click.UsageError("--targets saves each letter as letter_<name>.md; it can't be combined with --output")
+    if targets is not None:
+        try:
+            parsed_targets = parse_targets(targets)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint='--targets')
+        try:
+            letter_paths = generate_letters(
+                student_path,
+                pathlib.Path(style_guide),
+                parsed_targets,
+                warm_cache=warm_cache,
+            )
+        except RuntimeError as e:
+            raise click.ClickException(str(e))
+        for letter_path in letter_paths.values():
+            logger.info(f"DOCX saved to: {convert_markdown_to_docx(letter_path)}")
+        return
+
     # Generate letter
     letter_path = generate_letter(
         student_path,
         style_guide_path=pathlib.Path(style_guide),
-        output_filename=output
+        output_filename=output,
+        letter_type=letter_type,
+        stream=stream,
+        on_text=lambda text: click.echo(text, nl=False),
     )
+    if stream:
+        click.echo()
     logger.info("\nConverting to DOCX format...")
     docx_path = convert_markdown_to_docx(letter_path)
     logger.info(f"DOCX saved to: {docx_path}")
@@ -203,7 +429,8 @@ def letter(student_dir, style_guide, output):
 @click.argument('student_dir', type=click.Path(exists=True))
 @click.option('--style-guide', default='data/style_guide/style_guide.md', type=click.Path(exists=True), help='Path to style guide')
 @click.option('--output', default='letter_draft.md', help='Output filename')
-def packet_and_letter(student_dir, style_guide, output):
+@click.option('--letter-type', type=click.Choice(LETTER_TYPES), default=None, help="Packet sections to send: phd, ms, job or full (default: from the packet's Letter Type)")
+def packet_and_letter(student_dir, style_guide, output, letter_type):
     """
     Synthesize student packet and generate letter in one command.
 
@@ -238,6 +465,7 @@ def packet_and_letter(student_dir, style_guide, output):
         student_path,
         style_guide_path=pathlib.Path(style_guide),
         output_filename=output,
+        letter_type=letter_type,
     )
     
     logger.info("\nStep 3: Converting to DOCX format...")
@@ -246,5 +474,91 @@ def packet_and_letter(student_dir, style_guide, output):
     
     logger.info("\n✓ Complete! Packet and letter generated successfully.")
 
+@cli.command(name='bench-pdf')
+@click.argument('pdf_path', type=click.Path(exists=True))
+@click.option('--backend', 'backends', multiple=True, type=click.Choice(list(PDF_BACKENDS)), help='Backend to benchmark (repeatable; default: every installed backend)')
+@click.option('--min-token-ratio', default=DEFAULT_MIN_TOKEN_RATIO, type=click.FloatRange(0, 1), help="Share of the most complete backend's tokens a backend must extract to be recommended")
+def bench_pdf(pdf_path, backends, min_token_ratio):
+    """
+    Compare PDF extraction backends on local PDFs.
+
+    PDF_PATH is a PDF or a directory searched recursively for PDFs (e.g. a
+    few students' transcripts and resumes). Each backend reports pages/sec,
+    peak memory and the token count of its output. The fastest backend whose
+    output is close to the most complete one is recommended as the default.
+
+    Examples:
+
+        lor bench-pdf data/students/
+
+        lor bench-pdf transcript.pdf --backend pypdf2 --backend pypdfium2
+    """
+    path = pathlib.Path(pdf_path)
+    pdf_files = [path] if path.is_file() else sorted(path.rglob('*.pdf'))
+    if not pdf_files:
+        raise click.ClickException(f"No PDF files found in {path}")
+
+    results = benchmark_pdf_backends(pdf_files, backends or None)
+    click.echo(f"{len(pdf_files)} PDF file(s)\n")
+    click.echo(format_results(results))
+
+    recommended = recommend_backend(results, min_token_ratio)
+    if recommended is None:
+        raise click.ClickException("No backend extracted any pages")
+    click.echo(f"\nFastest acceptable backend: {recommended} (use --pdf-backend {recommended} or LOR_PDF_BACKEND={recommended})")
+
+
+@cli.command(name='bench-docx')
+@click.argument('docx_path', type=click.Path(exists=True))
+@click.option('--repeat', default=DEFAULT_REPEAT, type=click.IntRange(min=1), help='Runs per letter; the fastest is reported')
+def bench_docx(docx_path, repeat):
+    """
+    Compare DOCX conversion with and without the media fast path.
+
+    DOCX_PATH is a letter or a directory searched recursively for letters
+    (e.g. data/original_letters/). Each letter is converted from the original
+    archive and from a copy with its images stripped, and the times, the size
+    of the embedded media and whether the output matches are reported.
+
+    Examples:
+
+        lor bench-docx data/original_letters/
+    """
+    docx_files = find_docx_files(pathlib.Path(docx_path))
+    if not docx_files:
+        raise click.ClickException(f"No .docx files found in {docx_path}")
+
+    click.echo(format_docx_results(benchmark_docx_conversion(sorted(docx_files), repeat)))
+
+
+@cli.command(name='bench-transcript')
+@click.argument('students_path', type=click.Path(exists=True, file_okay=False))
+@click.option('--end-to-end', is_flag=True, help='Also time the synthesis LLM call with each prompt (makes two LLM calls per student)')
+def bench_transcript(students_path, end_to_end):
+    """
+    Measure what the local transcript parser saves in the synthesis prompt.
+
+    STUDENTS_PATH is a student directory or a directory of student
+    directories (e.g. data/students/). For each student with a transcript,
+    the synthesis prompt is built with the raw transcript and with the parsed
+    table, and the prompt tokens saved and parsing time are reported.
+
+    Examples:
+
+        lor bench-transcript data/students/
+
+        lor bench-transcript data/students/jane_smith/ --end-to-end
+    """
+    path = pathlib.Path(students_path)
+    student_dirs = [path] if (path / 'input').is_dir() else sorted(p for p in path.iterdir() if (p / 'input').is_dir())
+    if not student_dirs:
+        raise click.ClickException(f"No student directories with an input/ folder found in {path}")
+
+    results = benchmark_transcript_parser(student_dirs, end_to_end)
+    if not results:
+        raise click.ClickException("No transcripts found")
+    click.echo(format_transcript_results(results))
+
+
 if __name__ == '__main__':
     cli()
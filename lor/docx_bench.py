@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark of DOCX-to-Markdown conversion with and without the media fast path.
+
+Each letter is converted both from the original archive and from a copy with
+its media parts stripped (lor.file_utils.strip_docx_media), and the best of
+several runs is reported for each, along with the size of the embedded media.
+
+Mammoth only reads an image when the image converter opens it, and ours never
+does, so image-heavy letters are expected to convert in about the same time
+either way; the benchmark shows whether that holds for a given archive.
+"""
+
+import logging
+import time
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Tuple
+
+from lor.file_utils import DOCX_MEDIA_PREFIXES, convert_docx_to_markdown
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPEAT = 3
+
+
+@dataclass
+class DocxBenchResult:
+    """Conversion timings for one letter."""
+
+    path: Path
+    media_bytes: int
+    full_seconds: float
+    stripped_seconds: float
+    same_output: bool
+
+    @property
+    def speedup(self) -> float:
+        return self.full_seconds / self.stripped_seconds if self.stripped_seconds > 0 else 0.0
+
+
+def media_size(docx_path: Path) -> int:
+    """Total uncompressed size of a .docx archive's media parts."""
+    with zipfile.ZipFile(docx_path) as archive:
+        return sum(info.file_size for info in archive.infolist() if info.filename.startswith(DOCX_MEDIA_PREFIXES))
+
+
+def _time_conversion(docx_path: Path, strip_media: bool) -> Tuple[float, str]:
+    started = time.perf_counter()
+    markdown = convert_docx_to_markdown(docx_path, strip_media=strip_media)
+    return time.perf_counter() - started, markdown
+
+
+def benchmark_docx_conversion(docx_paths: List[Path], repeat: int = DEFAULT_REPEAT) -> List[DocxBenchResult]:
+    """
+    Time each letter's conversion from the original and from the media-stripped archive.
+
+    The two paths alternate after an untimed warm-up, so neither benefits
+    from running second.
+
+    Args:
+        docx_paths: Letters to convert
+        repeat: Runs per letter and path; the fastest is kept
+
+    Returns:
+        One result per letter
+    """
+    results = []
+    for docx_path in docx_paths:
+        _time_conversion(docx_path, True)
+        full_times, stripped_times = [], []
+        for _ in range(repeat):
+            full_seconds, full_markdown = _time_conversion(docx_path, False)
+            stripped_seconds, stripped_markdown = _time_conversion(docx_path, True)
+            full_times.append(full_seconds)
+            stripped_times.append(stripped_seconds)
+        results.append(DocxBenchResult(
+            path=docx_path,
+            media_bytes=media_size(docx_path),
+            full_seconds=min(full_times),
+            stripped_seconds=min(stripped_times),
+            same_output=full_markdown == stripped_markdown,
+        ))
+    return results
+
+
+def format_docx_results(results: List[DocxBenchResult]) -> str:
+    """Render benchmark results as a plain-text table with a total row."""
+    lines = [f"{'letter':<32} {'media MB':>9} {'full ms':>8} {'stripped ms':>12} {'speedup':>8}"]
+    for result in results:
+        lines.append(
+            f"{result.path.name[:32]:<32} {result.media_bytes / 1e6:>9.1f} {result.full_seconds * 1000:>8.1f} "
+            f"{result.stripped_seconds * 1000:>12.1f} {result.speedup:>7.2f}x"
+            + ("" if result.same_output else "  (output differs)")
+        )
+    full = sum(result.full_seconds for result in results)
+    stripped = sum(result.stripped_seconds for result in results)
+    lines.append(
+        f"{'total':<32} {sum(result.media_bytes for result in results) / 1e6:>9.1f} {full * 1000:>8.1f} "
+        f"{stripped * 1000:>12.1f} {full / stripped if stripped else 0.0:>7.2f}x"
+    )
+    return "\n".join(lines)
@@ -10,11 +10,32 @@ This module:
 
 import logging
 from pathlib import Path
-from typing import List
-from lor.llm import call_llm
+from typing import Dict, List
+from lor.llm import call_llm, estimate_tokens, DEFAULT_MODEL
+from lor.llm_scheduler import get_scheduler
+from lor.manifest import Manifest, hash_file, hash_text
+from lor.stylometry import compute_corpus_stats, format_stats_summary
+from lor.letter_sampling import select_representative
 
 logger = logging.getLogger(__name__)
 
+PROMPTS_DIR = Path(__file__).parent.parent / "prompts"
+
+# Largest prompt (in tokens) sent in a single style extraction call
+DEFAULT_TOKEN_BUDGET = 100_000
+
+# Per-batch notes from map-reduce runs, kept so an interrupted run can resume
+NOTES_CACHE_DIRNAME = ".style_notes"
+
+# Hashes of the letters the current style guide was built from, for --incremental
+STYLE_MANIFEST_FILENAME = ".style_manifest.json"
+
+# How letters are fed to the style prompt; "auto" sends them all if they fit
+# the token budget and otherwise uses map-reduce
+STRATEGIES = ("auto", "single", "map-reduce", "sample", "stats")
+
+SYSTEM_PROMPT = "You are an expert at analyzing writing style and creating comprehensive style guides. You provide detailed, structured analysis."
+
 
 def load_prompt_template(prompt_path: Path) -> str:
     """Load the style extraction prompt template."""
@@ -34,37 +55,291 @@ def find_markdown_files(directory: Path) -> List[Path]:
     return md_files
 
 
+def load_letter(md_file: Path) -> str:
+    """Load one redacted letter, headed by its filename for context."""
+    with open(md_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+    return f"# Letter: {md_file.stem}\n\n{content}"
+
+
+def join_letters(letters: List[str]) -> str:
+    """Join letters for a prompt, with a separator line between each pair."""
+    return "\n\n" + ("="*80 + "\n\n").join(letters)
+
+
 def load_redacted_letters(md_files: List[Path]) -> str:
     """Load and concatenate all redacted letters with separators."""
     letters = []
 
     for md_file in md_files:
         logger.info(f"Loading: {md_file.name}")
-        with open(md_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-
         # Add separator and filename for context
-        letters.append(f"# Letter: {md_file.stem}\n\n{content}")
+        letters.append(load_letter(md_file))
 
-    combined = "\n\n" + "="*80 + "\n\n".join(letters)
+    combined = join_letters(letters)
     logger.info(f"Loaded {len(md_files)} redacted letters ({len(combined.split())} words)")
     return combined
 
 
-def extract_style_guide(redacted_letters_dir: Path, output_dir: Path) -> None:
+def batch_letters(letters: List[str], token_budget: int) -> List[List[str]]:
+    """
+    Group letters into consecutive batches of at most token_budget tokens each.
+
+    A letter larger than the budget gets a batch of its own.
+    """
+    batches: List[List[str]] = []
+    current: List[str] = []
+    current_tokens = 0
+    for letter in letters:
+        tokens = estimate_tokens(letter)
+        if current and current_tokens + tokens > token_budget:
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(letter)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def build_style_messages(full_prompt: str) -> list:
+    """Build the chat messages for a style extraction call."""
+    return [
+        {
+            "role": "system",
+            "content": SYSTEM_PROMPT
+        },
+        {
+            "role": "user",
+            "content": full_prompt
+        }
+    ]
+
+
+async def analyze_batch(batch: List[str], notes_prompt: str, cache_dir: Path) -> str:
+    """
+    Map step: write style notes for one batch of letters.
+
+    Notes are saved under cache_dir, keyed by a hash of the prompt, model and
+    letters, and reused if the batch is analyzed again.
+    """
+    letters = join_letters(batch)
+    full_prompt = f"{notes_prompt}\n\n---\n\n## Redacted Letters to Analyze\n{letters}"
+    cache_path = cache_dir / f"{hash_text(DEFAULT_MODEL + full_prompt)}.md"
+
+    if cache_path.exists():
+        logger.info(f"Reusing style notes for a batch of {len(batch)} letter(s)")
+        return cache_path.read_text(encoding='utf-8')
+
+    notes = await get_scheduler().submit(messages=build_style_messages(full_prompt))
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(".tmp")
+    tmp_path.write_text(notes, encoding='utf-8')
+    tmp_path.replace(cache_path)
+    logger.info(f"Wrote style notes for a batch of {len(batch)} letter(s)")
+    return notes
+
+
+def analyze_batches(letters: List[str], output_dir: Path, token_budget: int = DEFAULT_TOKEN_BUDGET) -> str:
+    """
+    Map step over many letters: batch them to fit the token budget and analyze the batches concurrently.
+
+    Args:
+        letters: Loaded redacted letters
+        output_dir: Directory of style_guide.md; batch notes are cached beneath it
+        token_budget: Largest prompt to send in one call
+
+    Returns:
+        The batch notes, each under a "# Notes from Batch N" heading
+    """
+    notes_prompt = load_prompt_template(PROMPTS_DIR / "extract_style_notes.md")
+    batch_budget = max(token_budget - estimate_tokens(notes_prompt), 1)
+    batches = batch_letters(letters, batch_budget)
+    logger.info(f"Analyzing {len(letters)} letters in {len(batches)} batch(es) of up to {batch_budget} tokens...")
+
+    cache_dir = output_dir / NOTES_CACHE_DIRNAME
+    all_notes = get_scheduler().run([analyze_batch(batch, notes_prompt, cache_dir) for batch in batches])
+    return "\n\n".join(
+        f"# Notes from Batch {i}\n\n{notes}" for i, notes in enumerate(all_notes, 1)
+    )
+
+
+def build_stats_section(letters: List[str]) -> str:
+    """Compute corpus statistics locally and render them for the style prompt."""
+    statistics_prompt = load_prompt_template(PROMPTS_DIR / "style_statistics.md")
+    return f"{statistics_prompt}\n\n{format_stats_summary(compute_corpus_stats(letters))}"
+
+
+def sample_letters(letters: List[str], names: List[str], token_budget: int) -> List[str]:
+    """Pick a representative, de-duplicated subset of letters that fits token_budget."""
+    chosen = select_representative(letters, token_budget)
+    logger.info(f"Representative letters: {', '.join(names[i] for i in chosen)}")
+    return [letters[i] for i in chosen]
+
+
+def sampled_style_guide(
+    letters: List[str],
+    names: List[str],
+    prompt_template: str,
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+    with_stats: bool = False,
+) -> str:
+    """
+    Extract a style guide from a representative sample of the letters in one call.
+
+    Near-duplicate letters are dropped and a diverse subset that fits the
+    budget is chosen (lor.letter_sampling). With with_stats, corpus statistics
+    computed over every letter are sent too, so the numbers in the guide still
+    cover the whole archive.
+
+    Args:
+        letters: Loaded redacted letters
+        names: File name of each letter, for logging the selection
+        prompt_template: The style extraction prompt
+        token_budget: Largest prompt to send in one call
+        with_stats: Include locally computed corpus statistics
+
+    Returns:
+        The style guide
+    """
+    stats_section = f"{build_stats_section(letters)}\n\n---\n\n" if with_stats else ""
+    letters_budget = token_budget - estimate_tokens(prompt_template) - estimate_tokens(stats_section)
+    included = sample_letters(letters, names, letters_budget)
+    logger.info(f"Sending {len(included)} of {len(letters)} letter(s){' with corpus statistics' if with_stats else ''}")
+
+    letters_text = join_letters(included)
+    full_prompt = (
+        f"{prompt_template}\n\n---\n\n{stats_section}"
+        f"## Redacted Letters to Analyze\n{letters_text}"
+    )
+    return call_llm(messages=build_style_messages(full_prompt))
+
+
+def map_reduce_style_guide(
+    letters: List[str],
+    prompt_template: str,
+    output_dir: Path,
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+) -> str:
+    """
+    Extract a style guide from more letters than fit in one prompt.
+
+    Letters are split into batches that fit the token budget, each batch is
+    analyzed concurrently into style notes (map), and a final call merges the
+    notes into the style guide (reduce). The reduce prompt also carries the
+    locally computed corpus statistics.
+
+    Args:
+        letters: Loaded redacted letters
+        prompt_template: The style extraction prompt (defines the guide's format)
+        output_dir: Directory of style_guide.md; batch notes are cached beneath it
+        token_budget: Largest prompt to send in one call
+
+    Returns:
+        The merged style guide
+    """
+    merge_prompt = load_prompt_template(PROMPTS_DIR / "merge_style_notes.md")
+    combined_notes = analyze_batches(letters, output_dir, token_budget)
+    full_prompt = (
+        f"{prompt_template}\n\n---\n\n{merge_prompt}\n\n---\n\n{build_stats_section(letters)}"
+        f"\n\n---\n\n## Style Notes to Merge\n\n{combined_notes}"
+    )
+    if estimate_tokens(full_prompt) > token_budget:
+        logger.warning(f"Merged notes ({estimate_tokens(full_prompt)} tokens) exceed the token budget")
+
+    logger.info("Merging batch notes into the style guide...")
+    return call_llm(messages=build_style_messages(full_prompt))
+
+
+def _save_style_guide(style_guide: str, output_path: Path, manifest: Manifest, hashes: Dict[str, str]) -> None:
+    """Write the style guide and record the letters it was built from."""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(style_guide)
+
+    for name, digest in hashes.items():
+        manifest.record(name, sha256=digest)
+    manifest.save()
+
+    logger.info(f"Style guide saved to: {output_path}")
+    logger.info(f"Size: {len(style_guide.split())} words")
+    logger.info(f"\n{'='*60}")
+    logger.info("Style extraction complete!")
+    logger.info("Please review and edit the style guide to ensure accuracy.")
+    logger.info(f"{'='*60}")
+
+
+def update_style_guide(
+    existing_guide: str,
+    letters: List[str],
+    prompt_template: str,
+    output_dir: Path,
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+) -> str:
+    """
+    Merge new or changed letters into an existing (possibly hand-edited) style guide.
+
+    The new letters are sent alongside the current guide when they fit the
+    token budget; otherwise they are first analyzed into batch notes, as in
+    map-reduce, and the notes are merged instead.
+
+    Args:
+        existing_guide: Current contents of style_guide.md
+        letters: Loaded new or changed letters
+        prompt_template: The style extraction prompt (defines the guide's format)
+        output_dir: Directory of style_guide.md; batch notes are cached beneath it
+        token_budget: Largest prompt to send in one call
+
+    Returns:
+        The updated style guide
+    """
+    update_prompt = load_prompt_template(PROMPTS_DIR / "update_style_guide.md")
+    header = (
+        f"{prompt_template}\n\n---\n\n{update_prompt}\n\n---\n\n"
+        f"## Current Style Guide\n\n{existing_guide}\n\n---\n\n"
+    )
+
+    letters_text = join_letters(letters)
+    full_prompt = f"{header}## New Letters to Analyze\n{letters_text}"
+    if estimate_tokens(full_prompt) > token_budget:
+        combined_notes = analyze_batches(letters, output_dir, token_budget)
+        full_prompt = f"{header}## Style Notes on the New Letters\n\n{combined_notes}"
+
+    logger.info(f"Merging {len(letters)} new letter(s) into the existing style guide...")
+    return call_llm(messages=build_style_messages(full_prompt))
+
+
+def extract_style_guide(
+    redacted_letters_dir: Path,
+    output_dir: Path,
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+    strategy: str = "auto",
+    incremental: bool = False,
+) -> None:
     """
     Extract style guide from redacted letters.
 
     Args:
         redacted_letters_dir: Directory containing redacted .md files
         output_dir: Directory where style_guide.md will be saved
+        token_budget: Largest prompt to send in one call
+        strategy: "single" sends every letter in one call; "map-reduce" analyzes
+            batches and merges their notes; "sample" sends a representative,
+            de-duplicated subset that fits the budget; "stats" sends that subset
+            plus locally computed corpus statistics; "auto" is "single" when the
+            letters fit the token budget and "map-reduce" otherwise
+        incremental: Analyze only letters added or changed since the existing
+            style guide was built and merge them into it, keeping hand edits
     """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy '{strategy}'. Choose from: {', '.join(STRATEGIES)}")
+
     logger.info(f"{'='*60}")
     logger.info(f"Extracting style guide from: {redacted_letters_dir}")
     logger.info(f"{'='*60}")
 
     # Load prompt template
-    prompt_path = Path(__file__).parent.parent / "prompts" / "extract_style_guide.md"
+    prompt_path = PROMPTS_DIR / "extract_style_guide.md"
     prompt_template = load_prompt_template(prompt_path)
     logger.info("Loaded style extraction prompt template")
 
@@ -73,40 +348,69 @@ def extract_style_guide(redacted_letters_dir: Path, output_dir: Path) -> None:
     if not md_files:
         raise ValueError(f"No .md files found in {redacted_letters_dir}")
 
+    output_path = output_dir / "style_guide.md"
+    manifest = Manifest.load(output_dir / STYLE_MANIFEST_FILENAME)
+    hashes = {md_file.name: hash_file(md_file) for md_file in md_files}
+
+    if incremental and output_path.exists():
+        if not len(manifest):
+            # A guide from before manifests, or written by hand: merge into it, never overwrite it
+            logger.info(f"No {STYLE_MANIFEST_FILENAME} for the existing style guide; merging every letter into it")
+        for name in manifest:
+            if name not in hashes:
+                logger.warning(f"{name} was removed but still informs the style guide; rebuild without --incremental to drop it")
+                manifest.remove(name)
+        changed = [md_file for md_file in md_files if not manifest.is_current(md_file.name, sha256=hashes[md_file.name])]
+        if not changed:
+            manifest.save()
+            logger.info("Style guide is up to date; no new or changed letters")
+            return
+
+        logger.info(f"{len(changed)} of {len(md_files)} letter(s) are new or changed")
+        style_guide = update_style_guide(
+            output_path.read_text(encoding='utf-8'),
+            [load_letter(md_file) for md_file in changed],
+            prompt_template,
+            output_dir,
+            token_budget,
+        )
+        _save_style_guide(style_guide, output_path, manifest, hashes)
+        return
+    if incremental:
+        logger.info("No previous style guide to update; building it from every letter")
+
     redacted_letters = load_redacted_letters(md_files)
 
     # Combine prompt with letters
     full_prompt = f"{prompt_template}\n\n---\n\n## Redacted Letters to Analyze\n{redacted_letters}"
 
-    # Call LLM to extract style
-    logger.info("Sending letters to LLM for style extraction...")
-    logger.info("This may take a minute as the LLM analyzes the writing patterns...")
-
-    style_guide = call_llm(
-        messages=[
-            {
-                "role": "system",
-                "content": "You are an expert at analyzing writing style and creating comprehensive style guides. You provide detailed, structured analysis."
-            },
-            {
-                "role": "user",
-                "content": full_prompt
-            }
-        ]
-    )
-
-    logger.info("Successfully received style guide from LLM")
+    if strategy == "auto":
+        strategy = "single" if estimate_tokens(full_prompt) <= token_budget else "map-reduce"
+        if strategy != "single":
+            logger.info(f"Letters exceed the {token_budget}-token budget; using {strategy} extraction")
 
-    # Save style guide
-    output_dir.mkdir(parents=True, exist_ok=True)
-    output_path = output_dir / "style_guide.md"
+    if strategy == "map-reduce":
+        style_guide = map_reduce_style_guide(
+            [load_letter(md_file) for md_file in md_files],
+            prompt_template,
+            output_dir,
+            token_budget,
+        )
+    elif strategy in ("sample", "stats"):
+        style_guide = sampled_style_guide(
+            [load_letter(md_file) for md_file in md_files],
+            [md_file.name for md_file in md_files],
+            prompt_template,
+            token_budget,
+            with_stats=strategy == "stats",
+        )
+    else:
+        # Call LLM to extract style
+        logger.info("Sending letters to LLM for style extraction...")
+        logger.info("This may take a minute as the LLM analyzes the writing patterns...")
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(style_guide)
+        style_guide = call_llm(messages=build_style_messages(full_prompt))
 
-    logger.info(f"Style guide saved to: {output_path}")
-    logger.info(f"Size: {len(style_guide.split())} words")
-    logger.info(f"\n{'='*60}")
-    logger.info("Style extraction complete!")
-    logger.info("Please review and edit the style guide to ensure accuracy.")
-    logger.info(f"{'='*60}")
+    logger.info("Successfully received style guide from LLM")
+    # A full rebuild starts a fresh manifest, forgetting removed letters
+    _save_style_guide(style_guide, output_path, Manifest(manifest.path), hashes)
@@ -5,18 +5,95 @@ File utilities for letter of recommendation tools.
 Handles file operations like finding documents, saving files, etc.
 """
 
+import importlib.util
+import io
 import logging
+import os
+import re
+import time
+import zipfile
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple
 import mammoth
 
+from lor.manifest import Manifest, hash_file
+
 logger = logging.getLogger(__name__)
 
-def convert_docx_to_markdown(docx_path: Path) -> str:
-    """Convert a Word document to Markdown format, dropping all images."""
+# Bump when conversion output changes, so cached conversions are redone
+CONVERTER_VERSION = 1
+
+# First and last page to extract (1-based, inclusive); a last page of None means the end
+PageRange = Tuple[int, Optional[int]]
+
+# Fewer pages than this per worker isn't worth a process of its own
+MIN_PAGES_PER_WORKER = 4
+
+# Largest slice of pages a worker extracts at once; bounds the text held in memory
+MAX_PAGES_PER_SLICE = 16
+
+# Kept in a student's markdown/ directory to skip unchanged conversions
+CONVERSION_MANIFEST_FILENAME = ".conversion_manifest.json"
+
+# Parts of a .docx archive that hold images and embedded objects, not text
+DOCX_MEDIA_PREFIXES = ("word/media/", "word/embeddings/", "docProps/thumbnail")
+
+# Material types and the file names (without extension) they are found under,
+# in order of preference; a name may be numbered, e.g. paper_2 or statement-1
+MATERIAL_NAMES = {
+    'resume': ('resume', 'cv'),
+    'transcript': ('transcript', 'grades'),
+    'accomplishments': ('accomplishments', 'achievements', 'activities'),
+    'statement': ('statement', 'personal_statement', 'sop', 'purpose'),
+    'paper': ('paper', 'publication'),
+    'professor_notes': ('professor_notes',),
+}
+MATERIAL_NAME_PATTERN = re.compile(r"^(?P<name>[a-z]+(?:_[a-z]+)*?)(?:[_\- ]?(?P<number>\d+))?$")
+
+# Material formats worth converting in a worker process; others are read inline
+PROCESS_CONVERTED_SUFFIXES = ('.docx', '.pdf')
+
+# Supported material formats, most preferred first when a file exists in several
+MATERIAL_SUFFIXES = ('.md', '.txt', '.docx', '.pdf')
+
+# Material index per input directory, with the directory mtime it was built at
+_material_index_cache: Dict[Path, Tuple[int, Dict[str, List[Path]]]] = {}
+
+# PDF text extraction backend used unless configured otherwise
+DEFAULT_PDF_BACKEND = "pypdf2"
+
+def strip_docx_media(docx_path: Path) -> io.BytesIO:
+    """
+    Return an in-memory copy of a .docx without its embedded media.
+
+    Images, embedded objects and the thumbnail are left out without being
+    decompressed; the remaining (small, XML) parts are stored uncompressed so
+    they are not compressed again just to be read back.
+    """
+    stripped = io.BytesIO()
+    with zipfile.ZipFile(docx_path) as source, zipfile.ZipFile(stripped, 'w', zipfile.ZIP_STORED) as target:
+        for info in source.infolist():
+            if not info.filename.startswith(DOCX_MEDIA_PREFIXES):
+                target.writestr(info.filename, source.read(info))
+    stripped.seek(0)
+    return stripped
+
+
+def convert_docx_to_markdown(docx_path: Path, strip_media: bool = False) -> str:
+    """
+    Convert a Word document to Markdown format, dropping all images.
+
+    With strip_media, media parts are removed from the archive before mammoth
+    opens it. Mammoth already skips image bytes that the image converter never
+    opens, so this is off by default; 'lor bench-docx' measures both paths.
+    """
     try:
         logger.info(f"Converting {docx_path.name} to Markdown...")
-        with open(docx_path, 'rb') as docx_file:
+        with (strip_docx_media(docx_path) if strip_media else open(docx_path, 'rb')) as docx_file:
             # Configure mammoth to ignore images by returning empty strings
             result = mammoth.convert_to_markdown(
                 docx_file,
@@ -54,52 +131,294 @@ def find_docx_files(path: Path) -> List[Path]:
         return []
 
 
-def convert_pdf_to_markdown(pdf_path: Path) -> str:
-    """
-    Convert a PDF to Markdown format using PyPDF2.
-
-    Note: This is a simple text extraction. For better results with complex PDFs,
-    consider using more advanced tools like pdfplumber or pdf2image + OCR.
-    """
+def parse_page_range(spec: str) -> PageRange:
+    """Parse a page range such as '3', '1-5' or '2-' (page 2 to the end)."""
+    first, sep, last = spec.strip().partition('-')
     try:
+        first_page = int(first)
+        last_page = (int(last) if last else None) if sep else first_page
+    except ValueError:
+        raise ValueError(f"Invalid page range '{spec}', expected N, N-M or N-") from None
+    if first_page < 1 or (last_page is not None and last_page < first_page):
+        raise ValueError(f"Invalid page range '{spec}', pages start at 1 and must be ascending")
+    return first_page, last_page
+
+
+def parse_pdf_page_ranges(specs: Iterable[str]) -> Dict[str, PageRange]:
+    """Parse 'material=RANGE' strings (as given on the command line) into page ranges."""
+    ranges = {}
+    for spec in specs:
+        material, sep, page_range = spec.partition('=')
+        if not sep or not material:
+            raise ValueError(f"Invalid page range '{spec}', expected MATERIAL=RANGE")
+        ranges[material] = parse_page_range(page_range)
+    return ranges
+
+
+class PdfBackend(ABC):
+    """A PDF text extraction library; implementations import it lazily."""
+
+    name = ""
+    module = ""
+    package = ""
+
+    def is_available(self) -> bool:
+        """True if the backend's library is installed."""
+        return importlib.util.find_spec(self.module) is not None
+
+    @abstractmethod
+    def page_count(self, pdf_path: Path) -> int:
+        """Return the number of pages in the PDF."""
+
+    @abstractmethod
+    def iter_pages(self, pdf_path: Path, start: int, stop: int) -> Iterator[str]:
+        """Yield the text of pages [start, stop) (0-based), one page at a time."""
+
+    def extract_pages(self, pdf_path: Path, start: int, stop: int) -> List[str]:
+        """Return the text of pages [start, stop) (0-based)."""
+        return list(self.iter_pages(pdf_path, start, stop))
+
+
+class PyPDF2Backend(PdfBackend):
+    """Pure-Python PyPDF2 extract_text: always installed, simple layout handling."""
+
+    name = "pypdf2"
+    module = "PyPDF2"
+    package = "PyPDF2"
+
+    def page_count(self, pdf_path: Path) -> int:
         import PyPDF2
-        logger.info(f"Converting {pdf_path.name} to Markdown...")
+        with open(pdf_path, 'rb') as pdf_file:
+            return len(PyPDF2.PdfReader(pdf_file).pages)
 
+    def iter_pages(self, pdf_path: Path, start: int, stop: int) -> Iterator[str]:
+        import PyPDF2
         with open(pdf_path, 'rb') as pdf_file:
             pdf_reader = PyPDF2.PdfReader(pdf_file)
-            text_parts = []
+            for i in range(start, stop):
+                yield pdf_reader.pages[i].extract_text() or ""
+
 
-            for page_num, page in enumerate(pdf_reader.pages, 1):
-                text = page.extract_text()
+class PdfminerBackend(PdfBackend):
+    """pdfminer.six layout analysis: slower, better reading order on multi-column pages."""
+
+    name = "pdfminer"
+    module = "pdfminer"
+    package = "pdfminer.six"
+
+    def page_count(self, pdf_path: Path) -> int:
+        from pdfminer.pdfpage import PDFPage
+        with open(pdf_path, 'rb') as pdf_file:
+            return sum(1 for _ in PDFPage.get_pages(pdf_file))
+
+    def iter_pages(self, pdf_path: Path, start: int, stop: int) -> Iterator[str]:
+        from pdfminer.high_level import extract_pages
+        from pdfminer.layout import LTTextContainer
+        for page in extract_pages(pdf_path, page_numbers=range(start, stop)):
+            yield "".join(element.get_text() for element in page if isinstance(element, LTTextContainer)).rstrip("\n")
+
+
+class PdfplumberBackend(PdfBackend):
+    """pdfplumber (built on pdfminer.six): keeps table rows and columns aligned."""
+
+    name = "pdfplumber"
+    module = "pdfplumber"
+    package = "pdfplumber"
+
+    def page_count(self, pdf_path: Path) -> int:
+        import pdfplumber
+        with pdfplumber.open(pdf_path) as pdf:
+            return len(pdf.pages)
+
+    def iter_pages(self, pdf_path: Path, start: int, stop: int) -> Iterator[str]:
+        import pdfplumber
+        with pdfplumber.open(pdf_path) as pdf:
+            for i in range(start, stop):
+                page = pdf.pages[i]
+                text = page.extract_text() or ""
+                page.close()  # drop cached layout objects to bound memory
+                yield text
+
+
+class Pypdfium2Backend(PdfBackend):
+    """pypdfium2 bindings to PDFium (Chrome's PDF engine): fast native extraction."""
+
+    name = "pypdfium2"
+    module = "pypdfium2"
+    package = "pypdfium2"
+
+    def page_count(self, pdf_path: Path) -> int:
+        import pypdfium2
+        pdf = pypdfium2.PdfDocument(pdf_path)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+    def iter_pages(self, pdf_path: Path, start: int, stop: int) -> Iterator[str]:
+        import pypdfium2
+        pdf = pypdfium2.PdfDocument(pdf_path)
+        try:
+            for i in range(start, stop):
+                page = pdf[i]
+                textpage = page.get_textpage()
+                text = textpage.get_text_bounded()
+                textpage.close()
+                page.close()
+                yield text
+        finally:
+            pdf.close()
+
+
+PDF_BACKENDS: Dict[str, PdfBackend] = {
+    backend.name: backend
+    for backend in (PyPDF2Backend(), PdfminerBackend(), PdfplumberBackend(), Pypdfium2Backend())
+}
+
+_pdf_backend = DEFAULT_PDF_BACKEND
+
+
+def get_pdf_backend(name: Optional[str] = None) -> PdfBackend:
+    """Return the named PDF backend (default: the configured one), checking it is installed."""
+    name = name or _pdf_backend
+    if name not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF backend '{name}'. Choose from: {', '.join(PDF_BACKENDS)}")
+    backend = PDF_BACKENDS[name]
+    if not backend.is_available():
+        raise ImportError(f"PDF backend '{name}' needs {backend.package}. Install it with: pip install {backend.package}")
+    return backend
+
+
+def configure_pdf_backend(name: str) -> PdfBackend:
+    """Set the PDF backend used by convert_pdf_to_markdown by default."""
+    global _pdf_backend
+    backend = get_pdf_backend(name)
+    _pdf_backend = backend.name
+    return backend
+
+
+def _extract_pages(backend_name: str, pdf_path: Path, start: int, stop: int) -> List[str]:
+    """Extract the text of pages [start, stop) (0-based); runs in a worker process."""
+    return PDF_BACKENDS[backend_name].extract_pages(pdf_path, start, stop)
+
+
+def _iter_pdf_slices(
+    pool: ProcessPoolExecutor,
+    backend_name: str,
+    pdf_path: Path,
+    bounds: List[int],
+    window: int,
+) -> Iterator[str]:
+    """Yield page texts from slices extracted in pool, in order, with at most window slices in flight."""
+    slices = iter(zip(bounds[:-1], bounds[1:]))
+    pending = deque(
+        pool.submit(_extract_pages, backend_name, pdf_path, *page_slice) for page_slice in islice(slices, window)
+    )
+    while pending:
+        part = pending.popleft().result()
+        next_slice = next(slices, None)
+        if next_slice is not None:
+            pending.append(pool.submit(_extract_pages, backend_name, pdf_path, *next_slice))
+        yield from part
+
+
+def iter_pdf_pages(
+    pdf_path: Path,
+    page_range: Optional[PageRange] = None,
+    workers: int = 1,
+    backend: Optional[str] = None,
+) -> Iterator[str]:
+    """
+    Yield the text of each non-empty page of a PDF, in page order.
+
+    Pages are extracted one at a time, so memory is bounded by a single page.
+    With workers > 1, long page ranges are split into contiguous slices of at
+    most MAX_PAGES_PER_SLICE pages, extracted in a process pool with no more
+    than one slice per worker in flight, so memory is bounded by about
+    workers + 1 slices.
+
+    Note: This is plain text extraction. Compare the backends on your own
+    documents with 'lor bench-pdf'; scanned PDFs need OCR instead.
+
+    Args:
+        pdf_path: PDF file to convert
+        page_range: Only extract these pages (1-based, inclusive)
+        workers: Number of processes to extract pages with
+        backend: Name of a PDF_BACKENDS entry (default: the configured backend)
+    """
+    try:
+        pdf_backend = get_pdf_backend(backend)
+        logger.info(f"Converting {pdf_path.name} to Markdown with {pdf_backend.name}...")
+
+        page_count = pdf_backend.page_count(pdf_path)
+        first_page, last_page = page_range or (1, None)
+        last_page = page_count if last_page is None else min(last_page, page_count)
+        if first_page > last_page:
+            logger.warning(f"Page range {first_page}-{last_page} is outside {pdf_path.name} ({page_count} pages)")
+            return
+
+        start, stop = first_page - 1, last_page
+        slices = min(workers, (stop - start) // MIN_PAGES_PER_WORKER)
+        if slices > 1:
+            # Ceiling division: an even split, capped so no slice holds too much text
+            slice_pages = min(-(-(stop - start) // slices), MAX_PAGES_PER_SLICE)
+            bounds = list(range(start, stop, slice_pages)) + [stop]
+            pool = ProcessPoolExecutor(max_workers=slices)
+            page_texts = _iter_pdf_slices(pool, pdf_backend.name, pdf_path, bounds, slices)
+        else:
+            pool = None
+            page_texts = pdf_backend.iter_pages(pdf_path, start, stop)
+
+        try:
+            for page_num, text in enumerate(page_texts, first_page):
                 if text.strip():
-                    text_parts.append(text)
+                    yield text
                 else:
                     logger.warning(f"Page {page_num} of {pdf_path.name} appears empty or unreadable")
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
 
-            markdown_text = "\n\n".join(text_parts)
-            logger.info(f"Successfully converted {pdf_path.name} to Markdown ({len(pdf_reader.pages)} pages)")
-            return markdown_text
+        logger.info(
+            f"Successfully converted {pdf_path.name} to Markdown "
+            f"({stop - start} of {page_count} pages{f', {slices} workers' if slices > 1 else ''})"
+        )
 
-    except ImportError:
-        logger.error("PyPDF2 not installed. Install it with: pip install PyPDF2")
+    except ImportError as e:
+        logger.error(str(e))
         raise
     except Exception as e:
         logger.error(f"Error converting PDF {pdf_path}: {e}")
         raise
 
 
-def convert_file_to_markdown(file_path: Path) -> str:
+def convert_pdf_to_markdown(
+    pdf_path: Path,
+    page_range: Optional[PageRange] = None,
+    workers: int = 1,
+    backend: Optional[str] = None,
+) -> str:
+    """
+    Convert a PDF to Markdown format; see iter_pdf_pages for the arguments.
+
+    To avoid holding a large document in memory, stream it to a file with
+    write_markdown_stream(iter_pdf_pages(...), output_path) instead.
+    """
+    return "\n\n".join(iter_pdf_pages(pdf_path, page_range, workers, backend))
+
+
+def convert_file_to_markdown(file_path: Path, page_range: Optional[PageRange] = None, pdf_workers: int = 1) -> str:
     """
     Convert a file to Markdown format based on its extension.
 
-    Supports: .docx, .pdf, .txt, .md
+    Supports: .docx, .pdf, .txt, .md. page_range and pdf_workers apply to PDFs only.
     """
     suffix = file_path.suffix.lower()
 
     if suffix == '.docx':
         return convert_docx_to_markdown(file_path)
     elif suffix == '.pdf':
-        return convert_pdf_to_markdown(file_path)
+        return convert_pdf_to_markdown(file_path, page_range, pdf_workers)
     elif suffix in ['.txt', '.md']:
         logger.info(f"Reading text file {file_path.name}...")
         with open(file_path, 'r', encoding='utf-8') as f:
@@ -108,36 +427,159 @@ def convert_file_to_markdown(file_path: Path) -> str:
         raise ValueError(f"Unsupported file type: {suffix}. Supported types: .docx, .pdf, .txt, .md")
 
 
-def find_student_materials(input_dir: Path) -> Dict[str, Path]:
+def convert_file_to_markdown_file(
+    file_path: Path,
+    output_path: Path,
+    page_range: Optional[PageRange] = None,
+    pdf_workers: int = 1,
+    pdf_backend: Optional[str] = None,
+) -> float:
     """
-    Find student materials in the input directory.
+    Convert a file to Markdown at output_path, streaming PDFs page by page.
 
-    Looks for common filenames and returns a dict mapping material type to file path.
-    Returns empty dict if directory doesn't exist.
+    Safe to run in a worker process: pass pdf_backend explicitly, since the
+    configured default is not carried over to spawned processes.
+
+    Returns:
+        Seconds the conversion took
+    """
+    started = time.perf_counter()
+    if file_path.suffix.lower() == '.pdf':
+        write_markdown_stream(iter_pdf_pages(file_path, page_range, pdf_workers, pdf_backend), output_path)
+    else:
+        save_markdown(convert_file_to_markdown(file_path, page_range, pdf_workers), output_path)
+    return time.perf_counter() - started
+
+
+def conversion_fields(file_path: Path, page_range: Optional[PageRange] = None) -> Dict[str, object]:
+    """The manifest fields a conversion of file_path depends on."""
+    return {
+        "source": file_path.name,
+        "sha256": hash_file(file_path),
+        "converter": CONVERTER_VERSION,
+        "pages": list(page_range) if page_range else None,
+        "pdf_backend": get_pdf_backend().name if file_path.suffix.lower() == '.pdf' else None,
+    }
+
+
+def stale_conversion_fields(
+    file_path: Path,
+    output_path: Path,
+    manifest: Manifest,
+    page_range: Optional[PageRange] = None,
+) -> Optional[Dict[str, object]]:
+    """
+    Check whether the saved conversion of file_path at output_path can be reused.
+
+    It can when the manifest records the same source file, content hash,
+    converter version, page range and PDF backend for output_path and the
+    output still exists.
+
+    Args:
+        file_path: File to convert
+        output_path: Where the Markdown is saved
+        manifest: Conversion manifest of output_path's directory
+        page_range: Only extract these pages of a PDF
+
+    Returns:
+        None if the saved output is current, otherwise the fields to record
+        in the manifest once file_path has been converted
+    """
+    fields = conversion_fields(file_path, page_range)
+    if output_path.exists() and manifest.is_current(output_path.name, **fields):
+        logger.info(f"Reusing conversion of unchanged {file_path.name}")
+        return None
+    return fields
+
+
+def _classify_material(file_name: str) -> Optional[Tuple[str, int, int]]:
+    """Return (material type, name priority, number) for a material file name, or None."""
+    match = MATERIAL_NAME_PATTERN.match(Path(file_name).stem.lower())
+    if match is None:
+        return None
+    for material_type, names in MATERIAL_NAMES.items():
+        if match["name"] in names:
+            return material_type, names.index(match["name"]), int(match["number"] or 0)
+    return None
+
+
+def index_student_materials(input_dir: Path) -> Dict[str, List[Path]]:
+    """
+    Classify every material file in the input directory with a single scan.
+
+    Each material type may have several files (e.g. paper_1.pdf, paper_2.pdf),
+    listed in the order of MATERIAL_NAMES and then by number. When one file
+    exists in several formats (resume.pdf and resume.docx), the format
+    earliest in MATERIAL_SUFFIXES is used. The index is cached until the
+    directory changes (files added, removed or renamed).
+
+    Returns:
+        Dict mapping material type to its files; empty if the directory doesn't exist
     """
-    if not input_dir.exists():
+    try:
+        mtime = input_dir.stat().st_mtime_ns
+    except FileNotFoundError:
         logger.warning(f"Input directory does not exist: {input_dir}")
         return {}
 
-    materials = {}
+    cache_key = input_dir.resolve()
+    cached = _material_index_cache.get(cache_key)
+    if cached is not None and cached[0] == mtime:
+        return {material_type: list(paths) for material_type, paths in cached[1].items()}
 
-    # Common patterns for each material type
-    patterns = {
-        'resume': ['resume.*', 'cv.*'],
-        'transcript': ['transcript.*', 'grades.*'],
-        'accomplishments': ['accomplishments.*', 'achievements.*', 'activities.*'],
-        'statement': ['statement.*', 'personal_statement.*', 'sop.*', 'purpose.*'],
-        'professor_notes': ['professor_notes.*']
-    }
+    found: Dict[Tuple[str, int, int], Path] = {}
+    with os.scandir(input_dir) as entries:
+        for entry in entries:
+            if entry.name.startswith(('.', '~$')) or not entry.is_file():
+                continue
+            classified = _classify_material(entry.name)
+            path = Path(entry.path)
+            if classified is None:
+                continue
+            if path.suffix.lower() not in MATERIAL_SUFFIXES:
+                logger.warning(f"Skipping {entry.name}: unsupported file type")
+                continue
+            current = found.get(classified)
+            if current is None or MATERIAL_SUFFIXES.index(path.suffix.lower()) < MATERIAL_SUFFIXES.index(current.suffix.lower()):
+                found[classified] = path
+
+    index: Dict[str, List[Path]] = {material_type: [] for material_type in MATERIAL_NAMES}
+    for classified in sorted(found):
+        index[classified[0]].append(found[classified])
+    index = {material_type: paths for material_type, paths in index.items() if paths}
 
-    for material_type, pattern_list in patterns.items():
-        for pattern in pattern_list:
-            matches = list(input_dir.glob(pattern))
-            if matches:
-                # Take the first match for each type
-                materials[material_type] = matches[0]
-                logger.info(f"Found {material_type}: {matches[0].name}")
-                break
+    _material_index_cache[cache_key] = (mtime, index)
+    return {material_type: list(paths) for material_type, paths in index.items()}
+
+
+def material_key(material_type: str, position: int, count: int) -> str:
+    """Name of one material file: its type, numbered from 1 if the type has several files."""
+    return material_type if count == 1 else f"{material_type}_{position}"
+
+
+def split_material_key(key: str) -> Tuple[str, Optional[int]]:
+    """Inverse of material_key: 'paper_2' -> ('paper', 2), 'resume' -> ('resume', None)."""
+    material_type, _, number = key.rpartition('_')
+    if material_type in MATERIAL_NAMES and number.isdigit():
+        return material_type, int(number)
+    return key, None
+
+
+def find_student_materials(input_dir: Path) -> Dict[str, Path]:
+    """
+    Find student materials in the input directory.
+
+    Looks for common filenames (see index_student_materials) and returns a dict
+    mapping material key to file path. The key is the material type, or
+    type_N when there are several files of that type (paper_1, paper_2).
+    Returns empty dict if directory doesn't exist.
+    """
+    materials = {}
+    for material_type, paths in index_student_materials(input_dir).items():
+        for position, path in enumerate(paths, 1):
+            key = material_key(material_type, position, len(paths))
+            materials[key] = path
+            logger.info(f"Found {key}: {path.name}")
 
     return materials
 
@@ -219,6 +661,31 @@ def convert_markdown_to_docx(markdown_path: Path, docx_path: Optional[Path] = No
         raise
 
 
+def write_markdown_stream(parts: Iterable[str], output_path: Path, separator: str = "\n\n") -> None:
+    """
+    Write Markdown parts (e.g. PDF pages) to a file as they are produced.
+
+    Only one part is held in memory at a time, and each is flushed as it is
+    written, so progress can be followed in the temporary file. The file is
+    written under a temporary name and renamed into place, so an interrupted
+    conversion never leaves a truncated output behind.
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for index, part in enumerate(parts):
+                if index:
+                    f.write(separator)
+                f.write(part)
+                f.flush()
+        tmp_path.replace(output_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    logger.info(f"Saved content to {output_path}")
+
+
 def save_markdown(content: str, output_path: Path) -> None:
     """Save markdown content to a file."""
     try:
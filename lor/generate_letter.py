@@ -11,13 +11,26 @@ This module:
 """
 
 import logging
+import re
+import time
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
-from lor.llm import call_llm
+from typing import Callable, Dict, Iterator, Optional, Sequence
+from lor.file_utils import write_markdown_stream
+from lor.llm import call_llm, stream_llm
+from lor.llm_scheduler import get_scheduler
+from lor.student_packet import LETTER_TYPES, load_structured_packet, select_packet_sections
 
 logger = logging.getLogger(__name__)
 
+# How each letter type's target is described in the prompt
+LETTER_TYPE_TARGETS = {
+    'phd': "a PhD program application",
+    'ms': "a Master's program application",
+    'job': "a job application",
+    'full': "the application described in the student packet",
+}
+
 
 def load_prompt_template() -> str:
     """Load the letter generation prompt template."""
@@ -35,34 +48,44 @@ def load_style_guide(style_guide_path: Path) -> str:
         return f.read()
 
 
-def load_student_packet(student_dir: Path) -> str:
-    """Load the student packet."""
-    packet_path = student_dir / "student_packet.md"
-
-    if not packet_path.exists():
-        raise FileNotFoundError(
-            f"Student packet not found at {packet_path}\n"
-            f"Run 'lor synthesize-packet {student_dir}' first."
-        )
+def load_student_packet(student_dir: Path, letter_type: Optional[str] = None, also_for: Sequence[str] = ()) -> str:
+    """
+    Load the sections of the student packet a letter needs.
 
-    with open(packet_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    Args:
+        student_dir: Path to student directory containing student_packet.md
+        letter_type: phd, ms, job or full (default: from the packet's Letter Type)
+        also_for: More letter types whose sections to include (see select_packet_sections)
 
-    return content
+    Returns:
+        Markdown of the selected sections, or the whole packet if its
+        sections couldn't be recognized
+    """
+    packet = load_structured_packet(student_dir)
+    if not packet['sections']:
+        logger.warning("No packet sections recognized; sending the whole packet")
+        return (student_dir / "student_packet.md").read_text(encoding='utf-8')
+    return select_packet_sections(packet, letter_type, also_for)
 
 
 def combine_for_letter_generation(
     prompt_template: str,
     style_guide: str,
-    student_packet: str
+    student_packet: str,
+    target: Optional[str] = None,
 ) -> str:
     """
     Combine prompt, style guide, and student packet for letter generation.
 
+    Everything that differs between letters for the same student (the target
+    and the date) comes after the template, style guide and packet, so letters
+    written together share one long identical prefix the provider can cache.
+
     Args:
         prompt_template: The letter generation prompt
         style_guide: Professor's writing style guide
         student_packet: Student's information packet
+        target: What this letter supports (e.g. "a PhD program application")
 
     Returns:
         Complete prompt for LLM
@@ -93,15 +116,94 @@ Remember:
 - Output in Markdown format with proper letterhead
 - Current date: {datetime.now().strftime("%B %d, %Y")}
 """
+    if target:
+        full_prompt += f"- This letter supports {target}\n"
 
     logger.info(f"Combined prompt size: {len(full_prompt.split())} words")
     return full_prompt
 
 
+def build_letter_messages(full_prompt: str) -> list:
+    """Build the chat messages asking the LLM to write a letter."""
+    return [
+        {
+            "role": "system",
+            "content": (
+                "You are an expert at writing letters of recommendation that "
+                "authentically capture a professor's distinctive writing style while "
+                "accurately representing student qualifications. You never hallucinate "
+                "or invent details not provided in the source materials."
+            )
+        },
+        {
+            "role": "user",
+            "content": full_prompt
+        }
+    ]
+
+
+def save_letter(letter: str, student_dir: Path, output_filename: str) -> Path:
+    """Save a letter draft in the student's output/ directory."""
+    output_dir = student_dir / "output"
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    output_path = output_dir / output_filename
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(letter)
+
+    logger.info(f"Letter saved to: {output_path}")
+    logger.info(f"Size: {len(letter.split())} words")
+    return output_path
+
+
+def parse_targets(spec: str) -> Dict[str, str]:
+    """
+    Parse a --targets value into target names and their letter types.
+
+    Targets are comma-separated; each is a letter type (phd) or NAME=TYPE
+    (stanford=phd, google=job) when several letters share a type.
+
+    Raises:
+        ValueError: If a target is malformed, repeated or of an unknown type
+    """
+    targets = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        name, _, letter_type = item.rpartition('=')
+        name = name.strip() or letter_type
+        letter_type = letter_type.strip().lower()
+        if letter_type not in LETTER_TYPES:
+            raise ValueError(f"Unknown letter type '{letter_type}' in target '{item}', expected one of {', '.join(LETTER_TYPES)}")
+        if not re.fullmatch(r"[\w.-]+", name):
+            raise ValueError(f"Invalid target name '{name}'; use letters, digits, '.', '-' or '_'")
+        if name in targets:
+            raise ValueError(f"Target '{name}' given twice")
+        targets[name] = letter_type
+    if not targets:
+        raise ValueError("No targets given")
+    return targets
+
+
+def _timed_stream(messages: list, on_text: Optional[Callable[[str], None]]) -> Iterator[str]:
+    """Stream a letter, passing each piece to on_text and logging the time to first text."""
+    started = time.perf_counter()
+    first = True
+    for text in stream_llm(messages=messages, temperature=0.7):
+        if first:
+            logger.info(f"Letter started arriving after {time.perf_counter() - started:.1f}s")
+            first = False
+        if on_text is not None:
+            on_text(text)
+        yield text
+    logger.info(f"Letter complete after {time.perf_counter() - started:.1f}s")
+
+
 def generate_letter(
     student_dir: Path,
     style_guide_path: Path,
-    output_filename: str = "letter_draft.md"
+    output_filename: str = "letter_draft.md",
+    letter_type: Optional[str] = None,
+    stream: bool = False,
+    on_text: Optional[Callable[[str], None]] = None,
 ) -> Path:
     """
     Generate a letter of recommendation for a student.
@@ -110,6 +212,13 @@ def generate_letter(
         student_dir: Path to student directory containing student_packet.md
         style_guide_path: Path to style guide (defaults to data/style_guide/style_guide.md)
         output_filename: Name for output file (default: letter_draft.md)
+        letter_type: Selects the packet sections to send: phd, ms, job or full
+            (default: from the packet's Letter Type)
+        stream: Write the letter to output/<output_filename>.tmp as it is
+            generated and rename it into place once complete; interrupting
+            leaves any previous draft untouched
+        on_text: Called with each piece of text as it arrives (stream only),
+            e.g. to show the letter live
 
     Returns:
         Path to generated letter
@@ -133,7 +242,7 @@ def generate_letter(
     logger.info(f"Style guide loaded ({len(style_guide.split())} words)")
 
     logger.info(f"Loading student packet from: {student_dir / 'student_packet.md'}")
-    student_packet = load_student_packet(student_dir)
+    student_packet = load_student_packet(student_dir, letter_type)
     logger.info(f"Student packet loaded ({len(student_packet.split())} words)")
 
     # Combine for prompt
@@ -145,39 +254,22 @@ def generate_letter(
 
     # Call LLM to generate letter
     logger.info("Sending to LLM for letter generation...")
-    logger.info("This may take 1-2 minutes as the LLM crafts the letter...")
-
-    letter = call_llm(
-        messages=[
-            {
-                "role": "system",
-                "content": (
-                    "You are an expert at writing letters of recommendation that "
-                    "authentically capture a professor's distinctive writing style while "
-                    "accurately representing student qualifications. You never hallucinate "
-                    "or invent details not provided in the source materials."
-                )
-            },
-            {
-                "role": "user",
-                "content": full_prompt
-            }
-        ],
-        temperature=0.7,  # Balanced between creativity (style) and consistency (facts)
-    )
-
-    logger.info("Successfully received letter from LLM")
-
-    # Create output directory and save
-    output_dir = student_dir / "output"
-    output_dir.mkdir(parents=True, exist_ok=True)
+    messages = build_letter_messages(full_prompt)
+    if stream:
+        output_path = student_dir / "output" / output_filename
+        write_markdown_stream(_timed_stream(messages, on_text), output_path, separator="")
+        logger.info(f"Size: {len(output_path.read_text(encoding='utf-8').split())} words")
+    else:
+        logger.info("This may take 1-2 minutes as the LLM crafts the letter...")
+
+        letter = call_llm(
+            messages=messages,
+            temperature=0.7,  # Balanced between creativity (style) and consistency (facts)
+        )
 
-    output_path = output_dir / output_filename
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(letter)
+        logger.info("Successfully received letter from LLM")
 
-    logger.info(f"Letter saved to: {output_path}")
-    logger.info(f"Size: {len(letter.split())} words")
+        output_path = save_letter(letter, student_dir, output_filename)
 
     # Log completion with next steps
     logger.info(f"\n{'='*60}")
@@ -192,3 +284,86 @@ def generate_letter(
     logger.info(f"{'='*60}")
 
     return output_path
+
+
+def generate_letters(
+    student_dir: Path,
+    style_guide_path: Path,
+    targets: Dict[str, str],
+    output_template: str = "letter_{name}.md",
+    warm_cache: bool = False,
+) -> Dict[str, Path]:
+    """
+    Generate several letters for one student concurrently, one per target.
+
+    Every variant is sent the same template, style guide and packet (the
+    sections any of the targets' letter types need) ahead of its own target
+    line, so providers with prompt caching (e.g. OpenAI's automatic prefix
+    caching) bill the shared prefix once. Cached prompt tokens are reported
+    for each variant.
+
+    Args:
+        student_dir: Path to student directory containing student_packet.md
+        style_guide_path: Path to style guide
+        targets: Letter type by target name (see parse_targets)
+        output_template: Output filename, formatted with the target name
+        warm_cache: Send the first variant alone before the others, so they
+            find the shared prefix already cached (one letter's latency more)
+
+    Returns:
+        Path to each generated letter, by target name
+
+    Raises:
+        RuntimeError: If any variant failed; the others are saved first
+    """
+    logger.info(f"Generating {len(targets)} letters for: {student_dir.name} ({', '.join(targets)})")
+    prompt_template = load_prompt_template()
+    style_guide = load_style_guide(style_guide_path)
+    letter_types = list(dict.fromkeys(targets.values()))
+    student_packet = load_student_packet(student_dir, letter_types[0], letter_types[1:])
+
+    # Name the target too, so letters of the same type for different places differ
+    requests = [
+        build_letter_messages(combine_for_letter_generation(
+            prompt_template, style_guide, student_packet,
+            LETTER_TYPE_TARGETS[letter_type] + (f" ({name})" if name != letter_type else ""),
+        ))
+        for name, letter_type in targets.items()
+    ]
+    scheduler = get_scheduler()
+    results = []
+    if warm_cache and len(requests) > 1:
+        # Requests sent at the same moment all miss a cold prompt cache
+        results = scheduler.run(
+            [scheduler.submit_with_usage(messages=requests[0], temperature=0.7)],
+            return_exceptions=True,
+        )
+    # One failed variant (rate limit, timeout, content filter) mustn't discard the rest
+    results += scheduler.run([
+        scheduler.submit_with_usage(messages=messages, temperature=0.7)
+        for messages in requests[len(results):]
+    ], return_exceptions=True)
+
+    paths = {}
+    failed = []
+    for name, result in zip(targets, results):
+        if isinstance(result, Exception):
+            logger.error(f"{name}: letter generation failed: {result}")
+            failed.append(name)
+            continue
+        letter, usage = result
+        if usage.from_cache:
+            logger.info(f"{name}: served from the response cache")
+        else:
+            logger.info(
+                f"{name}: {usage.prompt_tokens} prompt tokens, {usage.cached_tokens} cached "
+                f"({usage.cached_share:.0%}), {usage.completion_tokens} completion tokens"
+            )
+        paths[name] = save_letter(letter, student_dir, output_template.format(name=name))
+
+    if failed:
+        raise RuntimeError(
+            f"{len(failed)} of {len(targets)} letter(s) failed ({', '.join(failed)}); "
+            f"the others were saved: {', '.join(path.name for path in paths.values()) or 'none'}"
+        )
+    return paths
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Leak scanner for redacted letter archives.
+
+For every original .docx, identifiers are collected from two independent
+sources: what the local pre-redaction pass can find (student name variants,
+emails, phone numbers, student IDs), and what the redaction actually replaced,
+found by aligning the original with its redacted .md and taking the original
+words that became [STUDENT_*] placeholders. The second source catches names the
+pre-redaction heuristics miss, wherever else they survive in the archive. All
+identifiers go into one Aho-Corasick automaton, and every redacted .md file is
+scanned in a single linear pass. A match means an identifier survived
+redaction; matches from a different letter's identifiers are reported too,
+since the same student often appears in several letters.
+"""
+
+import bisect
+import difflib
+import logging
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from lor.file_utils import convert_docx_to_markdown, find_docx_files
+from lor.pre_redaction import PLACEHOLDER_PATTERN, SENTENCE_STARTERS, find_identifiers
+
+logger = logging.getLogger(__name__)
+
+# Words, emails and numbers, with [STUDENT_*] placeholders kept whole
+TOKEN_PATTERN = re.compile(r"\[STUDENT_[A-Z]+(?:_\d+)?\]|[\w.@+'\-]*\w")
+
+
+@dataclass(frozen=True)
+class Leak:
+    """An identifier from an original letter found in a redacted file."""
+
+    path: Path
+    line: int
+    column: int
+    identifier: str
+    placeholder: str
+    source: str
+
+    def __str__(self) -> str:
+        return (
+            f"{self.path}:{self.line}:{self.column}: {self.identifier!r} "
+            f"(should be {self.placeholder}, from {self.source})"
+        )
+
+
+class AhoCorasick:
+    """Multi-pattern string matcher that finds every pattern occurrence in one pass."""
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[str]] = [[]]
+        for pattern in patterns:
+            if pattern:
+                self._add(pattern)
+        self._build_failure_links()
+
+    def _add(self, pattern: str) -> None:
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(pattern)
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, str]]:
+        """Yield (start index, pattern) for every occurrence, including overlapping ones."""
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for pattern in self._output[state]:
+                yield index - len(pattern) + 1, pattern
+
+
+def _on_word_boundary(text: str, start: int, end: int) -> bool:
+    """True unless the match is part of a longer word (e.g. "Ann" in "Annual")."""
+    before = text[start - 1] if start > 0 else " "
+    after = text[end] if end < len(text) else " "
+    return not (text[start].isalnum() and before.isalnum()) and not (text[end - 1].isalnum() and after.isalnum())
+
+
+def aligned_identifiers(original: str, redacted: str, min_length: int = 3) -> Dict[str, str]:
+    """
+    Return the original words that the redaction replaced with placeholders.
+
+    The two texts are aligned word by word; in each stretch where the redacted
+    text has a [STUDENT_*] placeholder instead of original words, the original's
+    capitalized words, emails and numbers are taken as identifiers. This relies
+    only on what the redaction did, not on the pre-redaction heuristics.
+
+    Args:
+        original: Unredacted letter
+        redacted: The same letter after redaction
+        min_length: Shorter words (initials, "Al") are left out, unless they hold digits
+
+    Returns:
+        Mapping of identifier to the placeholder that replaced it
+    """
+    original_tokens = TOKEN_PATTERN.findall(original)
+    redacted_tokens = TOKEN_PATTERN.findall(redacted)
+    matcher = difflib.SequenceMatcher(None, original_tokens, redacted_tokens, autojunk=False)
+    identifiers = {}
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        placeholders = [token for token in redacted_tokens[j1:j2] if PLACEHOLDER_PATTERN.fullmatch(token)]
+        if tag != 'replace' or not placeholders:
+            continue
+        for token in original_tokens[i1:i2]:
+            if token.endswith("'s"):
+                token = token[:-2]
+            if PLACEHOLDER_PATTERN.fullmatch(token) or token in SENTENCE_STARTERS:
+                continue
+            has_digits = any(char.isdigit() for char in token)
+            if (token[0].isupper() and len(token) >= min_length) or has_digits or "@" in token:
+                identifiers.setdefault(token, placeholders[0])
+    return identifiers
+
+
+def _identifiers_for(docx_path: Path, redacted_path: Optional[Path] = None) -> Dict[str, str]:
+    original = convert_docx_to_markdown(docx_path)
+    identifiers = find_identifiers(original)
+    if redacted_path is not None:
+        for identifier, placeholder in aligned_identifiers(original, redacted_path.read_text(encoding='utf-8')).items():
+            identifiers.setdefault(identifier, placeholder)
+    return identifiers
+
+
+def collect_identifiers(
+    originals: List[Path],
+    workers: int = 1,
+    redacted_files: Optional[Dict[str, Path]] = None,
+) -> Dict[str, Tuple[str, str]]:
+    """
+    Find the student identifiers in each original letter.
+
+    Args:
+        originals: Original .docx files
+        workers: Number of processes for converting the originals
+        redacted_files: Redacted .md file by original file stem; each original
+            with one also contributes the words its redaction replaced
+
+    Returns:
+        Mapping of identifier to (placeholder, source file name)
+    """
+    redacted_paths = [(redacted_files or {}).get(path.stem) for path in originals]
+    if workers > 1 and len(originals) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            per_document = list(pool.map(_identifiers_for, originals, redacted_paths))
+    else:
+        per_document = [_identifiers_for(path, redacted) for path, redacted in zip(originals, redacted_paths)]
+
+    identifiers = {}
+    for path, found in zip(originals, per_document):
+        for identifier, placeholder in found.items():
+            identifiers.setdefault(identifier, (placeholder, path.name))
+    return identifiers
+
+
+def scan_text(
+    text: str,
+    path: Path,
+    matcher: AhoCorasick,
+    identifiers: Dict[str, Tuple[str, str]],
+) -> List[Leak]:
+    """Scan one redacted document and return its leaks with line/column locations."""
+    line_starts = [0] + [i + 1 for i, char in enumerate(text) if char == "\n"]
+    leaks = []
+    for start, identifier in matcher.finditer(text):
+        if not _on_word_boundary(text, start, start + len(identifier)):
+            continue
+        line = bisect.bisect_right(line_starts, start)
+        placeholder, source = identifiers[identifier]
+        leaks.append(Leak(path, line, start - line_starts[line - 1] + 1, identifier, placeholder, source))
+    return leaks
+
+
+def verify_redaction(original_path: Path, redacted_dir: Path, workers: int = 1) -> List[Leak]:
+    """
+    Check that identifiers from the original letters are gone from the redacted archive.
+
+    Args:
+        original_path: Original .docx file or directory of them
+        redacted_dir: Directory of redacted .md files
+        workers: Number of processes for converting the originals
+
+    Returns:
+        Every leak found, grouped by redacted file
+    """
+    originals = find_docx_files(original_path)
+    if not originals:
+        raise ValueError(f"No .docx files found in {original_path}")
+    redacted_files = sorted(redacted_dir.rglob("*.md"))
+    if not redacted_files:
+        raise ValueError(f"No .md files found in {redacted_dir}")
+
+    # Redaction writes each letter's output under its original's stem
+    by_stem = {}
+    for path in redacted_files:
+        by_stem.setdefault(path.stem, path)
+    identifiers = collect_identifiers(originals, workers, by_stem)
+    logger.info(f"Collected {len(identifiers)} identifier(s) from {len(originals)} original letter(s)")
+    matcher = AhoCorasick(identifiers)
+
+    leaks = []
+    for path in redacted_files:
+        with open(path, 'r', encoding='utf-8') as f:
+            leaks.extend(scan_text(f.read(), path, matcher, identifiers))
+
+    logger.info(f"Scanned {len(redacted_files)} redacted file(s): {len(leaks)} leak(s)")
+    return leaks
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Representative sampling of redacted letters for style extraction.
+
+Many letters in an archive are near-identical variants of one letter sent to
+different programs. A local TF-IDF index over the letters is used to drop
+near-duplicates and then pick a diverse subset that fits a token budget: a
+greedy facility-location selection adds, at each step, the letter that most
+improves how well every letter in the archive is represented by its most
+similar chosen letter, per token spent.
+"""
+
+import logging
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from lor.llm import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+TERM_PATTERN = re.compile(r"\[[A-Z_0-9]+\]|[a-z0-9]+(?:'[a-z]+)?")
+
+# Letters at least this cosine-similar are treated as variants of one letter
+DEFAULT_DUPLICATE_THRESHOLD = 0.9
+
+
+def build_tfidf(letters: Sequence[str]) -> np.ndarray:
+    """
+    Return L2-normalized TF-IDF vectors (one row per letter) over words and word pairs.
+
+    Terms that occur in only one letter carry no similarity signal and are
+    left out, which keeps the matrix small.
+    """
+    term_counts: List[Counter] = []
+    document_frequency: Counter = Counter()
+    for letter in letters:
+        words = TERM_PATTERN.findall(letter.lower())
+        counts = Counter(words)
+        counts.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+        term_counts.append(counts)
+        document_frequency.update(counts.keys())
+
+    vocabulary: Dict[str, int] = {}
+    for term, df in document_frequency.items():
+        if df >= 2:
+            vocabulary[term] = len(vocabulary)
+
+    matrix = np.zeros((len(letters), max(len(vocabulary), 1)), dtype=np.float32)
+    for row, counts in enumerate(term_counts):
+        for term, count in counts.items():
+            column = vocabulary.get(term)
+            if column is not None:
+                matrix[row, column] = 1.0 + math.log(count)
+
+    idf = np.ones(matrix.shape[1], dtype=np.float32)
+    for term, column in vocabulary.items():
+        idf[column] = math.log((1 + len(letters)) / (1 + document_frequency[term])) + 1.0
+    matrix *= idf
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+def drop_near_duplicates(similarity: np.ndarray, threshold: float = DEFAULT_DUPLICATE_THRESHOLD) -> List[int]:
+    """
+    Return the indices of letters to keep, one per group of near-duplicates.
+
+    Within a group, the earliest letter is kept.
+    """
+    keep: List[int] = []
+    for index in range(similarity.shape[0]):
+        if not keep or similarity[index, keep].max() < threshold:
+            keep.append(index)
+    return keep
+
+
+def select_representative(
+    letters: Sequence[str],
+    token_budget: int,
+    duplicate_threshold: float = DEFAULT_DUPLICATE_THRESHOLD,
+) -> List[int]:
+    """
+    Pick a diverse, representative subset of letters that fits the token budget.
+
+    Args:
+        letters: Loaded redacted letters
+        token_budget: Total tokens the selected letters may use
+        duplicate_threshold: Cosine similarity above which letters count as duplicates
+
+    Returns:
+        Indices of the selected letters, in their original order
+    """
+    if not letters:
+        return []
+
+    vectors = build_tfidf(letters)
+    similarity = vectors @ vectors.T
+    candidates = drop_near_duplicates(similarity, duplicate_threshold)
+    costs = np.array([estimate_tokens(letter) for letter in letters], dtype=np.float64)
+
+    # Coverage of each letter by the current selection (best similarity to any chosen letter)
+    coverage = np.zeros(len(letters), dtype=np.float32)
+    selected: List[int] = []
+    remaining = float(token_budget)
+    available = np.array(candidates)
+
+    while available.size:
+        affordable = available[costs[available] <= remaining]
+        if not affordable.size:
+            break
+        # Gain in total coverage from adding each affordable letter, per token
+        gains = np.maximum(similarity[affordable], coverage).sum(axis=1) - coverage.sum()
+        best = int(affordable[np.argmax(gains / costs[affordable])])
+
+        selected.append(best)
+        coverage = np.maximum(coverage, similarity[best])
+        remaining -= costs[best]
+        available = available[available != best]
+
+    logger.info(
+        f"Selected {len(selected)} of {len(letters)} letter(s) "
+        f"({len(letters) - len(candidates)} near-duplicate(s) dropped, "
+        f"mean coverage {coverage.mean():.2f}, {token_budget - remaining:.0f} tokens)"
+    )
+    return sorted(selected)
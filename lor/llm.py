@@ -1,17 +1,183 @@
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, Optional, Tuple
+
 import litellm
-from litellm import completion
+from litellm import completion, acompletion
+
+from lor.llm_cache import ResponseCache, make_cache_key, DEFAULT_CACHE_DIR
 
 litellm.drop_params = True
 
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "gpt-5.2"
+
+# Rough characters-per-token ratio for English prose, used for budgeting prompts
+CHARS_PER_TOKEN = 4
+
+# Response cache shared by every call_llm invocation (None means caching is off)
+_response_cache: Optional[ResponseCache] = None
+
+
+def configure_cache(
+    enabled: bool = True,
+    cache_dir: Path = DEFAULT_CACHE_DIR,
+    refresh: bool = False,
+) -> Optional[ResponseCache]:
+    """
+    Enable or disable the persistent LLM response cache.
+
+    Args:
+        enabled: Whether call_llm should consult the cache
+        cache_dir: Directory holding cached responses
+        refresh: Ignore existing entries but store fresh responses
+
+    Returns:
+        The active cache, or None if caching is disabled
+    """
+    global _response_cache
+    _response_cache = ResponseCache(cache_dir, refresh=refresh) if enabled else None
+    return _response_cache
+
+
+def get_cache() -> Optional[ResponseCache]:
+    """Return the active response cache, if any."""
+    return _response_cache
+
+
+@dataclass
+class TokenUsage:
+    """Token counts the provider reported for one request."""
+
+    prompt_tokens: int = 0
+    cached_tokens: int = 0  # prompt tokens served from the provider's prompt cache
+    completion_tokens: int = 0
+    from_cache: bool = False  # answered by the local response cache, no request made
+
+    @property
+    def cached_share(self) -> float:
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+
+def _token_usage(resp: Any) -> TokenUsage:
+    """Read token usage from a litellm response, including cached prompt tokens."""
+    usage = getattr(resp, "usage", None)
+    if usage is None:
+        return TokenUsage()
+    details = getattr(usage, "prompt_tokens_details", None)
+    # OpenAI-style responses report prompt_tokens_details.cached_tokens,
+    # Anthropic-style ones cache_read_input_tokens
+    cached = getattr(details, "cached_tokens", None) or getattr(usage, "cache_read_input_tokens", None) or 0
+    return TokenUsage(
+        prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+        cached_tokens=cached,
+        completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
+    )
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheaply estimate how many tokens text will use in a prompt."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _cache_lookup(messages: list, model: str, temperature: float) -> Tuple[Optional[str], Optional[str]]:
+    """Return (cache key, cached response) for a request; both None when caching is off."""
+    if _response_cache is None:
+        return None, None
+    key = make_cache_key(model, messages, temperature)
+    cached = _response_cache.get(key)
+    if cached is not None:
+        logger.info("Using cached LLM response")
+    return key, cached
+
+
+def _cache_store(key: Optional[str], content: str, model: str) -> None:
+    if key is not None and _response_cache is not None:
+        _response_cache.put(key, content, model)
+
+
 def call_llm(
     messages: list,
-    model: str = "gpt-5.2",
+    model: str = DEFAULT_MODEL,
     temperature: float = 1.0,
 ) -> str:
     """Vendor-agnostic LLM call."""
+    key, cached = _cache_lookup(messages, model, temperature)
+    if cached is not None:
+        return cached
+
     resp = completion(
         model=model,
         messages=messages,
         temperature=temperature,
     )
-    return resp.choices[0].message["content"]
\ No newline at end of file
+    content = resp.choices[0].message["content"]
+    _cache_store(key, content, model)
+    return content
+
+
+def stream_llm(
+    messages: list,
+    model: str = DEFAULT_MODEL,
+    temperature: float = 1.0,
+) -> Iterator[str]:
+    """
+    Vendor-agnostic streaming LLM call, yielding the response text as it arrives.
+
+    Only a completely received response is stored in the response cache, and
+    a cached response is yielded in one piece. Closing the generator early
+    (e.g. on Ctrl-C) abandons the request.
+    """
+    key, cached = _cache_lookup(messages, model, temperature)
+    if cached is not None:
+        yield cached
+        return
+
+    parts = []
+    for chunk in completion(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        stream=True,
+    ):
+        # Usage and keep-alive chunks carry no choices, or a choice without content
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta
+        text = delta.content if delta is not None else None
+        if text:
+            parts.append(text)
+            yield text
+    _cache_store(key, "".join(parts), model)
+
+
+async def acall_llm(
+    messages: list,
+    model: str = DEFAULT_MODEL,
+    temperature: float = 1.0,
+) -> str:
+    """Vendor-agnostic LLM call as a coroutine (see lor.llm_scheduler for concurrency limits)."""
+    content, _ = await acall_llm_with_usage(messages, model, temperature)
+    return content
+
+
+async def acall_llm_with_usage(
+    messages: list,
+    model: str = DEFAULT_MODEL,
+    temperature: float = 1.0,
+) -> Tuple[str, TokenUsage]:
+    """Like acall_llm, but also return the token usage the provider reported."""
+    key, cached = _cache_lookup(messages, model, temperature)
+    if cached is not None:
+        return cached, TokenUsage(from_cache=True)
+
+    resp = await acompletion(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+    )
+    content = resp.choices[0].message["content"]
+    _cache_store(key, content, model)
+    return content, _token_usage(resp)
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Content-addressed on-disk cache for LLM responses.
+
+Each response is stored as a small JSON file whose name is the SHA-256 hash of
+the request (model, messages, temperature and cache format version). Because
+the prompt templates are embedded in the messages, editing a template changes
+the key and naturally invalidates old entries.
+
+Entries are evicted least-recently-used first once the cache exceeds its size
+limit, and any entry older than the maximum age is discarded.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump when the key derivation or entry layout changes
+CACHE_FORMAT_VERSION = 1
+
+DEFAULT_CACHE_DIR = Path("data/cache/llm")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_AGE_SECONDS = 90 * 24 * 60 * 60
+
+
+def make_cache_key(model: str, messages: list, temperature: float) -> str:
+    """Return a stable hash identifying an LLM request."""
+    payload = json.dumps(
+        {
+            "version": CACHE_FORMAT_VERSION,
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """Persistent LLM response cache with size/age-based LRU eviction."""
+
+    def __init__(
+        self,
+        cache_dir: Path = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+        refresh: bool = False,
+    ):
+        """
+        Args:
+            cache_dir: Directory holding the cache entries
+            max_bytes: Total size above which least-recently-used entries are evicted
+            max_age_seconds: Entries older than this are treated as misses and removed
+            refresh: If True, never read from the cache but still store new responses
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self._total_bytes: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _entries(self) -> List[Path]:
+        if not self.cache_dir.exists():
+            return []
+        return list(self.cache_dir.glob("*/*.json"))
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None on a miss."""
+        with self._lock:
+            if self.refresh:
+                self.misses += 1
+                return None
+
+            path = self._entry_path(key)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except FileNotFoundError:
+                self.misses += 1
+                return None
+            except (OSError, ValueError) as e:
+                logger.warning(f"Discarding unreadable cache entry {path.name}: {e}")
+                self._remove(path)
+                self.misses += 1
+                return None
+
+            if time.time() - entry.get("created", 0) > self.max_age_seconds:
+                logger.debug(f"Cache entry {key[:12]} expired")
+                self._remove(path)
+                self.misses += 1
+                return None
+
+            # Touch the entry so eviction treats it as recently used
+            os.utime(path)
+            self.hits += 1
+            logger.debug(f"Cache hit for {key[:12]}")
+            return entry["content"]
+
+    def put(self, key: str, content: str, model: str) -> None:
+        """Store a response and evict old entries if the cache is over its limit."""
+        with self._lock:
+            path = self._entry_path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            data = json.dumps(
+                {"key": key, "model": model, "created": time.time(), "content": content},
+                ensure_ascii=False,
+            )
+            try:
+                replaced_bytes = path.stat().st_size
+            except FileNotFoundError:
+                replaced_bytes = 0
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            self.writes += 1
+
+            if self._total_bytes is None:
+                self._total_bytes = sum(p.stat().st_size for p in self._entries())
+            else:
+                # Overwriting an entry replaces its bytes rather than adding to them
+                self._total_bytes += path.stat().st_size - replaced_bytes
+
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _remove(self, path: Path) -> None:
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except FileNotFoundError:
+            return
+        if self._total_bytes is not None:
+            self._total_bytes -= size
+
+    def _evict(self) -> None:
+        """Drop expired entries, then least-recently-used ones until under the size limit."""
+        now = time.time()
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for mtime, size, path in entries:
+            if total <= self.max_bytes and now - mtime <= self.max_age_seconds:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            evicted += 1
+
+        self._total_bytes = total
+        if evicted:
+            logger.info(f"Evicted {evicted} LLM cache entr{'y' if evicted == 1 else 'ies'}")
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        with self._lock:
+            for path in self._entries():
+                path.unlink(missing_ok=True)
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/write counters for this process."""
+        return {"hits": self.hits, "misses": self.misses, "writes": self.writes}
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Bounded-concurrency scheduler for asynchronous LLM calls.
+
+Phases that process many documents (redaction, packet synthesis, letter
+generation) submit their requests here instead of calling the provider one at
+a time. The scheduler caps the total number of requests in flight and,
+optionally, the number of concurrent requests per model, so a large batch runs
+as a pipeline without tripping provider rate limits.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Dict, Iterable, List, Optional, Tuple
+
+from lor.llm import acall_llm, acall_llm_with_usage, DEFAULT_MODEL, TokenUsage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_IN_FLIGHT = 8
+
+
+class LLMScheduler:
+    """Limits how many LLM requests run concurrently, globally and per model."""
+
+    def __init__(
+        self,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        per_model_limits: Optional[Dict[str, int]] = None,
+    ):
+        """
+        Args:
+            max_in_flight: Maximum number of requests in flight across all models
+            per_model_limits: Optional mapping of model name to its own concurrency cap
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        self.max_in_flight = max_in_flight
+        self.per_model_limits = dict(per_model_limits or {})
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._loop = None
+        self._global: Optional[asyncio.Semaphore] = None
+        self._per_model: Dict[str, asyncio.Semaphore] = {}
+
+    def _bind_to_running_loop(self) -> None:
+        """(Re)create the semaphores for the current event loop."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._global = asyncio.Semaphore(self.max_in_flight)
+            self._per_model = {
+                model: asyncio.Semaphore(limit)
+                for model, limit in self.per_model_limits.items()
+            }
+
+    @asynccontextmanager
+    async def slot(self, model: str = DEFAULT_MODEL):
+        """Hold one request slot for model until the block exits."""
+        self._bind_to_running_loop()
+        model_semaphore = self._per_model.get(model)
+
+        # Wait for the per-model cap first so queued requests for a busy
+        # model don't occupy global slots other models could use
+        if model_semaphore is not None:
+            await model_semaphore.acquire()
+        try:
+            async with self._global:
+                self.in_flight += 1
+                self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+                try:
+                    yield
+                finally:
+                    self.in_flight -= 1
+        finally:
+            if model_semaphore is not None:
+                model_semaphore.release()
+
+    async def submit(
+        self,
+        messages: list,
+        model: str = DEFAULT_MODEL,
+        temperature: float = 1.0,
+    ) -> str:
+        """Run one LLM request once a slot is available."""
+        async with self.slot(model):
+            return await acall_llm(messages=messages, model=model, temperature=temperature)
+
+    async def submit_with_usage(
+        self,
+        messages: list,
+        model: str = DEFAULT_MODEL,
+        temperature: float = 1.0,
+    ) -> Tuple[str, TokenUsage]:
+        """Run one LLM request once a slot is available, returning its token usage too."""
+        async with self.slot(model):
+            return await acall_llm_with_usage(messages=messages, model=model, temperature=temperature)
+
+    def run(self, coros: Iterable[Awaitable[Any]], return_exceptions: bool = False) -> List[Any]:
+        """
+        Run coroutines concurrently from synchronous code and return their results in order.
+
+        Args:
+            coros: Coroutines that submit their LLM work to this scheduler
+            return_exceptions: If True, failures are returned in place of results
+                instead of aborting the whole batch
+
+        Returns:
+            List of results in the same order as coros
+        """
+        async def gather_all():
+            return await asyncio.gather(*coros, return_exceptions=return_exceptions)
+
+        return asyncio.run(gather_all())
+
+
+# Scheduler shared by every phase
+_scheduler = LLMScheduler()
+
+
+def configure_scheduler(
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    per_model_limits: Optional[Dict[str, int]] = None,
+) -> LLMScheduler:
+    """Replace the shared scheduler with one using the given limits."""
+    global _scheduler
+    _scheduler = LLMScheduler(max_in_flight, per_model_limits)
+    return _scheduler
+
+
+def get_scheduler() -> LLMScheduler:
+    """Return the shared scheduler."""
+    return _scheduler
+
+
+def parse_model_limits(specs: Iterable[str]) -> Dict[str, int]:
+    """Parse 'model=N' strings (as given on the command line) into a limits mapping."""
+    limits = {}
+    for spec in specs:
+        model, sep, limit = spec.rpartition('=')
+        if not sep or not model or not limit.isdigit() or int(limit) < 1:
+            raise ValueError(f"Invalid model limit '{spec}', expected MODEL=N with N >= 1")
+        limits[model] = int(limit)
+    return limits
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Content-hash manifests for incremental processing.
+
+A manifest is a small JSON file kept next to a phase's outputs. It records, for
+each input, the hashes and settings the output was produced from, so a later
+run can skip inputs whose recorded fields still match and prune outputs whose
+input has disappeared.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump when the manifest layout changes; older manifests are then ignored
+MANIFEST_VERSION = 1
+
+
+def hash_bytes(data: bytes) -> str:
+    """Return the SHA-256 hex digest of data."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_text(text: str) -> str:
+    """Return the SHA-256 hex digest of a string."""
+    return hash_bytes(text.encode('utf-8'))
+
+
+def hash_file(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Return the SHA-256 hex digest of a file's contents, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Manifest:
+    """Mapping of input keys to the fields their outputs were produced from."""
+
+    def __init__(self, path: Path, entries: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.path = Path(path)
+        self.entries: Dict[str, Dict[str, Any]] = entries or {}
+
+    @classmethod
+    def load(cls, path: Path) -> "Manifest":
+        """Load a manifest, starting empty if it is missing, unreadable or outdated."""
+        path = Path(path)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return cls(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable manifest {path}: {e}")
+            return cls(path)
+
+        if data.get("version") != MANIFEST_VERSION:
+            logger.info(f"Ignoring manifest {path} from an older version")
+            return cls(path)
+        return cls(path, data.get("entries", {}))
+
+    def save(self) -> None:
+        """Write the manifest atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": MANIFEST_VERSION, "entries": self.entries}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the entry recorded for key, if any."""
+        return self.entries.get(key)
+
+    def is_current(self, key: str, **fields: Any) -> bool:
+        """True if key has an entry whose fields all equal the given values."""
+        entry = self.entries.get(key)
+        return entry is not None and all(entry.get(name) == value for name, value in fields.items())
+
+    def record(self, key: str, **fields: Any) -> None:
+        """Replace the entry for key."""
+        self.entries[key] = dict(fields)
+
+    def remove(self, key: str) -> Optional[Dict[str, Any]]:
+        """Drop and return the entry for key, if any."""
+        return self.entries.pop(key, None)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self.entries))
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the PDF text extraction backends on a local corpus.
+
+Each backend extracts every page of every PDF in a fresh worker process, so
+its peak memory can be measured without interference from the others.
+Throughput (pages/sec), peak memory and the token count of the extracted text
+are reported; a backend that extracts far fewer tokens than the best one is
+losing text and is not recommended however fast it is.
+"""
+
+import logging
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from lor.file_utils import PDF_BACKENDS, get_pdf_backend
+from lor.llm import estimate_tokens
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# A backend must extract at least this share of the best backend's tokens
+DEFAULT_MIN_TOKEN_RATIO = 0.9
+
+
+@dataclass
+class BenchResult:
+    """Extraction measurements for one backend over the whole corpus."""
+
+    backend: str
+    pages: int = 0
+    seconds: float = 0.0
+    tokens: int = 0
+    peak_memory_mb: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.pages / self.seconds if self.seconds > 0 else 0.0
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run_backend(backend_name: str, pdf_paths: List[Path]) -> Tuple[int, float, int, Optional[float]]:
+    """Extract every page with one backend; runs in a fresh worker process."""
+    backend = PDF_BACKENDS[backend_name]
+    baseline = _peak_rss_mb()
+    pages = tokens = 0
+    started = time.perf_counter()
+    for pdf_path in pdf_paths:
+        page_count = backend.page_count(pdf_path)
+        tokens += sum(estimate_tokens(text) for text in backend.iter_pages(pdf_path, 0, page_count))
+        pages += page_count
+    seconds = time.perf_counter() - started
+    peak = _peak_rss_mb()
+    return pages, seconds, tokens, None if peak is None else peak - baseline
+
+
+def benchmark_pdf_backends(pdf_paths: List[Path], backends: Optional[Iterable[str]] = None) -> List[BenchResult]:
+    """
+    Measure each backend's extraction speed, peak memory and output size.
+
+    Args:
+        pdf_paths: PDFs to extract
+        backends: Backend names (default: every installed backend)
+
+    Returns:
+        One result per backend; uninstalled or failing backends carry an error
+    """
+    names = list(backends) if backends else [name for name, b in PDF_BACKENDS.items() if b.is_available()]
+    results = []
+    for name in names:
+        result = BenchResult(backend=name)
+        try:
+            get_pdf_backend(name)
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                result.pages, result.seconds, result.tokens, result.peak_memory_mb = pool.submit(
+                    _run_backend, name, pdf_paths
+                ).result()
+            logger.info(f"{name}: {result.pages} pages in {result.seconds:.2f}s")
+        except Exception as e:
+            result.error = str(e)
+            logger.warning(f"{name} failed: {e}")
+        results.append(result)
+    return results
+
+
+def recommend_backend(results: List[BenchResult], min_token_ratio: float = DEFAULT_MIN_TOKEN_RATIO) -> Optional[str]:
+    """Return the fastest backend whose output is within min_token_ratio of the most complete one."""
+    succeeded = [result for result in results if result.error is None and result.pages]
+    if not succeeded:
+        return None
+    most_tokens = max(result.tokens for result in succeeded)
+    acceptable = [result for result in succeeded if result.tokens >= min_token_ratio * most_tokens]
+    return max(acceptable, key=lambda result: result.pages_per_second).backend
+
+
+def format_results(results: List[BenchResult]) -> str:
+    """Render benchmark results as a plain-text table."""
+    lines = [f"{'backend':<12} {'pages':>6} {'pages/sec':>10} {'peak MB':>8} {'tokens':>8}"]
+    for result in results:
+        if result.error is not None:
+            lines.append(f"{result.backend:<12} error: {result.error}")
+            continue
+        memory = "n/a" if result.peak_memory_mb is None else f"{result.peak_memory_mb:.1f}"
+        lines.append(
+            f"{result.backend:<12} {result.pages:>6} {result.pages_per_second:>10.1f} "
+            f"{memory:>8} {result.tokens:>8}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Local deterministic pre-redaction pass run before the LLM.
+
+Emails, student ID numbers and phone numbers are caught with compiled regular
+expressions, and the student's name is learned from the letter itself ("I am
+writing to recommend Jane Smith", "Re: Jane Smith") and replaced everywhere,
+including first-name-only and last-name-only mentions.
+
+A letter is split into three regions:
+- the header (letterhead, date, recipient) before the salutation,
+- the body between the salutation and the closing ("Sincerely," ...),
+- the signature block from the closing onwards.
+
+The header and signature belong to the professor, so emails and phone numbers
+there are left alone. The signature's capitalized words (professor,
+department and institution names) are treated as known-safe in the body; the
+header's are not, since its subject line often names the student. A body paragraph
+that still contains an unknown capitalized word or a long digit run after the
+local pass is ambiguous. Only ambiguous paragraphs need an LLM call; a letter
+with none is fully resolved locally.
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+EMAIL_PATTERN = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
+PHONE_PATTERN = re.compile(r"(?<!\w)(?:\+?1[\s.-]?)?\(?\d{3}\)?[\s.-]\d{3}[\s.-]\d{4}(?!\w)")
+STUDENT_ID_PATTERN = re.compile(r"\b(?:[A-Z]{1,4}\d{5,}|\d{7,10})\b")
+
+NAME = r"[A-Z][a-zA-Z'\-]+(?:[ \t]+[A-Z]\.)?(?:[ \t]+[A-Z][a-zA-Z'\-]+){0,2}"
+HONORIFIC = r"(?:(?:Mr|Ms|Mrs|Mx|Dr)\.?[ \t]+)?"
+# Keywords match in any case ("Letter of Recommendation for"); the name itself must be capitalized
+NAME_PATTERNS = [
+    re.compile(
+        r"\b(?i:(?:writing|pleased|delighted|happy|honored|glad|excited)\s+to\s+"
+        r"(?:(?:strongly|enthusiastically|wholeheartedly|highly)\s+)?recommend\s+)"
+        + HONORIFIC + r"(" + NAME + r")"
+    ),
+    re.compile(r"\bI\s+(?i:(?:(?:strongly|highly)\s+)?recommend\s+)" + HONORIFIC + r"(" + NAME + r")"),
+    re.compile(r"\b(?i:recommendation\s+(?:letter\s+)?(?:for|of)\s+)" + HONORIFIC + r"(" + NAME + r")"),
+    re.compile(
+        r"^[^\w\n]*(?i:(?:Re|Subject):[ \t]*(?:(?:Letter[ \t]+of[ \t]+)?Recommendation[ \t]+(?:Letter[ \t]+)?for[ \t]+)?)"
+        + HONORIFIC + r"(" + NAME + r")",
+        re.MULTILINE,
+    ),
+]
+
+# Capitalized words a name pattern can capture that are never the student's name
+# ("Re: Letter of Recommendation", "Re: Reference for ...")
+NON_NAME_WORDS = {
+    "Letter", "Letters", "Recommendation", "Recommendations", "Reference", "References",
+    "Application", "Applicant", "Candidate", "Student", "Support", "Your", "The", "This", "My", "Him", "Her", "Them",
+    "Admission", "Admissions", "Graduate", "Undergraduate", "Program", "Position",
+}
+
+SALUTATION_PATTERN = re.compile(r"^\W*(?:Dear|To Whom)\b", re.MULTILINE)
+CLOSING_PATTERN = re.compile(
+    r"^\W*(?:Sincerely|Best regards|Kind regards|Warm regards|Regards|Respectfully|Yours truly|Best wishes)\b",
+    re.MULTILINE,
+)
+
+PLACEHOLDER_PATTERN = re.compile(r"\[STUDENT_(?:NAME|ID|EMAIL|INFO)(?:_\d+)?\]")
+WORD_PATTERN = re.compile(r"[A-Za-z][A-Za-z'\-]*")
+LONG_DIGITS_PATTERN = re.compile(r"\d{5,}")
+PARAGRAPH_BREAK = re.compile(r"(\n\s*\n)")
+
+# Capitalized words that never identify a student on their own
+SAFE_WORDS = {
+    "I", "I'm", "I've", "I'd", "OK", "PhD", "Ph", "MS", "BS", "MSc", "BSc", "GPA", "TA", "TAs", "AI", "ML", "NLP",
+    "CS", "US", "USA", "ID", "Professor", "Prof", "Dr", "Mr", "Ms", "Mrs", "Mx", "University", "Department",
+    "School", "College", "Institute", "Committee", "Admissions", "Program", "Programs", "Fellowship",
+    "Dear", "Sincerely", "Regards", "Whom", "Concern", "English", "American",
+    "January", "February", "March", "April", "May", "June", "July", "August", "September",
+    "October", "November", "December", "Fall", "Spring", "Summer", "Winter",
+    "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday",
+}
+
+# Common sentence openers; other capitalized sentence-initial words are only
+# safe if the document also uses them in lowercase
+SENTENCE_STARTERS = {
+    "A", "An", "The", "This", "That", "These", "Those", "He", "She", "They", "We", "It", "His", "Her",
+    "Their", "Our", "My", "In", "On", "At", "As", "For", "From", "With", "During", "After", "Before",
+    "Since", "When", "While", "Although", "Overall", "Finally", "Moreover", "Furthermore", "However",
+    "Please", "If", "Not", "Only", "Beyond", "Given", "Because", "Both", "Each", "Even", "Most",
+    "You", "Your", "Its", "There", "Here", "What", "Which", "Who", "One", "All", "Also", "So", "But",
+    "And", "Yet", "To",
+}
+
+
+@dataclass
+class PreRedaction:
+    """Result of the local pass over one document."""
+
+    text: str
+    names: Dict[str, str] = field(default_factory=dict)
+    ambiguous: List[int] = field(default_factory=list)
+
+    @property
+    def resolved(self) -> bool:
+        """True if no paragraph needs the LLM."""
+        return not self.ambiguous
+
+    def _parts(self) -> List[str]:
+        return PARAGRAPH_BREAK.split(self.text)
+
+    def ambiguous_text(self) -> str:
+        """The ambiguous paragraphs, separated by blank lines, for the LLM."""
+        paragraphs = self._parts()[0::2]
+        return "\n\n".join(paragraphs[i] for i in self.ambiguous)
+
+    def merge(self, redacted_excerpt: str) -> str:
+        """
+        Splice the LLM-redacted ambiguous paragraphs back into the document.
+
+        Raises:
+            ValueError: If the excerpt no longer has one paragraph per ambiguous paragraph
+        """
+        redacted = PARAGRAPH_BREAK.split(redacted_excerpt.strip("\n"))[0::2]
+        if len(redacted) != len(self.ambiguous):
+            raise ValueError(
+                f"Expected {len(self.ambiguous)} redacted paragraph(s), got {len(redacted)}"
+            )
+        parts = self._parts()
+        for index, paragraph in zip(self.ambiguous, redacted):
+            parts[2 * index] = paragraph
+        return "".join(parts)
+
+
+def find_student_names(text: str) -> List[str]:
+    """Return the student names introduced by recommendation phrases, in order of appearance."""
+    found = []
+    for pattern in NAME_PATTERNS:
+        for match in pattern.finditer(text):
+            found.append((match.start(1), match.group(1).strip()))
+    names = []
+    for _, name in sorted(found):
+        # Names can look like safe words ("June Park", "May Chen"), so only
+        # NON_NAME_WORDS rule a capture out
+        if name not in names and name.split()[0] not in NON_NAME_WORDS:
+            names.append(name)
+    return names
+
+
+def build_name_gazetteer(names: List[str]) -> Dict[str, str]:
+    """Map each name and its first/last components to a (numbered, if several) placeholder."""
+    gazetteer = {}
+    for number, name in enumerate(names, 1):
+        placeholder = "[STUDENT_NAME]" if len(names) == 1 else f"[STUDENT_NAME_{number}]"
+        variants = [name] + [part for part in name.split() if len(part) > 2 or not part.endswith(".")]
+        for variant in variants:
+            gazetteer.setdefault(variant, placeholder)
+    return gazetteer
+
+
+def _replace_terms(text: str, gazetteer: Dict[str, str]) -> str:
+    if not gazetteer:
+        return text
+    terms = sorted(gazetteer, key=len, reverse=True)
+    matcher = re.compile(r"(?<!\w)(?:" + "|".join(re.escape(term) for term in terms) + r")(?!\w)")
+    return matcher.sub(lambda m: gazetteer[m.group(0)], text)
+
+
+def _redact_identifiers(text: str, contact_details: bool) -> str:
+    if contact_details:
+        text = EMAIL_PATTERN.sub("[STUDENT_EMAIL]", text)
+        text = PHONE_PATTERN.sub("[STUDENT_INFO]", text)
+    return STUDENT_ID_PATTERN.sub("[STUDENT_ID]", text)
+
+
+def _is_ambiguous(paragraph: str, safe_words: Set[str], lowercase_words: Set[str]) -> bool:
+    """True if paragraph may still contain a student identifier."""
+    stripped = PLACEHOLDER_PATTERN.sub(" ", paragraph)
+    if LONG_DIGITS_PATTERN.search(stripped):
+        return True
+    for match in WORD_PATTERN.finditer(stripped):
+        word = match.group(0)
+        if word.endswith("'s"):
+            word = word[:-2]
+        if not word[0].isupper() or word in safe_words:
+            continue
+        # Sentence- and line-initial words are capitalized anyway
+        preceding = stripped[:match.start()].rstrip(" \t*_#>\"'([-")
+        sentence_initial = not preceding or preceding[-1] in ".!?:\n"
+        if sentence_initial and (word in SENTENCE_STARTERS or word.lower() in lowercase_words):
+            continue
+        return True
+    return False
+
+
+def split_regions(text: str) -> Tuple[str, str, str]:
+    """Split a letter into (header, body, signature) at the salutation and closing."""
+    salutation = SALUTATION_PATTERN.search(text)
+    body_start = salutation.start() if salutation else 0
+    closings = [m for m in CLOSING_PATTERN.finditer(text) if m.start() >= body_start]
+    body_end = closings[-1].start() if closings else len(text)
+    return text[:body_start], text[body_start:body_end], text[body_end:]
+
+
+def find_identifiers(text: str, min_length: int = 3) -> Dict[str, str]:
+    """
+    Return the student identifiers the local pass can find in an original letter.
+
+    Args:
+        text: Unredacted letter
+        min_length: Shorter name variants (initials, "Al") are left out
+
+    Returns:
+        Mapping of identifier to the placeholder it should have been replaced with
+    """
+    header, body, _ = split_regions(text)
+    identifiers = {
+        variant: placeholder
+        for variant, placeholder in build_name_gazetteer(find_student_names(text)).items()
+        if len(variant) >= min_length
+    }
+    for email in EMAIL_PATTERN.findall(body):
+        identifiers[email] = "[STUDENT_EMAIL]"
+    for phone in PHONE_PATTERN.findall(body):
+        identifiers[phone] = "[STUDENT_INFO]"
+    for student_id in STUDENT_ID_PATTERN.findall(header + body):
+        identifiers[student_id] = "[STUDENT_ID]"
+    return identifiers
+
+
+def pre_redact(text: str) -> PreRedaction:
+    """Redact what can be caught locally and flag the paragraphs that still need the LLM."""
+    names = find_student_names(text)
+    gazetteer = build_name_gazetteer(names)
+
+    header, body, signature = split_regions(text)
+
+    # Words in the professor's signature are safe in the body. The header is
+    # not trusted: its subject line ("Re: ... for Jane Doe") names the student.
+    # The student's own name parts are never safe, even if they are months
+    safe_words = set(SAFE_WORDS) | set(WORD_PATTERN.findall(signature))
+    safe_words -= {part for name in names for part in name.split()}
+    lowercase_words = {word for word in WORD_PATTERN.findall(text) if word.islower()}
+
+    redacted_header = _redact_identifiers(_replace_terms(header, gazetteer), contact_details=False)
+    redacted_body = _redact_identifiers(_replace_terms(body, gazetteer), contact_details=True)
+    redacted_signature = _replace_terms(signature, gazetteer)
+    result = PreRedaction(redacted_header + redacted_body + redacted_signature, names=gazetteer)
+
+    # Only paragraphs overlapping the body can be ambiguous
+    body_start, body_end = len(redacted_header), len(redacted_header) + len(redacted_body)
+    offset = 0
+    parts = PARAGRAPH_BREAK.split(result.text)
+    for i, part in enumerate(parts):
+        if i % 2 == 0:
+            in_body = offset < body_end and offset + len(part) > body_start
+            if in_body and _is_ambiguous(part, safe_words, lowercase_words):
+                result.ambiguous.append(i // 2)
+        offset += len(part)
+
+    paragraph_count = len(parts[0::2])
+    logger.info(
+        f"Pre-redaction found {len(names)} student name(s); "
+        f"{len(result.ambiguous)} of {paragraph_count} paragraph(s) need the LLM"
+    )
+    return result
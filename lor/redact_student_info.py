@@ -12,49 +12,224 @@ This module now serves as a high-level orchestrator for the redaction pipeline.
 """
 
 import os
+import json
+import asyncio
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple
-from lor.llm import call_llm
+from typing import Dict, List, Optional, Tuple
+from lor.llm import call_llm, estimate_tokens, DEFAULT_MODEL
+from lor.llm_scheduler import get_scheduler
+from lor.redaction_spans import parse_replacements, apply_replacements
+from lor import pre_redaction
+from lor.manifest import Manifest, hash_file, hash_text
+from lor.redaction_chunks import IdentifierMap, split_into_chunks
 
 from lor.file_utils import save_markdown, convert_docx_to_markdown, find_docx_files
 
 logger = logging.getLogger(__name__)
 
 
-def load_redaction_prompt() -> str:
-    """Load the redaction prompt template from file."""
-    prompt_path = Path(__file__).parent.parent / "prompts" / "redact_student_info.md"
+REDACTION_MODES = ("rewrite", "spans")
+
+# Records what each redacted output was produced from (kept in the output directory)
+MANIFEST_FILENAME = ".redaction_manifest.json"
+
+# Prompt template used by each redaction mode
+REDACTION_PROMPTS = {
+    "rewrite": "redact_student_info.md",
+    "spans": "redact_student_info_spans.md",
+}
+
+
+def load_redaction_prompt(mode: str = "rewrite") -> str:
+    """Load the redaction prompt template for the given mode from file."""
+    prompt_path = Path(__file__).parent.parent / "prompts" / REDACTION_PROMPTS[mode]
     with open(prompt_path, 'r', encoding='utf-8') as f:
         return f.read()
 
 
 class DocumentRedactor:
-    """Handles document redaction using an LLM API."""
+    """Handles document redaction using an LLM API.
+
+    In "rewrite" mode the LLM returns the whole document with placeholders. In
+    "spans" mode it returns only a JSON list of replacements, which are applied
+    locally; if that list can't be validated against the document, the
+    redactor falls back to a full rewrite.
+
+    With pre_redact, a local deterministic pass (lor.pre_redaction) runs first:
+    documents it fully resolves skip the LLM, and otherwise only the ambiguous
+    paragraphs are sent.
+
+    With chunk_tokens, text longer than that many tokens is split on paragraph
+    boundaries and the chunks are redacted concurrently (lor.redaction_chunks).
+    """
 
-    def __init__(self):
+    def __init__(self, mode: str = "rewrite", pre_redact: bool = False, chunk_tokens: int = 0):
         """Initialize the redactor and load the prompt template."""
-        self.redaction_prompt = load_redaction_prompt()
+        if mode not in REDACTION_MODES:
+            raise ValueError(f"Unknown redaction mode '{mode}'. Choose from: {', '.join(REDACTION_MODES)}")
+        self.mode = mode
+        self.pre_redact = pre_redact
+        self.chunk_tokens = chunk_tokens
+        self.redaction_prompt = load_redaction_prompt(mode)
+        self._rewriter: Optional["DocumentRedactor"] = None
 
-    def redact_text(self, text: str) -> str:
-        """Use an LLM to redact student information from text."""
-        logger.info("Sending text to LLM for redaction...")
+    def settings_hash(self) -> str:
+        """Hash the prompt and options a redacted output depends on."""
+        return hash_text(json.dumps({
+            "prompt": self.redaction_prompt,
+            "mode": self.mode,
+            "pre_redact": self.pre_redact,
+            "chunk_tokens": self.chunk_tokens,
+        }, sort_keys=True))
+
+    def build_messages(self, text: str, known: Optional[Dict[str, str]] = None) -> list:
+        """Build the chat messages asking the LLM to redact text.
+
+        Args:
+            text: Text to redact
+            known: Identifiers already assigned a placeholder elsewhere in the document
+        """
+        system_prompt = "You are a precise document redaction assistant."
+        if known:
+            listing = "\n".join(f"- {identifier} → {placeholder}" for identifier, placeholder in known.items())
+            system_prompt += (
+                "\n\nThe text is one part of a longer document. Use exactly these placeholders "
+                f"for identifiers already found in the rest of it:\n{listing}"
+            )
         full_prompt = f"{self.redaction_prompt}\n\n{text}"
-        redacted_text = call_llm(
-            messages=[
-                {"role": "system", "content": "You are a precise document redaction assistant."},
-                {"role": "user", "content": full_prompt}
-            ]
-        )
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": full_prompt}
+        ]
+
+    @property
+    def rewriter(self) -> "DocumentRedactor":
+        """Full-rewrite redactor used when span output is unusable."""
+        if self._rewriter is None:
+            self._rewriter = DocumentRedactor("rewrite")
+        return self._rewriter
+
+    def _apply_spans(self, text: str, response: str) -> str:
+        replacements = parse_replacements(response)
+        logger.info(f"Applying {len(replacements)} redaction span(s) locally")
+        return apply_replacements(text, replacements)
+
+    def _needs_chunking(self, text: str) -> bool:
+        return self.chunk_tokens > 0 and estimate_tokens(text) > self.chunk_tokens
+
+    def _llm_redact(self, text: str) -> str:
+        if self._needs_chunking(text):
+            return get_scheduler().run([self._allm_redact_chunked(text)])[0]
+
+        logger.info("Sending text to LLM for redaction...")
+        response = call_llm(messages=self.build_messages(text))
         logger.info("Successfully received redacted text from LLM")
-        return redacted_text
+        if self.mode == "rewrite":
+            return response
+        try:
+            return self._apply_spans(text, response)
+        except ValueError as e:
+            logger.warning(f"Invalid redaction spans ({e}); falling back to a full rewrite")
+            return self.rewriter.redact_text(text)
+
+    async def _allm_redact(self, text: str) -> str:
+        if self._needs_chunking(text):
+            return await self._allm_redact_chunked(text)
+
+        logger.info("Submitting text to LLM for redaction...")
+        response = await get_scheduler().submit(messages=self.build_messages(text))
+        logger.info("Successfully received redacted text from LLM")
+        if self.mode == "rewrite":
+            return response
+        try:
+            return self._apply_spans(text, response)
+        except ValueError as e:
+            logger.warning(f"Invalid redaction spans ({e}); falling back to a full rewrite")
+            return await self.rewriter.aredact_text(text)
+
+    async def _allm_redact_chunked(self, text: str) -> str:
+        """Redact token-bounded chunks concurrently with a shared identifier map."""
+        chunks = split_into_chunks(text, self.chunk_tokens)
+        identifiers = IdentifierMap.from_document(text)
+        known = identifiers.known_identifiers()
+        scheduler = get_scheduler()
+        logger.info(f"Redacting {len(chunks)} chunk(s) concurrently...")
+
+        responses = await asyncio.gather(*(
+            scheduler.submit(messages=self.build_messages(chunk, known)) for chunk, _ in chunks
+        ))
+
+        if self.mode == "rewrite":
+            redacted = list(responses)
+        else:
+            # Validate every chunk's spans, then renumber them consistently
+            parsed: List[Optional[Dict[str, str]]] = []
+            for (chunk, _), response in zip(chunks, responses):
+                try:
+                    replacements = parse_replacements(response)
+                    apply_replacements(chunk, replacements)
+                    parsed.append(replacements)
+                except ValueError as e:
+                    logger.warning(f"Invalid redaction spans in a chunk ({e}); rewriting that chunk")
+                    parsed.append(None)
+            reconciled = identifiers.reconcile([replacements or {} for replacements in parsed])
+            known = identifiers.known_identifiers()
+
+            async def finish(chunk: str, replacements: Optional[Dict[str, str]], renumbered: Dict[str, str]) -> str:
+                if replacements is None:
+                    return await scheduler.submit(messages=self.rewriter.build_messages(chunk, known))
+                return apply_replacements(chunk, renumbered)
+
+            redacted = await asyncio.gather(*(
+                finish(chunk, replacements, renumbered)
+                for (chunk, _), replacements, renumbered in zip(chunks, parsed, reconciled)
+            ))
+
+        logger.info(f"Reassembled {len(chunks)} redacted chunk(s)")
+        return "".join(part + separator for part, (_, separator) in zip(redacted, chunks))
+
+    def _merge(self, local: pre_redaction.PreRedaction, redacted_excerpt: str) -> Optional[str]:
+        """Splice redacted paragraphs back, or None if the LLM changed the paragraph structure."""
+        try:
+            return local.merge(redacted_excerpt)
+        except ValueError as e:
+            logger.warning(f"Could not merge redacted paragraphs ({e}); redacting the whole document")
+            return None
+
+    def redact_text(self, text: str) -> str:
+        """Use an LLM to redact student information from text."""
+        if not self.pre_redact:
+            return self._llm_redact(text)
+
+        local = pre_redaction.pre_redact(text)
+        if local.resolved:
+            logger.info("Document fully redacted locally; skipping the LLM")
+            return local.text
+        merged = self._merge(local, self._llm_redact(local.ambiguous_text()))
+        return merged if merged is not None else self._llm_redact(local.text)
+
+    async def aredact_text(self, text: str) -> str:
+        """Redact text through the shared LLM scheduler (for concurrent batches)."""
+        if not self.pre_redact:
+            return await self._allm_redact(text)
 
-def process_document(docx_path: Path, out_dir: Path) -> bool:
+        local = pre_redaction.pre_redact(text)
+        if local.resolved:
+            logger.info("Document fully redacted locally; skipping the LLM")
+            return local.text
+        merged = self._merge(local, await self._allm_redact(local.ambiguous_text()))
+        return merged if merged is not None else await self._allm_redact(local.text)
+
+
+def process_document(docx_path: Path, out_dir: Path, redactor: Optional[DocumentRedactor] = None) -> bool:
     """Process a single document: convert, redact, and save.
 
     Args:
         docx_path: Path to the input .docx file
         out_dir: Directory where the output .md file will be saved
+        redactor: Configured redactor (defaults to a full-rewrite redactor)
 
     Returns:
         True if successful, False otherwise
@@ -63,29 +238,117 @@ def process_document(docx_path: Path, out_dir: Path) -> bool:
     logger.info(f"Processing: {docx_path}")
     logger.info(f"{'='*60}")
 
-    # Convert to Markdown
-    markdown_text = convert_docx_to_markdown(docx_path)
+    try:
+        # Convert to Markdown
+        markdown_text = convert_docx_to_markdown(docx_path)
+
+        # Redact student information
+        redactor = redactor or DocumentRedactor()
+        redacted_text = redactor.redact_text(markdown_text)
+
+        # Save to .md file in output directory with same basename
+        output_filename = docx_path.stem + '.md'
+        output_path = out_dir / output_filename
+        save_markdown(redacted_text, output_path)
+        return True
+
+    except Exception as e:
+        logger.error(f"Failed to process {docx_path}: {e}")
+        return False
+
+
+def process_documents_parallel(
+    docx_files: List[Path],
+    out_dir: Path,
+    workers: int,
+    redactor: Optional[DocumentRedactor] = None,
+) -> List[bool]:
+    """
+    Process documents as a pipeline: conversions in a process pool, redactions concurrently.
+
+    Mammoth conversion is CPU-bound, so it runs in up to `workers` processes. Each
+    converted document is submitted to the shared LLM scheduler as soon as it is
+    ready, which bounds the number of redaction requests in flight.
+
+    Args:
+        docx_files: The .docx files to process
+        out_dir: Directory where the output .md files will be saved
+        workers: Number of conversion processes
+        redactor: Configured redactor (defaults to a full-rewrite redactor)
+
+    Returns:
+        Whether each document succeeded, in the order of docx_files
+    """
+    redactor = redactor or DocumentRedactor()
+
+    async def pipeline(pool: ProcessPoolExecutor) -> List[bool]:
+        loop = asyncio.get_running_loop()
 
-    # Redact student information
-    redactor = DocumentRedactor()
-    redacted_text = redactor.redact_text(markdown_text)
+        async def handle(docx_path: Path) -> bool:
+            try:
+                markdown_text = await loop.run_in_executor(pool, convert_docx_to_markdown, docx_path)
+                redacted_text = await redactor.aredact_text(markdown_text)
+                save_markdown(redacted_text, out_dir / (docx_path.stem + '.md'))
+                return True
+            except Exception as e:
+                logger.error(f"Failed to process {docx_path}: {e}")
+                return False
 
-    # Save to .md file in output directory with same basename
-    output_filename = docx_path.stem + '.md'
-    output_path = out_dir / output_filename
-    save_markdown(redacted_text, output_path)
+        return await asyncio.gather(*(handle(docx_path) for docx_path in docx_files))
 
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return asyncio.run(pipeline(pool))
 
-def process_all(in_path: str, out_dir: str) -> Tuple[int, int]:
+
+def prune_deleted_sources(manifest: Manifest, current_keys: set, output_dir: Path, root: Path) -> int:
+    """
+    Remove outputs (and manifest entries) whose source document under root no longer exists.
+
+    Entries for sources outside root belong to other runs into the same
+    output directory and are kept.
+    """
+    pruned = 0
+    for key in manifest:
+        if key in current_keys or not Path(key).is_relative_to(root):
+            continue
+        entry = manifest.remove(key)
+        output_path = output_dir / entry["output"]
+        if output_path.exists():
+            output_path.unlink()
+            logger.info(f"Pruned {output_path.name} (source {key} was deleted)")
+        pruned += 1
+    return pruned
+
+
+def process_all(
+    in_path: str,
+    out_dir: str,
+    workers: int = 1,
+    mode: str = "rewrite",
+    pre_redact: bool = False,
+    chunk_tokens: int = 0,
+    force: bool = False,
+) -> Tuple[int, int]:
     """
     Process all .docx files in the given path (file or directory).
 
+    A manifest in the output directory records each source's content hash, the
+    redaction settings hash and the model. Documents whose entry still matches
+    (and whose output exists) are skipped, and when a directory is processed,
+    outputs whose source was deleted are pruned.
+
     Args:
         in_path: Path to a .docx file or directory containing .docx files
         out_path: Directory where redacted .md files will be saved
+        workers: Number of documents to convert in parallel (1 processes them serially)
+        mode: Redaction mode ("rewrite" or "spans")
+        pre_redact: Run the local pre-redaction pass before the LLM
+        chunk_tokens: Split documents longer than this many tokens into concurrently
+            redacted chunks (0 disables chunking)
+        force: Redact every document even if its manifest entry is current
 
     Returns:
-        Tuple of (success_count, failure_count)
+        Tuple of (success_count, failure_count), not counting skipped documents
     """
     # Validate input path
     input_path = Path(in_path).resolve()
@@ -102,9 +365,54 @@ def process_all(in_path: str, out_dir: str) -> Tuple[int, int]:
     if not docx_files:
         raise ValueError("No .docx files found to process")
 
-    # Process each document
-    logger.info(f"Processing {len(docx_files)} document(s)...")
+    # Work out which documents changed since the last run
+    redactor = DocumentRedactor(mode, pre_redact, chunk_tokens)
+    manifest = Manifest.load(output_dir / MANIFEST_FILENAME)
+    settings_hash = redactor.settings_hash()
+    # Keys are absolute source paths, so runs over different subdirectories
+    # into one output directory don't clash
+    source_keys = {docx_file: docx_file.resolve().as_posix() for docx_file in docx_files}
+    pending = []
     for docx_file in docx_files:
-        process_document(docx_file, output_dir)
+        key = source_keys[docx_file]
+        fields = {
+            "source_hash": hash_file(docx_file),
+            "settings_hash": settings_hash,
+            "model": DEFAULT_MODEL,
+            "output": docx_file.stem + '.md',
+        }
+        if not force and manifest.is_current(key, **fields) and (output_dir / fields["output"]).exists():
+            continue
+        pending.append((docx_file, key, fields))
 
+    if input_path.is_dir():
+        prune_deleted_sources(manifest, set(source_keys.values()), output_dir, input_path)
+
+    skipped = len(docx_files) - len(pending)
+    if skipped:
+        logger.info(f"Skipping {skipped} unchanged document(s)")
+
+    # Process each document
+    logger.info(f"Processing {len(pending)} document(s)...")
+    try:
+        if workers > 1 and len(pending) > 1:
+            results = process_documents_parallel(
+                [docx_file for docx_file, _, _ in pending], output_dir, workers, redactor
+            )
+            for (_, key, fields), succeeded in zip(pending, results):
+                if succeeded:
+                    manifest.record(key, **fields)
+        else:
+            results = []
+            for docx_file, key, fields in pending:
+                succeeded = process_document(docx_file, output_dir, redactor)
+                if succeeded:
+                    manifest.record(key, **fields)
+                results.append(succeeded)
+    finally:
+        manifest.save()
 
+    success_count = sum(results)
+    failure_count = len(results) - success_count
+    logger.info(f"Redacted {success_count} document(s), {failure_count} failure(s), {skipped} unchanged")
+    return success_count, failure_count
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Chunked redaction of long documents.
+
+Long documents (multi-page letters, bundles exported as one .docx) are split on
+paragraph boundaries into chunks that fit a token budget, redacted concurrently
+and reassembled in order.
+
+Placeholder numbering has to agree across chunks, so every chunk shares one
+IdentifierMap. It is seeded from the whole document before any chunk is sent
+(students introduced with "I am writing to recommend X" get their numbers up
+front) and passed to the LLM as a list of known identifiers. In span mode the
+replacements each chunk reports are also reconciled against the map afterwards,
+in document order, so a student first seen in chunk 3 gets the same number in
+every chunk.
+"""
+
+import re
+from typing import Dict, List, Tuple
+
+from lor.llm import estimate_tokens
+from lor.pre_redaction import PARAGRAPH_BREAK, find_student_names
+
+NUMBERED_NAME_PATTERN = re.compile(r"\[STUDENT_NAME(?:_\d+)?\]")
+
+
+def split_into_chunks(text: str, max_tokens: int) -> List[Tuple[str, str]]:
+    """
+    Split text on paragraph boundaries into chunks of at most max_tokens.
+
+    A paragraph longer than the budget becomes a chunk on its own.
+
+    Returns:
+        List of (chunk, separator) pairs; joining chunk + separator in order
+        reproduces text exactly
+    """
+    parts = PARAGRAPH_BREAK.split(text)
+    paragraphs, separators = parts[0::2], parts[1::2] + [""]
+
+    chunks = []
+    current, current_tokens = "", 0
+    for paragraph, separator in zip(paragraphs, separators):
+        tokens = estimate_tokens(paragraph)
+        if current and current_tokens + tokens > max_tokens:
+            body = current.rstrip("\n")
+            chunks.append((body, current[len(body):]))
+            current, current_tokens = "", 0
+        current += paragraph + separator
+        current_tokens += tokens
+
+    if current or not chunks:
+        body = current.rstrip("\n")
+        chunks.append((body, current[len(body):]))
+    return chunks
+
+
+class IdentifierMap:
+    """Identifier-to-placeholder assignments shared by every chunk of one document."""
+
+    def __init__(self, names: List[str] = ()):
+        # Each student is a set of name variants ("Jane Smith", "Jane", "Smith")
+        self.students: List[set] = []
+        self.other: Dict[str, str] = {}
+        for name in names:
+            self._student_index(name)
+
+    @classmethod
+    def from_document(cls, text: str) -> "IdentifierMap":
+        """Seed the map with the students a document introduces by name."""
+        return cls(find_student_names(text))
+
+    def _student_index(self, name: str) -> int:
+        """Return the index of the student name belongs to, adding a new one if needed."""
+        words = set(name.split())
+        for index, variants in enumerate(self.students):
+            if name in variants or words & {word for variant in variants for word in variant.split()}:
+                variants.add(name)
+                return index
+        self.students.append({name} | (words if len(words) > 1 else set()))
+        return len(self.students) - 1
+
+    def name_placeholder(self, index: int) -> str:
+        if len(self.students) == 1:
+            return "[STUDENT_NAME]"
+        return f"[STUDENT_NAME_{index + 1}]"
+
+    def known_identifiers(self) -> Dict[str, str]:
+        """Current assignments, for telling the LLM which placeholders to reuse."""
+        known = dict(self.other)
+        for index, variants in enumerate(self.students):
+            for variant in variants:
+                known[variant] = self.name_placeholder(index)
+        return known
+
+    def reconcile(self, chunk_replacements: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """
+        Renumber each chunk's span replacements so the same student gets the same placeholder.
+
+        Args:
+            chunk_replacements: Span text to placeholder for each chunk, in document order
+
+        Returns:
+            The reconciled replacements for each chunk
+        """
+        # First assign every name to a student, so numbering reflects all chunks
+        assigned: List[Dict[str, object]] = []
+        for replacements in chunk_replacements:
+            chunk = {}
+            for span, placeholder in replacements.items():
+                if NUMBERED_NAME_PATTERN.fullmatch(placeholder):
+                    chunk[span] = self._student_index(span)
+                else:
+                    chunk[span] = self.other.setdefault(span, placeholder)
+            assigned.append(chunk)
+
+        return [
+            {
+                span: self.name_placeholder(value) if isinstance(value, int) else value
+                for span, value in chunk.items()
+            }
+            for chunk in assigned
+        ]
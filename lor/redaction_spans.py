@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Span-based redaction: apply LLM-identified replacements locally.
+
+Instead of asking the LLM to rewrite the whole document, the "spans" redaction
+mode asks it for a compact JSON list of the exact strings to replace and the
+placeholder for each. The replacements are validated against the original
+markdown and applied here, so output tokens no longer grow with letter length
+and the document's formatting is preserved exactly.
+"""
+
+import json
+import logging
+import re
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+PLACEHOLDER_PATTERN = re.compile(r"\[STUDENT_(?:NAME|ID|EMAIL|INFO)(?:_\d+)?\]")
+
+
+def parse_replacements(response: str) -> Dict[str, str]:
+    """
+    Parse the LLM's JSON reply into a mapping of span text to placeholder.
+
+    Raises:
+        ValueError: If the reply is not valid JSON of the expected shape or uses
+            an unknown placeholder
+    """
+    payload = response.strip()
+    # Tolerate a ```json fence even though the prompt asks for bare JSON
+    if payload.startswith("```"):
+        payload = payload.split("\n", 1)[-1].rsplit("```", 1)[0]
+
+    try:
+        data = json.loads(payload)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Redaction spans are not valid JSON: {e}") from e
+
+    items = data.get("replacements") if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        raise ValueError("Redaction spans must be a list of replacements")
+
+    replacements = {}
+    for item in items:
+        if not isinstance(item, dict) or not isinstance(item.get("text"), str) \
+                or not isinstance(item.get("placeholder"), str):
+            raise ValueError(f"Malformed redaction span: {item!r}")
+        text, placeholder = item["text"], item["placeholder"].strip()
+        if not PLACEHOLDER_PATTERN.fullmatch(placeholder):
+            raise ValueError(f"Unknown placeholder {placeholder!r} for span {text!r}")
+        if text.strip():
+            replacements[text] = placeholder
+    return replacements
+
+
+def _span_regex(text: str) -> str:
+    """Match text literally, without matching inside a longer word."""
+    pattern = re.escape(text)
+    if text[0].isalnum():
+        pattern = r"(?<!\w)" + pattern
+    if text[-1].isalnum():
+        pattern = pattern + r"(?!\w)"
+    return pattern
+
+
+def apply_replacements(text: str, replacements: Dict[str, str]) -> str:
+    """
+    Replace every occurrence of each span with its placeholder in a single pass.
+
+    Longer spans win over shorter ones that overlap them (e.g. "Jane Smith" is
+    replaced as a whole rather than as "Jane" and "Smith"). Text outside the
+    spans is left byte-for-byte unchanged.
+
+    Raises:
+        ValueError: If a span does not occur in text
+    """
+    if not replacements:
+        return text
+
+    missing = [span for span in replacements if not re.search(_span_regex(span), text)]
+    if missing:
+        raise ValueError(f"Redaction span(s) not found in document: {missing}")
+
+    spans: List[str] = sorted(replacements, key=len, reverse=True)
+    matcher = re.compile("|".join(_span_regex(span) for span in spans))
+    return matcher.sub(lambda m: replacements[m.group(0)], text)
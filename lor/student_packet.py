@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Structured (JSON) form of the student packet.
+
+The synthesized student_packet.md is split locally into its schema'd
+sections (profile, academic performance, TA work, research, goals, the
+professor's view of the student's strengths, additional information), and
+saved next to it as student_packet.json with a hash per section. Letter
+generation loads only the sections its letter type needs from that file.
+
+The markdown stays the source of truth: the professor reviews and edits it
+after synthesis, so the JSON records the hash of the markdown it came from
+and is rebuilt from the markdown whenever they differ.
+"""
+
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from lor.manifest import hash_text
+
+logger = logging.getLogger(__name__)
+
+PACKET_FILENAME = "student_packet.md"
+STRUCTURED_PACKET_FILENAME = "student_packet.json"
+PACKET_SCHEMA_VERSION = 1
+
+# Section key -> pattern matching its heading in student_packet.md, in packet order
+PACKET_SECTIONS = {
+    'profile': re.compile(r"student profile", re.IGNORECASE),
+    'academic': re.compile(r"academic performance", re.IGNORECASE),
+    'ta_work': re.compile(r"teaching assistant", re.IGNORECASE),
+    'research': re.compile(r"research contributions", re.IGNORECASE),
+    'goals': re.compile(r"goals", re.IGNORECASE),
+    'strengths': re.compile(r"strengths", re.IGNORECASE),
+    'additional': re.compile(r"additional information", re.IGNORECASE),
+}
+
+# Sections each letter type is written from; unknown types get every section
+LETTER_TYPE_SECTIONS = {
+    'phd': ('profile', 'academic', 'ta_work', 'research', 'goals', 'strengths'),
+    'ms': ('profile', 'academic', 'ta_work', 'research', 'goals', 'strengths'),
+    'job': ('profile', 'academic', 'ta_work', 'research', 'strengths', 'additional'),
+    'full': tuple(PACKET_SECTIONS),
+}
+LETTER_TYPES = tuple(LETTER_TYPE_SECTIONS)
+
+HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(?:\d+\.\s*)?(.+?)\s*#*\s*$")
+PROFILE_FIELD_PATTERN = re.compile(r"^\s*[-*]\s+\*\*(.+?)\*\*:?\s*(.*?)\s*$")
+
+
+def _section_key(title: str) -> Optional[str]:
+    for key, pattern in PACKET_SECTIONS.items():
+        if pattern.search(title):
+            return key
+    return None
+
+
+def _packet_blocks(markdown: str) -> List[Tuple[Optional[str], List[str]]]:
+    """Split a packet into (section key, lines) blocks; text outside the sections has key None."""
+    blocks: List[Tuple[Optional[str], List[str]]] = [(None, [])]
+    seen = set()
+    section_level = None
+    for line in markdown.splitlines():
+        heading = HEADING_PATTERN.match(line)
+        if heading:
+            level = len(heading.group(1))
+            key = _section_key(heading.group(2))
+            if key and key not in seen and (section_level is None or level <= section_level):
+                section_level = section_level or level
+                seen.add(key)
+                blocks.append((key, []))
+            elif section_level is not None and level < section_level:
+                blocks.append((None, []))
+        blocks[-1][1].append(line)
+    return blocks
+
+
+def split_packet_sections(markdown: str) -> Dict[str, str]:
+    """
+    Split a packet into its schema'd sections.
+
+    Sections start at headings naming them, at the level of the first such
+    heading; deeper headings and unrecognized headings at that level stay
+    with the section they appear in, and a shallower heading ends it. Text
+    outside the sections (such as the packet's title) is dropped.
+
+    Args:
+        markdown: Contents of student_packet.md
+
+    Returns:
+        Section markdown (heading included) by section key, in packet order;
+        empty if no section heading was recognized
+    """
+    return {key: "\n".join(lines).strip() for key, lines in _packet_blocks(markdown) if key is not None}
+
+
+def splice_packet_sections(markdown: str, replacements: Dict[str, str]) -> str:
+    """
+    Replace some sections of a packet, leaving the rest of the text untouched.
+
+    Args:
+        markdown: Contents of student_packet.md
+        replacements: New section markdown (heading included) by section key;
+            sections the packet lacks are added at the end
+
+    Returns:
+        The updated packet
+    """
+    blocks = _packet_blocks(markdown)
+    parts = []
+    for key, lines in blocks:
+        text = "\n".join(lines).strip()
+        if key in replacements:
+            text = replacements[key].strip()
+        if text:
+            parts.append(text)
+    present = {key for key, _ in blocks}
+    parts.extend(replacements[key].strip() for key in PACKET_SECTIONS if key in replacements and key not in present)
+    return "\n\n".join(parts) + "\n"
+
+
+def parse_profile_fields(profile: str) -> Dict[str, str]:
+    """Read the "- **Label**: value" lines of the Student Profile section."""
+    fields = {}
+    for line in profile.splitlines():
+        match = PROFILE_FIELD_PATTERN.match(line)
+        if match:
+            fields[match.group(1).strip().rstrip(':')] = match.group(2)
+    return fields
+
+
+def build_structured_packet(markdown: str) -> dict:
+    """Build the JSON form of a packet from its markdown."""
+    sections = split_packet_sections(markdown)
+    return {
+        'schema_version': PACKET_SCHEMA_VERSION,
+        'source_sha256': hash_text(markdown),
+        'profile': parse_profile_fields(sections.get('profile', '')),
+        'sections': {
+            key: {'markdown': content, 'sha256': hash_text(content)}
+            for key, content in sections.items()
+        },
+    }
+
+
+def save_structured_packet(markdown: str, student_dir: Path) -> dict:
+    """
+    Write student_packet.json for a packet's markdown.
+
+    Args:
+        markdown: Contents of student_packet.md
+        student_dir: Student directory to write into
+
+    Returns:
+        The structured packet
+    """
+    packet = build_structured_packet(markdown)
+    output_path = student_dir / STRUCTURED_PACKET_FILENAME
+    output_path.write_text(json.dumps(packet, indent=2, ensure_ascii=False) + "\n", encoding='utf-8')
+    missing = [key for key in PACKET_SECTIONS if key not in packet['sections']]
+    if missing:
+        logger.warning(f"Student packet has no {', '.join(missing)} section(s); they will be missing from {output_path.name}")
+    logger.info(f"Structured packet saved to: {output_path}")
+    return packet
+
+
+def load_structured_packet(student_dir: Path) -> dict:
+    """
+    Load student_packet.json, rebuilding it if student_packet.md has changed since.
+
+    Raises:
+        FileNotFoundError: If the student has no student_packet.md
+    """
+    packet_path = student_dir / PACKET_FILENAME
+    if not packet_path.exists():
+        raise FileNotFoundError(
+            f"Student packet not found at {packet_path}\n"
+            f"Run 'lor synthesize-packet {student_dir}' first."
+        )
+    markdown = packet_path.read_text(encoding='utf-8')
+
+    json_path = student_dir / STRUCTURED_PACKET_FILENAME
+    try:
+        packet = json.loads(json_path.read_text(encoding='utf-8'))
+        if packet.get('schema_version') == PACKET_SCHEMA_VERSION and packet.get('source_sha256') == hash_text(markdown):
+            return packet
+        logger.info(f"{PACKET_FILENAME} changed since {STRUCTURED_PACKET_FILENAME} was written; rebuilding it")
+    except FileNotFoundError:
+        logger.info(f"No {STRUCTURED_PACKET_FILENAME} yet; building it from {PACKET_FILENAME}")
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read {json_path}: {e}; rebuilding it")
+    return save_structured_packet(markdown, student_dir)
+
+
+def letter_type_from_profile(profile: Dict[str, str]) -> str:
+    """Map the profile's "Letter Type" (e.g. "PhD Application") to a key of LETTER_TYPE_SECTIONS."""
+    letter_type = profile.get('Letter Type', '').lower()
+    if re.search(r"\bph\.?d\b|doctor", letter_type):
+        return 'phd'
+    if re.search(r"\bm\.?s\b|\bmaster", letter_type):
+        return 'ms'
+    if re.search(r"\bjob\b|employ|industry|internship", letter_type):
+        return 'job'
+    return 'full'
+
+
+def select_packet_sections(packet: dict, letter_type: Optional[str] = None, also_for: Sequence[str] = ()) -> str:
+    """
+    Return the markdown of the packet sections a letter type needs.
+
+    Args:
+        packet: Structured packet
+        letter_type: A key of LETTER_TYPE_SECTIONS (default: from the profile's Letter Type)
+        also_for: More letter types whose sections to include, so letters of
+            several types can be written from one identical packet
+
+    Returns:
+        The selected sections in packet order
+    """
+    letter_types = [letter_type or letter_type_from_profile(packet['profile']), *also_for]
+    wanted = {
+        section for name in letter_types
+        for section in LETTER_TYPE_SECTIONS.get(name, LETTER_TYPE_SECTIONS['full'])
+    }
+    selected = [key for key in packet['sections'] if key in wanted]
+    skipped = [key for key in packet['sections'] if key not in wanted]
+    if skipped:
+        logger.info(f"Letter type '{'/'.join(letter_types)}': leaving out packet section(s) {', '.join(skipped)}")
+    return "\n\n".join(packet['sections'][key]['markdown'] for key in selected)
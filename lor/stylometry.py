@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Local stylometry over a corpus of redacted letters.
+
+Computes, in one pass over the corpus, the numbers the style extraction LLM
+would otherwise have to estimate from raw text: sentence and paragraph length
+distributions, the most common multi-word phrases, the most frequent opening
+and closing lines, and word counts of the opening, body and closing sections.
+Counting is vectorized with NumPy, so it takes well under a second even for
+archives far too large to fit in a prompt.
+"""
+
+import logging
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from lor.pre_redaction import PARAGRAPH_BREAK, split_regions
+
+logger = logging.getLogger(__name__)
+
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+(?=[\"'(\[A-Z])")
+WORD_PATTERN = re.compile(r"\[[A-Z_0-9]+\]|[A-Za-z0-9]+(?:['’\-][A-Za-z0-9]+)*")
+# Markdown emphasis/heading characters, but not underscores inside placeholders
+MARKUP = re.compile(r"[*#>`]+|(?<![A-Za-z0-9])_+|_+(?![A-Za-z0-9])")
+
+DEFAULT_NGRAM_SIZES = (3, 4, 5)
+DEFAULT_TOP_PHRASES = 25
+DEFAULT_TOP_LINES = 8
+
+
+@dataclass
+class CorpusStats:
+    """Corpus-wide style statistics."""
+
+    letter_count: int
+    sentence_lengths: np.ndarray
+    paragraph_lengths: np.ndarray
+    paragraphs_per_letter: np.ndarray
+    section_words: Dict[str, np.ndarray]
+    phrases: List[Tuple[str, int]] = field(default_factory=list)
+    opening_lines: List[Tuple[str, int]] = field(default_factory=list)
+    closing_lines: List[Tuple[str, int]] = field(default_factory=list)
+
+
+def _sentences(paragraph: str) -> List[str]:
+    flattened = " ".join(MARKUP.sub("", paragraph).split())
+    return [sentence for sentence in SENTENCE_BOUNDARY.split(flattened) if sentence]
+
+
+def _body_paragraphs(letter: str) -> List[str]:
+    """Paragraphs between the salutation and the closing, without the salutation line or markup-only lines."""
+    _, body, _ = split_regions(letter)
+    paragraphs = [p.strip() for p in PARAGRAPH_BREAK.split(body)[0::2] if _sentences(p)]
+    if paragraphs and len(paragraphs[0].split()) <= 8 and paragraphs[0].rstrip().endswith((",", ":")):
+        paragraphs = paragraphs[1:]
+    return paragraphs
+
+
+def _normalize_line(sentence: str) -> str:
+    return " ".join(sentence.lower().split())
+
+
+def _top_phrases(
+    letter_words: Sequence[List[str]],
+    ngram_sizes: Sequence[int],
+    top: int,
+) -> List[Tuple[str, int]]:
+    """
+    Most frequent n-grams, counted once per letter, with subsumed shorter phrases dropped.
+
+    Words are mapped to integer ids and every n-word window of the whole corpus
+    is counted at once with np.unique; windows spanning two letters are excluded.
+    """
+    vocabulary: Dict[str, int] = {}
+    ids, owners = [], []
+    for letter_index, words in enumerate(letter_words):
+        ids.extend(vocabulary.setdefault(word.lower(), len(vocabulary)) for word in words)
+        owners.extend([letter_index] * len(words))
+    if not ids:
+        return []
+
+    ids_array = np.asarray(ids, dtype=np.int64)
+    owners_array = np.asarray(owners, dtype=np.int64)
+    words_by_id = np.array(list(vocabulary), dtype=object)
+
+    candidates: List[Tuple[str, int, int]] = []
+    for n in ngram_sizes:
+        if len(ids_array) < n:
+            continue
+        windows = np.lib.stride_tricks.sliding_window_view(ids_array, n)
+        window_owners = np.lib.stride_tricks.sliding_window_view(owners_array, n)
+        within_letter = window_owners[:, 0] == window_owners[:, -1]
+        windows, letters = windows[within_letter], window_owners[within_letter, 0]
+
+        # Count each phrase at most once per letter
+        rows = np.unique(np.column_stack([letters, windows]), axis=0)
+        phrases, counts = np.unique(rows[:, 1:], axis=0, return_counts=True)
+        keep = counts >= 2
+        for phrase_ids, count in zip(phrases[keep], counts[keep]):
+            candidates.append((" ".join(words_by_id[phrase_ids]), int(count), n))
+
+    # Prefer frequent, longer phrases; drop a phrase contained in one already chosen with the same count
+    candidates.sort(key=lambda item: (-item[1], -item[2], item[0]))
+    chosen: List[Tuple[str, int]] = []
+    for phrase, count, _ in candidates:
+        if any(count == kept_count and phrase in kept for kept, kept_count in chosen):
+            continue
+        chosen.append((phrase, count))
+        if len(chosen) == top:
+            break
+    return chosen
+
+
+def compute_corpus_stats(
+    letters: Sequence[str],
+    ngram_sizes: Sequence[int] = DEFAULT_NGRAM_SIZES,
+    top_phrases: int = DEFAULT_TOP_PHRASES,
+    top_lines: int = DEFAULT_TOP_LINES,
+) -> CorpusStats:
+    """Compute style statistics for a corpus of redacted letters in one pass."""
+    sentence_lengths: List[int] = []
+    paragraph_lengths: List[int] = []
+    paragraphs_per_letter: List[int] = []
+    sections: Dict[str, List[int]] = {"opening": [], "body": [], "closing": []}
+    letter_words: List[List[str]] = []
+    openings: Counter = Counter()
+    closings: Counter = Counter()
+
+    for letter in letters:
+        paragraphs = _body_paragraphs(letter)
+        paragraphs_per_letter.append(len(paragraphs))
+        words_in_letter: List[str] = []
+        paragraph_word_counts = []
+
+        for paragraph in paragraphs:
+            words = WORD_PATTERN.findall(paragraph)
+            words_in_letter.extend(words)
+            paragraph_word_counts.append(len(words))
+            sentence_lengths.extend(len(WORD_PATTERN.findall(s)) for s in _sentences(paragraph))
+
+        paragraph_lengths.extend(paragraph_word_counts)
+        letter_words.append(words_in_letter)
+
+        if paragraphs:
+            openings[_normalize_line(_sentences(paragraphs[0])[0])] += 1
+            closings[_normalize_line(_sentences(paragraphs[-1])[-1])] += 1
+            sections["opening"].append(paragraph_word_counts[0])
+            sections["closing"].append(paragraph_word_counts[-1] if len(paragraphs) > 1 else 0)
+            sections["body"].append(sum(paragraph_word_counts[1:-1]))
+
+    stats = CorpusStats(
+        letter_count=len(letters),
+        sentence_lengths=np.asarray(sentence_lengths, dtype=np.int64),
+        paragraph_lengths=np.asarray(paragraph_lengths, dtype=np.int64),
+        paragraphs_per_letter=np.asarray(paragraphs_per_letter, dtype=np.int64),
+        section_words={name: np.asarray(values, dtype=np.int64) for name, values in sections.items()},
+        phrases=_top_phrases(letter_words, ngram_sizes, top_phrases),
+        opening_lines=openings.most_common(top_lines),
+        closing_lines=closings.most_common(top_lines),
+    )
+    logger.info(
+        f"Computed stylometry for {stats.letter_count} letter(s): "
+        f"{len(stats.sentence_lengths)} sentences, {len(stats.paragraph_lengths)} paragraphs"
+    )
+    return stats
+
+
+def _describe(values: np.ndarray, unit: str) -> str:
+    if values.size == 0:
+        return "n/a"
+    p10, p50, p90 = np.percentile(values, [10, 50, 90])
+    return (
+        f"mean {values.mean():.1f} {unit} (std {values.std():.1f}); "
+        f"median {p50:.0f}, 10th-90th percentile {p10:.0f}-{p90:.0f}"
+    )
+
+
+def format_stats_summary(stats: CorpusStats) -> str:
+    """Render corpus statistics as a compact markdown summary for the style prompt."""
+    lines = [
+        f"## Corpus Statistics ({stats.letter_count} letters, computed locally)",
+        "",
+        f"- Sentence length: {_describe(stats.sentence_lengths, 'words')}",
+        f"- Paragraph length: {_describe(stats.paragraph_lengths, 'words')}",
+        f"- Paragraphs per letter: {_describe(stats.paragraphs_per_letter, 'paragraphs')}",
+    ]
+    for name, values in stats.section_words.items():
+        lines.append(f"- {name.title()} section: {_describe(values, 'words')}")
+
+    def add_ranked(title: str, items: List[Tuple[str, int]]) -> None:
+        if items:
+            lines.extend(["", f"### {title}", ""])
+            lines.extend(f"- ({count}/{stats.letter_count}) {text}" for text, count in items)
+
+    add_ranked("Most Common Phrases (letters using each)", stats.phrases)
+    add_ranked("Most Frequent Opening Lines", stats.opening_lines)
+    add_ranked("Most Frequent Closing Lines", stats.closing_lines)
+    return "\n".join(lines)
@@ -7,20 +7,91 @@ This module:
 2. Converts them to markdown
 3. Sends them to LLM with synthesis prompt
 4. Generates structured student packet
+5. On later runs, regenerates only the sections whose materials changed
 """
 
 import logging
+import os
+import re
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Dict, Optional
-from lor.llm import call_llm
+from typing import Dict, List, Optional, Sequence
+from lor.llm import call_llm, estimate_tokens, CHARS_PER_TOKEN, DEFAULT_MODEL
+from lor.llm_scheduler import get_scheduler
 from lor.file_utils import (
     find_student_materials,
-    convert_file_to_markdown,
-    save_markdown
+    split_material_key,
+    stale_conversion_fields,
+    convert_file_to_markdown_file,
+    get_pdf_backend,
+    save_markdown,
+    CONVERSION_MANIFEST_FILENAME,
+    PROCESS_CONVERTED_SUFFIXES,
+    PageRange,
 )
+from lor.manifest import Manifest, hash_text
+from lor.student_packet import (
+    PACKET_SECTIONS,
+    save_structured_packet,
+    splice_packet_sections,
+    split_packet_sections,
+)
+from lor.transcript_parser import transcript_to_table
 
 logger = logging.getLogger(__name__)
 
+PROMPTS_DIR = Path(__file__).parent.parent / "prompts"
+
+# Tokens of student materials sent in the synthesis prompt
+DEFAULT_MATERIALS_TOKEN_BUDGET = 60_000
+
+# Smallest budget a condensed material is given, however tight the overall budget
+MIN_MATERIAL_TOKENS = 1_000
+
+# Materials sent verbatim regardless of budget, then materials condensed last
+# to first as needed (materials not listed, e.g. papers, come after these)
+MATERIAL_PRIORITY = ('professor_notes', 'statement', 'accomplishments', 'resume', 'transcript', 'paper')
+UNCONDENSED_MATERIALS = ('professor_notes',)
+
+# Tokens reserved for the note that marks a truncated material
+TRUNCATION_MARKER_TOKENS = 16
+
+# Cheaper model for condensing oversized materials before synthesis
+DEFAULT_CONDENSE_MODEL = "gpt-5-mini"
+
+MATERIAL_TYPES = ('resume', 'transcript', 'accomplishments', 'statement', 'paper', 'professor_notes')
+
+PACKET_MANIFEST_FILENAME = ".packet_manifest.json"
+
+# Materials each packet section is written from
+SECTION_MATERIALS = {
+    'profile': ('resume', 'transcript', 'accomplishments', 'statement', 'professor_notes'),
+    'academic': ('resume', 'transcript', 'professor_notes'),
+    'ta_work': ('resume', 'accomplishments', 'professor_notes'),
+    'research': ('resume', 'accomplishments', 'paper', 'professor_notes'),
+    'goals': ('resume', 'statement'),
+    'strengths': ('professor_notes',),
+    'additional': MATERIAL_TYPES,
+}
+
+# Professor note fields (matched by label prefix) each section is written
+# from; unlabelled notes and fields no section claims go to every section
+# that uses the notes at all
+SECTION_NOTE_FIELDS = {
+    'profile': ('student pronouns', 'pronouns', 'letter type', 'courses', 'research projects'),
+    'academic': ('courses',),
+    'ta_work': ('courses',),
+    'research': ('research',),
+    'strengths': (
+        'overall assessment', 'key strengths', 'standout moments', 'growth trajectory',
+        'recommendation strength', 'additional context',
+    ),
+    'additional': ('additional context',),
+}
+
+NOTE_FIELD_PATTERN = re.compile(r"^[-*]\s+\*\*(.+?)\*\*")
+
 
 def load_prompt_template() -> str:
     """Load the student packet synthesis prompt template."""
@@ -29,15 +100,29 @@ def load_prompt_template() -> str:
         return f.read()
 
 
-def convert_materials_to_markdown(student_dir: Path) -> Dict[str, str]:
+def convert_materials_to_files(
+    student_dir: Path,
+    pdf_page_ranges: Optional[Dict[str, PageRange]] = None,
+    pdf_workers: int = 1,
+    workers: Optional[int] = None,
+) -> Dict[str, Path]:
     """
-    Find and convert all student materials to markdown.
+    Find and convert all student materials to files in markdown/.
+
+    PDF and DOCX materials are converted concurrently in a process pool
+    (text files are read inline), so the wait is bounded by the slowest file.
+    PDFs are streamed to disk a page at a time, so no material is held in
+    memory whole. Materials unchanged since the last run are not converted
+    again; their saved markdown/ output is reused.
 
     Args:
         student_dir: Student directory containing input/ subfolder
+        pdf_page_ranges: Pages to extract, by material key (PDFs only)
+        pdf_workers: Number of processes to extract each PDF's pages with
+        workers: Number of materials to convert at once (default: CPU count)
 
     Returns:
-        Dictionary mapping material type to markdown content
+        Dictionary mapping material key to its markdown file, in discovery order
     """
     input_dir = student_dir / "input"
     markdown_dir = student_dir / "markdown"
@@ -51,33 +136,194 @@ def convert_materials_to_markdown(student_dir: Path) -> Dict[str, str]:
 
     logger.info(f"Found {len(materials)} material(s): {', '.join(materials.keys())}")
 
-    # Convert each material to markdown
-    markdown_contents = {}
+    # Reuse saved conversions of unchanged materials
+    manifest = Manifest.load(markdown_dir / CONVERSION_MANIFEST_FILENAME)
+    markdown_paths = {key: markdown_dir / f"{key}.md" for key in materials}
+    page_ranges = {key: (pdf_page_ranges or {}).get(key) for key in materials}
+    pending = {}
+    for key, file_path in materials.items():
+        fields = stale_conversion_fields(file_path, markdown_paths[key], manifest, page_ranges[key])
+        if fields is not None:
+            pending[key] = fields
+
+    # Convert the rest, PDF/DOCX in worker processes
+    heavy = [key for key in pending if materials[key].suffix.lower() in PROCESS_CONVERTED_SUFFIXES]
+    pool_size = min(len(heavy), workers or os.cpu_count() or 1)
+    pdf_backend = get_pdf_backend().name
+    with ProcessPoolExecutor(max_workers=pool_size) if pool_size > 1 else nullcontext() as pool:
+        conversions = {}
+        for key in pending:
+            args = (materials[key], markdown_paths[key], page_ranges[key], pdf_workers, pdf_backend)
+            if pool is not None and key in heavy:
+                conversions[key] = pool.submit(convert_file_to_markdown_file, *args)
+            else:
+                conversions[key] = Future()
+                conversions[key].set_result(convert_file_to_markdown_file(*args))
+
+        # Collect in discovery order, so logs and the manifest don't depend on timing
+        for key, conversion in conversions.items():
+            seconds = conversion.result()
+            logger.info(f"Converted {key} ({materials[key].name}) in {seconds:.2f}s")
+            manifest.record(markdown_paths[key].name, **pending[key])
+
+    manifest.save()
+    return markdown_paths
+
+
+def convert_materials_to_markdown(
+    student_dir: Path,
+    pdf_page_ranges: Optional[Dict[str, PageRange]] = None,
+    pdf_workers: int = 1,
+    workers: Optional[int] = None,
+) -> Dict[str, str]:
+    """
+    Find and convert all student materials to markdown.
 
-    for material_type, file_path in materials.items():
-        logger.info(f"Processing {material_type}: {file_path.name}")
+    See convert_materials_to_files for the arguments.
 
-        # Convert to markdown
-        markdown_content = convert_file_to_markdown(file_path)
+    Returns:
+        Dictionary mapping material type to markdown content
+    """
+    markdown_paths = convert_materials_to_files(student_dir, pdf_page_ranges, pdf_workers, workers)
+    return {
+        material_type: path.read_text(encoding='utf-8')
+        for material_type, path in markdown_paths.items()
+    }
 
-        # Save to markdown/ directory
-        output_filename = f"{material_type}.md"
-        output_path = markdown_dir / output_filename
-        save_markdown(markdown_content, output_path)
 
-        # Store content
-        markdown_contents[material_type] = markdown_content
+def allocate_material_budgets(materials: Dict[str, str], token_budget: int) -> Dict[str, int]:
+    """
+    Split the token budget across materials.
+
+    Professor notes (UNCONDENSED_MATERIALS) always get their full size. The
+    rest of the budget is shared out evenly, with materials smaller than
+    their share keeping their full size and passing the unused tokens on to
+    the larger ones; when shares tie, higher MATERIAL_PRIORITY goes first.
+
+    Returns:
+        Dict mapping material key to its token budget
+    """
+    sizes = {key: estimate_tokens(content) for key, content in materials.items()}
+    budgets = {key: sizes[key] for key in sizes if split_material_key(key)[0] in UNCONDENSED_MATERIALS}
+    remaining = token_budget - sum(budgets.values())
+    if remaining < 0:
+        logger.warning(f"Professor notes alone ({token_budget - remaining} tokens) exceed the materials budget")
+
+    def priority(key: str) -> int:
+        material_type = split_material_key(key)[0]
+        return MATERIAL_PRIORITY.index(material_type) if material_type in MATERIAL_PRIORITY else len(MATERIAL_PRIORITY)
+
+    others = sorted((key for key in sizes if key not in budgets), key=lambda key: (sizes[key], priority(key)))
+    for position, key in enumerate(others):
+        share = max(remaining // (len(others) - position), MIN_MATERIAL_TOKENS)
+        budgets[key] = min(sizes[key], share)
+        remaining -= budgets[key]
+    return {key: budgets[key] for key in materials}
+
+
+def truncate_material(content: str, token_budget: int) -> str:
+    """Deterministically cut a material to its budget at a paragraph (or line) boundary."""
+    if estimate_tokens(content) <= token_budget:
+        return content
+    cut = content[:max(token_budget - TRUNCATION_MARKER_TOKENS, 1) * CHARS_PER_TOKEN]
+    boundary = max(cut.rfind("\n\n"), cut.rfind("\n"))
+    if boundary > len(cut) // 2:
+        cut = cut[:boundary]
+    dropped = estimate_tokens(content) - estimate_tokens(cut)
+    return f"{cut.rstrip()}\n\n[... truncated about {dropped} tokens]"
+
+
+async def acondense_material(key: str, content: str, token_budget: int, model: str = DEFAULT_CONDENSE_MODEL) -> str:
+    """
+    Condense one oversized material to about token_budget tokens.
+
+    Uses a cheaper extraction call through the shared scheduler; if the call
+    fails or the result is still too long, the material is truncated locally.
+    """
+    with open(PROMPTS_DIR / "condense_material.md", 'r', encoding='utf-8') as f:
+        condense_prompt = f.read()
+    label = key.replace('_', ' ')
+    full_prompt = (
+        f"{condense_prompt}\n\nTarget length: at most {token_budget * 3 // 4} words.\n\n"
+        f"---\n\n## Material: {label}\n\n{content}"
+    )
+    try:
+        condensed = await get_scheduler().submit(
+            messages=[{"role": "user", "content": full_prompt}],
+            model=model,
+            temperature=0.0,
+        )
+    except Exception as e:
+        logger.warning(f"Condensing {key} failed ({e}); truncating it instead")
+        return truncate_material(content, token_budget)
+
+    if estimate_tokens(condensed) > token_budget:
+        logger.warning(f"Condensed {key} is still over its {token_budget}-token budget; truncating it")
+        return truncate_material(condensed, token_budget)
+    return condensed
+
+
+def condense_materials(
+    materials: Dict[str, str],
+    token_budget: int = DEFAULT_MATERIALS_TOKEN_BUDGET,
+    model: str = DEFAULT_CONDENSE_MODEL,
+) -> Dict[str, str]:
+    """
+    Map stage: condense materials that exceed their share of the token budget.
 
-    return markdown_contents
+    Oversized materials are condensed concurrently; professor notes are never
+    condensed (see allocate_material_budgets).
 
+    Args:
+        materials: Dict mapping material key to markdown content
+        token_budget: Tokens of materials to send in the synthesis prompt
+        model: Model for the condensing calls
+
+    Returns:
+        Materials in the same order, oversized ones condensed
+    """
+    budgets = allocate_material_budgets(materials, token_budget)
+    oversized = [key for key, content in materials.items() if estimate_tokens(content) > budgets[key]]
+    if not oversized:
+        return materials
+
+    for key in oversized:
+        logger.info(f"Condensing {key} from {estimate_tokens(materials[key])} to about {budgets[key]} tokens")
+    condensed = get_scheduler().run([
+        acondense_material(key, materials[key], budgets[key], model) for key in oversized
+    ])
+    return {**materials, **dict(zip(oversized, condensed))}
 
-def combine_materials_for_prompt(materials: Dict[str, str], prompt_template: str) -> str:
+
+def tabulate_transcripts(materials: Dict[str, str]) -> Dict[str, str]:
+    """
+    Replace each transcript with the compact table from the local transcript parser.
+
+    Transcripts the parser can't read confidently are left as they are.
+    """
+    tabulated = dict(materials)
+    for key, content in materials.items():
+        if split_material_key(key)[0] != 'transcript':
+            continue
+        table = transcript_to_table(content)
+        if table is not None:
+            tabulated[key] = table
+            logger.info(f"Parsed {key} locally: {estimate_tokens(content)} -> {estimate_tokens(table)} tokens")
+    return tabulated
+
+
+def combine_materials_for_prompt(
+    materials: Dict[str, str],
+    prompt_template: str,
+    material_types: Sequence[str] = MATERIAL_TYPES,
+) -> str:
     """
     Combine the prompt template with student materials.
 
     Args:
-        materials: Dict mapping material type to markdown content
+        materials: Dict mapping material key (type, or type_N for several files) to markdown content
         prompt_template: The synthesis prompt template
+        material_types: Material types to include, in order; missing ones are marked as not provided
 
     Returns:
         Complete prompt with materials appended
@@ -90,16 +336,17 @@ def combine_materials_for_prompt(materials: Dict[str, str], prompt_template: str
         'transcript': 'Academic Transcript',
         'accomplishments': 'Accomplishments List',
         'statement': 'Personal Statement',
+        'paper': 'Research Paper',
         'professor_notes': 'Professor Notes'
     }
 
-    for material_type in ['resume', 'transcript', 'accomplishments', 'statement', 'professor_notes']:
-        if material_type in materials:
-            label = material_labels.get(material_type, material_type.title())
-            content = materials[material_type]
-            sections.append(f"## {label}\n\n{content}")
-        else:
-            label = material_labels.get(material_type, material_type.title())
+    for material_type in material_types:
+        label = material_labels.get(material_type, material_type.title())
+        keys = [key for key in materials if split_material_key(key)[0] == material_type]
+        for key in keys:
+            number = split_material_key(key)[1]
+            sections.append(f"## {label}{f' {number}' if number else ''}\n\n{materials[key]}")
+        if not keys and material_type != 'paper':
             sections.append(f"## {label}\n\n[NOT PROVIDED]")
 
     combined_materials = "\n\n" + ("="*80 + "\n\n").join(sections)
@@ -110,12 +357,210 @@ def combine_materials_for_prompt(materials: Dict[str, str], prompt_template: str
     return full_prompt
 
 
-def synthesize_student_packet(student_dir: Path) -> None:
+def build_synthesis_messages(full_prompt: str) -> list:
+    """Build the chat messages asking the LLM to synthesize a student packet."""
+    return [
+        {
+            "role": "system",
+            "content": "You are an expert at extracting and organizing information from student application materials. You provide accurate, well-structured analysis without hallucinating details."
+        },
+        {
+            "role": "user",
+            "content": full_prompt
+        }
+    ]
+
+
+def split_professor_notes(notes: str) -> Dict[str, str]:
+    """
+    Split professor notes into their "- **Label**: ..." fields.
+
+    Returns:
+        Each field's text (its bullet and indented lines) by lowercased label;
+        text outside any field is under ''
+    """
+    fields: Dict[str, List[str]] = {'': []}
+    label = ''
+    for line in notes.splitlines():
+        match = NOTE_FIELD_PATTERN.match(line)
+        if match:
+            label = match.group(1).strip().rstrip(':').lower()
+            fields.setdefault(label, [])
+        elif line and not line[0].isspace():
+            label = ''
+        fields[label].append(line)
+    joined = {label: "\n".join(lines).strip() for label, lines in fields.items()}
+    return {label: text for label, text in joined.items() if text}
+
+
+def section_materials(materials: Dict[str, str], section: str) -> Dict[str, str]:
+    """
+    Select the materials a packet section is written from.
+
+    Professor notes are cut down to the fields the section uses, plus any
+    field no section claims (see SECTION_NOTE_FIELDS).
+    """
+    selected = {
+        key: content for key, content in materials.items()
+        if split_material_key(key)[0] in SECTION_MATERIALS[section]
+    }
+    claimed = tuple(prefix for prefixes in SECTION_NOTE_FIELDS.values() for prefix in prefixes)
+    wanted = SECTION_NOTE_FIELDS.get(section, ())
+    for key in selected:
+        if split_material_key(key)[0] == 'professor_notes':
+            fields = split_professor_notes(selected[key])
+            selected[key] = "\n".join(
+                text for label, text in fields.items()
+                if label.startswith(wanted) or not label.startswith(claimed)
+            )
+    return selected
+
+
+def section_prompt(prompt_template: str, section: str) -> str:
+    """The synthesis prompt with the other sections' format descriptions left out."""
+    formats = split_packet_sections(prompt_template)
+    return splice_packet_sections(prompt_template, {key: '' for key in formats if key != section})
+
+
+def section_fields(prompt_template: str, materials: Dict[str, str], materials_token_budget: int) -> Dict[str, dict]:
+    """Manifest fields recording what each packet section is generated from."""
+    with open(PROMPTS_DIR / "update_packet_section.md", 'r', encoding='utf-8') as f:
+        update_prompt = f.read()
+    fields = {}
+    for section in PACKET_SECTIONS:
+        inputs = section_materials(materials, section)
+        fields[section] = {
+            'inputs_sha256': hash_text("\n\n".join(f"{key}\n{content}" for key, content in inputs.items())),
+            'prompt_sha256': hash_text(section_prompt(prompt_template, section) + update_prompt),
+            'model': DEFAULT_MODEL,
+            'materials_token_budget': materials_token_budget,
+        }
+    return fields
+
+
+async def arequest_packet_section(
+    section: str,
+    current_section: Optional[str],
+    materials: Dict[str, str],
+    prompt_template: str,
+) -> str:
+    """
+    Rewrite one packet section from the materials it depends on.
+
+    Args:
+        section: Key of the section (see PACKET_SECTIONS)
+        current_section: The section's current markdown, if the packet has it
+        materials: The section's materials (see section_materials)
+        prompt_template: The synthesis prompt template
+
+    Returns:
+        Markdown of the section, heading included
+    """
+    with open(PROMPTS_DIR / "update_packet_section.md", 'r', encoding='utf-8') as f:
+        update_prompt = f.read()
+    if current_section is None:
+        heading = split_packet_sections(prompt_template)[section].splitlines()[0].lstrip('#').strip()
+        current_section = f"## {heading}\n\n[NOT YET WRITTEN]"
+    full_prompt = combine_materials_for_prompt(
+        materials,
+        f"{section_prompt(prompt_template, section)}\n\n---\n\n{update_prompt}\n\n"
+        f"## Current Section\n\n{current_section}",
+        material_types=SECTION_MATERIALS[section],
+    )
+    return await get_scheduler().submit(
+        messages=build_synthesis_messages(full_prompt),
+        temperature=0.3,
+    )
+
+
+def update_packet_sections(
+    packet: str,
+    sections: List[str],
+    materials: Dict[str, str],
+    prompt_template: str,
+    materials_token_budget: int = DEFAULT_MATERIALS_TOKEN_BUDGET,
+    condense_model: str = DEFAULT_CONDENSE_MODEL,
+) -> str:
+    """
+    Regenerate some sections of an existing packet concurrently and splice them in.
+
+    Only the materials those sections depend on are condensed and sent;
+    every other section keeps its current text, hand edits included.
+
+    Args:
+        packet: Contents of student_packet.md
+        sections: Keys of the sections to regenerate
+        materials: All of the student's materials
+        prompt_template: The synthesis prompt template
+        materials_token_budget: Tokens of materials to send per section
+        condense_model: Model for condensing oversized materials
+
+    Returns:
+        The updated packet
+    """
+    needed = {key for section in sections for key in section_materials(materials, section)}
+    condensed = condense_materials(
+        {key: content for key, content in materials.items() if key in needed},
+        materials_token_budget,
+        condense_model,
+    )
+    current = split_packet_sections(packet)
+    rewritten = get_scheduler().run([
+        arequest_packet_section(section, current.get(section), section_materials(condensed, section), prompt_template)
+        for section in sections
+    ])
+    return splice_packet_sections(packet, dict(zip(sections, rewritten)))
+
+
+def _save_packet(
+    student_packet: str,
+    student_dir: Path,
+    manifest: Manifest,
+    fields: Dict[str, dict],
+    sections: List[str],
+) -> None:
+    """Save the packet and its JSON form, and record the given sections in the manifest."""
+    output_path = student_dir / "student_packet.md"
+    save_markdown(student_packet, output_path)
+    packet = save_structured_packet(student_packet, student_dir)
+    for section in sections:
+        if section in packet['sections']:
+            manifest.record(section, **fields[section], output_sha256=packet['sections'][section]['sha256'])
+    manifest.save()
+    logger.info(f"Student packet saved to: {output_path}")
+    logger.info(f"Size: {len(student_packet.split())} words")
+
+
+def synthesize_student_packet(
+    student_dir: Path,
+    pdf_page_ranges: Optional[Dict[str, PageRange]] = None,
+    pdf_workers: int = 1,
+    workers: Optional[int] = None,
+    materials_token_budget: int = DEFAULT_MATERIALS_TOKEN_BUDGET,
+    condense_model: str = DEFAULT_CONDENSE_MODEL,
+    parse_transcript: bool = True,
+    force: bool = False,
+) -> None:
     """
     Synthesize a student packet from materials in the student directory.
 
     Args:
         student_dir: Path to student directory (e.g., data/students/jane_smith/)
+        pdf_page_ranges: Pages to extract, by material type (PDFs only)
+        pdf_workers: Number of processes to extract each PDF's pages with
+        workers: Number of materials to convert at once (default: CPU count)
+        materials_token_budget: Tokens of materials to send in the synthesis prompt;
+            larger materials are condensed first
+        condense_model: Model for condensing oversized materials
+        parse_transcript: Send the transcript as a locally parsed course table
+            instead of its raw text
+        force: Synthesize the whole packet even if only some sections'
+            materials changed
+
+    When a packet already exists, only the sections whose materials (or
+    professor note fields) changed since it was written are regenerated and
+    spliced back in; .packet_manifest.json records what each section was
+    generated from.
 
     Expected structure:
         student_dir/
@@ -131,7 +576,9 @@ def synthesize_student_packet(student_dir: Path) -> None:
         │   ├── accomplishments.md
         │   ├── statement.md
         │   └── professor_notes.md
-        └── student_packet.md  # Created by this function
+        ├── student_packet.md  # Created by this function
+        ├── student_packet.json  # Its sections, for letter generation
+        └── .packet_manifest.json  # What each section was generated from
     """
     logger.info(f"{'='*60}")
     logger.info(f"Synthesizing student packet for: {student_dir.name}")
@@ -143,7 +590,37 @@ def synthesize_student_packet(student_dir: Path) -> None:
 
     # Convert materials to markdown
     logger.info("Converting student materials to markdown...")
-    markdown_contents = convert_materials_to_markdown(student_dir)
+    markdown_contents = convert_materials_to_markdown(student_dir, pdf_page_ranges, pdf_workers, workers)
+    if parse_transcript:
+        markdown_contents = tabulate_transcripts(markdown_contents)
+
+    output_path = student_dir / "student_packet.md"
+    manifest = Manifest.load(student_dir / PACKET_MANIFEST_FILENAME)
+    fields = section_fields(prompt_template, markdown_contents, materials_token_budget)
+
+    if not force and output_path.exists() and len(manifest):
+        existing = output_path.read_text(encoding='utf-8')
+        current = split_packet_sections(existing)
+        stale = [
+            section for section in PACKET_SECTIONS
+            if section not in current or not manifest.is_current(section, **fields[section])
+        ]
+        if not stale:
+            logger.info("No section's materials changed; the student packet is up to date")
+            return
+        if len(stale) < len(PACKET_SECTIONS):
+            for section in stale:
+                entry = manifest.get(section)
+                if section in current and entry and entry.get('output_sha256') != hash_text(current[section]):
+                    logger.warning(f"Section '{section}' was edited by hand and is being regenerated; review it afterwards")
+            logger.info(f"Regenerating packet section(s): {', '.join(stale)}")
+            student_packet = update_packet_sections(
+                existing, stale, markdown_contents, prompt_template, materials_token_budget, condense_model
+            )
+            _save_packet(student_packet, student_dir, manifest, fields, stale)
+            return
+
+    markdown_contents = condense_materials(markdown_contents, materials_token_budget, condense_model)
 
     # Combine with prompt
     full_prompt = combine_materials_for_prompt(markdown_contents, prompt_template)
@@ -153,27 +630,15 @@ def synthesize_student_packet(student_dir: Path) -> None:
     logger.info("This may take a minute as the LLM analyzes the materials...")
 
     student_packet = call_llm(
-        messages=[
-            {
-                "role": "system",
-                "content": "You are an expert at extracting and organizing information from student application materials. You provide accurate, well-structured analysis without hallucinating details."
-            },
-            {
-                "role": "user",
-                "content": full_prompt
-            }
-        ],
+        messages=build_synthesis_messages(full_prompt),
         temperature=0.3,  # Lower temperature for factual extraction
     )
 
     logger.info("Successfully received student packet from LLM")
 
-    # Save student packet
-    output_path = student_dir / "student_packet.md"
-    save_markdown(student_packet, output_path)
+    # Save student packet; a full synthesis starts a fresh manifest
+    _save_packet(student_packet, student_dir, Manifest(manifest.path), fields, list(PACKET_SECTIONS))
 
-    logger.info(f"Student packet saved to: {output_path}")
-    logger.info(f"Size: {len(student_packet.split())} words")
     logger.info(f"\n{'='*60}")
     logger.info("Student packet synthesis complete!")
     logger.info("Next steps:")
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the local transcript parser on students' real materials.
+
+For each student the synthesis prompt is assembled twice, once with the raw
+transcript and once with the parsed table, and the prompt tokens saved and
+the parsing time are reported. With end_to_end the synthesis LLM call is
+also made for both prompts, so the latency saved per packet can be compared
+against what the parser costs.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from lor.file_utils import split_material_key
+from lor.llm import call_llm, estimate_tokens
+from lor.synthesize_packet import (
+    build_synthesis_messages,
+    combine_materials_for_prompt,
+    convert_materials_to_markdown,
+    load_prompt_template,
+)
+from lor.transcript_parser import transcript_to_table
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TranscriptBenchResult:
+    """Prompt size and timings for one student, raw transcript vs parsed table."""
+
+    student: str
+    raw_prompt_tokens: int
+    table_prompt_tokens: int
+    parse_seconds: float
+    parsed: bool
+    raw_llm_seconds: Optional[float] = None
+    table_llm_seconds: Optional[float] = None
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.raw_prompt_tokens - self.table_prompt_tokens
+
+
+def _time_synthesis(full_prompt: str) -> float:
+    started = time.perf_counter()
+    call_llm(messages=build_synthesis_messages(full_prompt), temperature=0.3)
+    return time.perf_counter() - started
+
+
+def benchmark_transcript_parser(student_dirs: List[Path], end_to_end: bool = False) -> List[TranscriptBenchResult]:
+    """
+    Compare synthesis prompts built from raw transcripts and from parsed tables.
+
+    Args:
+        student_dirs: Student directories with a transcript in input/
+        end_to_end: Also time the synthesis LLM call for both prompts
+
+    Returns:
+        One result per student that has a transcript
+    """
+    prompt_template = load_prompt_template()
+    results = []
+    for student_dir in student_dirs:
+        materials = convert_materials_to_markdown(student_dir)
+        transcript_keys = [key for key in materials if split_material_key(key)[0] == 'transcript']
+        if not transcript_keys:
+            logger.warning(f"No transcript found for {student_dir.name}; skipping")
+            continue
+
+        tabulated = dict(materials)
+        started = time.perf_counter()
+        for key in transcript_keys:
+            tabulated[key] = transcript_to_table(materials[key]) or materials[key]
+        parse_seconds = time.perf_counter() - started
+
+        raw_prompt = combine_materials_for_prompt(materials, prompt_template)
+        table_prompt = combine_materials_for_prompt(tabulated, prompt_template)
+        result = TranscriptBenchResult(
+            student=student_dir.name,
+            raw_prompt_tokens=estimate_tokens(raw_prompt),
+            table_prompt_tokens=estimate_tokens(table_prompt),
+            parse_seconds=parse_seconds,
+            parsed=tabulated != materials,
+        )
+        if end_to_end:
+            result.raw_llm_seconds = _time_synthesis(raw_prompt)
+            result.table_llm_seconds = _time_synthesis(table_prompt)
+        logger.info(f"{result.student}: {result.tokens_saved} prompt tokens saved")
+        results.append(result)
+    return results
+
+
+def format_transcript_results(results: List[TranscriptBenchResult]) -> str:
+    """Render benchmark results as a plain-text table."""
+    end_to_end = any(result.raw_llm_seconds is not None for result in results)
+    header = f"{'student':<24} {'raw tokens':>10} {'table tokens':>12} {'saved':>7} {'parse ms':>9}"
+    if end_to_end:
+        header += f" {'raw s':>7} {'table s':>8}"
+    lines = [header]
+    for result in results:
+        line = (
+            f"{result.student[:24]:<24} {result.raw_prompt_tokens:>10} {result.table_prompt_tokens:>12} "
+            f"{result.tokens_saved:>7} {result.parse_seconds * 1000:>9.1f}"
+        )
+        if result.raw_llm_seconds is not None:
+            line += f" {result.raw_llm_seconds:>7.1f} {result.table_llm_seconds:>8.1f}"
+        if not result.parsed:
+            line += "  (not parsed; raw transcript kept)"
+        lines.append(line)
+    return "\n".join(lines)
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Deterministic local parser for academic transcripts.
+
+Turns transcript text extracted from a PDF (noisy, one course per line) into
+a compact per-term table of course, title, units and grade, with term and
+cumulative GPAs and any lines naming degrees or honors. The table replaces
+the raw transcript in the synthesis prompt, so the LLM no longer spends
+tokens re-reading page headers, legends and column debris to find the same
+facts. When too few courses are recognized, or too many lines that look
+like courses (units and a grade) don't parse, the parser declines and the
+raw transcript is used as before.
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SEASONS = "Fall|Spring|Summer|Winter|Autumn"
+TERM_PATTERN = re.compile(
+    rf"\b(?:(?P<season>{SEASONS})(?:\s+(?:Quarter|Semester|Term))?\s+(?P<year>(?:19|20)\d\d)"
+    rf"|(?P<year2>(?:19|20)\d\d)[\s\-]+(?P<season2>{SEASONS}))\b",
+    re.IGNORECASE,
+)
+
+# CS 161, MATH 51, CS 106B, and CMU's department-number codes like 10-301
+COURSE_CODE = r"(?P<code>[A-Z]{2,8}(?:[ &][A-Z]{1,4})?[ \-]?\d{1,4}[A-Z]{0,3}|\d{2}-\d{3})"
+GRADE = r"(?P<grade>[A-F][+\-]?|P|NP|CR|NC|S|U|W|I|IP)"
+UNITS = r"(?P<units>\d{1,2}(?:\.\d{1,2})?)"
+POINTS = r"(?:\s+\d{1,2}\.\d{1,3})?"
+COURSE_PATTERNS = (
+    # CS 161 Design and Analysis of Algorithms 4.00 A 16.00
+    re.compile(rf"^{COURSE_CODE}\s+(?P<title>.+?)\s+{UNITS}\s+{GRADE}{POINTS}$"),
+    # CS 161 Design and Analysis of Algorithms A 4.00
+    re.compile(rf"^{COURSE_CODE}\s+(?P<title>.+?)\s+{GRADE}\s+{UNITS}{POINTS}$"),
+)
+# Lines ending in units and a grade, whether or not the course code is recognized
+COURSE_LIKE_PATTERNS = (
+    re.compile(rf"\s{UNITS}\s+{GRADE}{POINTS}$"),
+    re.compile(rf"\s{GRADE}\s+{UNITS}{POINTS}$"),
+)
+
+# "GPA", or "QPA" (quality point average) as on CMU transcripts
+GPA_PATTERN = re.compile(
+    r"\b(?P<kind>Term|Semester|Quarter|Cumulative|Cum\.?|Overall|Career)?\s*[GQ]PA\b[:\s]*(?P<gpa>[0-4]\.\d{1,3})\b",
+    re.IGNORECASE,
+)
+
+# Lines worth keeping beside the course table (degrees, honors, standing)
+NOTE_PATTERN = re.compile(
+    r"\b(Dean'?s List|Honou?rs?|Distinction|Award|Scholar|Degree|Major|Minor|Concentration|Standing|Laude)\b",
+    re.IGNORECASE,
+)
+MAX_NOTES = 20
+
+GRADE_POINTS = {
+    "A+": 4.0, "A": 4.0, "A-": 3.7, "B+": 3.3, "B": 3.0, "B-": 2.7, "C+": 2.3,
+    "C": 2.0, "C-": 1.7, "D+": 1.3, "D": 1.0, "D-": 0.7, "F": 0.0,
+}
+
+# Fewer recognized courses than this, or a larger share of course-like lines
+# left unparsed, and the raw transcript is kept
+MIN_COURSES = 3
+MAX_UNPARSED_FRACTION = 0.2
+
+
+@dataclass
+class Course:
+    """One course taken, as listed on the transcript."""
+
+    code: str
+    title: str
+    term: str
+    units: float
+    grade: str
+
+
+@dataclass
+class Transcript:
+    """Courses grouped by term, with the GPAs stated on the transcript."""
+
+    courses: List[Course] = field(default_factory=list)
+    term_gpas: Dict[str, float] = field(default_factory=dict)
+    cumulative_gpa: Optional[float] = None
+    notes: List[str] = field(default_factory=list)
+    unparsed_course_lines: List[str] = field(default_factory=list)
+
+    @property
+    def terms(self) -> List[str]:
+        return list(dict.fromkeys(course.term for course in self.courses))
+
+    def computed_gpa(self, term: Optional[str] = None) -> Optional[float]:
+        """GPA on a 4.0 scale from letter grades, for a term or overall."""
+        graded = [
+            course for course in self.courses
+            if course.grade in GRADE_POINTS and (term is None or course.term == term)
+        ]
+        units = sum(course.units for course in graded)
+        if not units:
+            return None
+        return sum(GRADE_POINTS[course.grade] * course.units for course in graded) / units
+
+
+def _normalize_term(match: re.Match) -> str:
+    season = (match["season"] or match["season2"]).title()
+    return f"{season} {match['year'] or match['year2']}"
+
+
+def parse_transcript(text: str) -> Transcript:
+    """Parse transcript text line by line into courses, terms and GPAs."""
+    transcript = Transcript()
+    term = "Unknown Term"
+    for raw_line in text.splitlines():
+        line = " ".join(raw_line.replace("\\", "").split())
+        if not line:
+            continue
+
+        course = None
+        for pattern in COURSE_PATTERNS:
+            match = pattern.match(line)
+            if match:
+                course = Course(
+                    code=match["code"],
+                    title=match["title"].strip(" -|"),
+                    term=term,
+                    units=float(match["units"]),
+                    grade=match["grade"],
+                )
+                break
+        if course is not None:
+            transcript.courses.append(course)
+            continue
+        if any(pattern.search(line) for pattern in COURSE_LIKE_PATTERNS):
+            transcript.unparsed_course_lines.append(line)
+
+        term_match = TERM_PATTERN.search(line)
+        if term_match and len(line) <= 60:
+            term = _normalize_term(term_match)
+
+        if NOTE_PATTERN.search(line) and line not in transcript.notes and len(transcript.notes) < MAX_NOTES:
+            transcript.notes.append(line)
+
+        for gpa_match in GPA_PATTERN.finditer(line):
+            kind = (gpa_match["kind"] or "").lower().rstrip(".")
+            gpa = float(gpa_match["gpa"])
+            if kind in ("term", "semester", "quarter") or (not kind and transcript.courses and term != "Unknown Term"):
+                transcript.term_gpas[term] = gpa
+            else:
+                transcript.cumulative_gpa = gpa
+    return transcript
+
+
+def format_transcript_table(transcript: Transcript) -> str:
+    """Render a parsed transcript as compact markdown tables, one per term."""
+    lines = ["_Parsed locally from the transcript; GPAs marked (computed) are derived from letter grades._"]
+    for term in transcript.terms:
+        gpa = transcript.term_gpas.get(term)
+        if gpa is None:
+            computed = transcript.computed_gpa(term)
+            gpa_text = f"GPA {computed:.2f} (computed)" if computed is not None else "no GPA"
+        else:
+            gpa_text = f"GPA {gpa:.2f}"
+        lines.extend(["", f"### {term} ({gpa_text})", "", "| Course | Title | Units | Grade |", "|---|---|---|---|"])
+        lines.extend(
+            f"| {course.code} | {course.title} | {course.units:g} | {course.grade} |"
+            for course in transcript.courses if course.term == term
+        )
+
+    cumulative = transcript.cumulative_gpa
+    if cumulative is not None:
+        cumulative_text = f"{cumulative:.2f}"
+    else:
+        computed = transcript.computed_gpa()
+        cumulative_text = f"{computed:.2f} (computed)" if computed is not None else "not stated"
+    lines.extend([
+        "",
+        f"- Cumulative GPA: {cumulative_text}",
+        f"- Courses: {len(transcript.courses)}, units: {sum(course.units for course in transcript.courses):g}",
+    ])
+    if transcript.notes:
+        lines.extend(["", "### Other Transcript Notes", ""])
+        lines.extend(f"- {note}" for note in transcript.notes)
+    return "\n".join(lines)
+
+
+def transcript_to_table(text: str) -> Optional[str]:
+    """Return the compact table for a transcript, or None if it couldn't be parsed confidently."""
+    transcript = parse_transcript(text)
+    if len(transcript.courses) < MIN_COURSES:
+        logger.info(f"Recognized only {len(transcript.courses)} course(s); keeping the raw transcript")
+        return None
+    unparsed = len(transcript.unparsed_course_lines)
+    if unparsed > MAX_UNPARSED_FRACTION * (unparsed + len(transcript.courses)):
+        logger.info(
+            f"{unparsed} course-like line(s) didn't parse (e.g. {transcript.unparsed_course_lines[0]!r}); "
+            f"keeping the raw transcript"
+        )
+        return None
+    return format_transcript_table(transcript)
@@ -3,10 +3,11 @@
 Tests for style extraction functionality.
 """
 
+import asyncio
 import pytest
 from pathlib import Path
 from unittest.mock import patch, MagicMock
-from lor.extract_style import find_markdown_files, load_redacted_letters, extract_style_guide
+from lor.extract_style import find_markdown_files, load_redacted_letters, extract_style_guide, batch_letters
 
 
 def test_find_markdown_files(tmp_path):
@@ -47,6 +48,8 @@ def test_load_redacted_letters(tmp_path):
     assert "This is letter 1 content" in combined
     assert "This is letter 2 content" in combined
     assert "[STUDENT_NAME]" in combined
+    # The separator line falls between the letters
+    assert combined.index("letter1") < combined.index("=" * 80) < combined.index("letter2")
 
 
 @patch('lor.extract_style.call_llm')
@@ -109,3 +112,137 @@ Professor Smith
     assert "style" in messages[0]["content"].lower()
     assert messages[1]["role"] == "user"
     assert "test_letter" in messages[1]["content"]
+
+
+def test_batch_letters_respects_budget():
+    """Test that letters are grouped into batches under the token budget."""
+    letters = ["a" * 400, "b" * 400, "c" * 400, "d" * 2000]
+
+    batches = batch_letters(letters, token_budget=250)
+
+    assert batches == [["a" * 400, "b" * 400], ["c" * 400], ["d" * 2000]]
+
+
+@patch('lor.extract_style.call_llm', return_value="# Merged Style Guide")
+def test_extract_style_guide_map_reduce_resumes(mock_llm, tmp_path):
+    """Test that map-reduce analyzes batches, merges them, and reuses cached notes."""
+    input_dir = tmp_path / "redacted"
+    input_dir.mkdir()
+    for i in range(4):
+        (input_dir / f"letter{i}.md").write_text(f"Letter {i}. " + "[STUDENT_NAME] excelled. " * 200)
+    output_dir = tmp_path / "style_guide"
+    submitted = []
+
+    async def fake_submit(messages):
+        submitted.append(messages[1]["content"])
+        return f"Notes {len(submitted)}"
+
+    with patch('lor.extract_style.get_scheduler') as mock_get_scheduler:
+        mock_get_scheduler.return_value.submit = fake_submit
+        mock_get_scheduler.return_value.run = lambda coros: [asyncio.run(coro) for coro in coros]
+        extract_style_guide(input_dir, output_dir, token_budget=3000)
+        assert len(submitted) == 2
+
+        # A second run reuses every batch's notes
+        extract_style_guide(input_dir, output_dir, token_budget=3000)
+        assert len(submitted) == 2
+
+    assert (output_dir / "style_guide.md").read_text() == "# Merged Style Guide"
+    merge_prompt = mock_llm.call_args.kwargs["messages"][1]["content"]
+    assert "# Notes from Batch 2\n\nNotes 2" in merge_prompt
+
+
+@patch('lor.extract_style.call_llm', return_value="# Stats Style Guide")
+def test_extract_style_guide_stats_strategy(mock_llm, tmp_path):
+    """Test that the stats strategy sends corpus statistics and only the letters that fit."""
+    input_dir = tmp_path / "redacted"
+    input_dir.mkdir()
+    for i in range(5):
+        (input_dir / f"letter{i}.md").write_text(
+            f"Dear Committee,\n\nI am writing to recommend [STUDENT_NAME]. " + "Great work. " * 300
+        )
+
+    extract_style_guide(input_dir, tmp_path / "out", token_budget=5000, strategy="stats")
+
+    prompt = mock_llm.call_args.kwargs["messages"][1]["content"]
+    assert "## Corpus Statistics (5 letters, computed locally)" in prompt
+    assert "# Letter: letter0" in prompt
+    assert "# Letter: letter4" not in prompt
+
+
+@patch('lor.extract_style.call_llm', return_value="# Sampled Style Guide")
+def test_extract_style_guide_sample_strategy(mock_llm, tmp_path):
+    """Test that the sample strategy sends one letter per near-duplicate group."""
+    input_dir = tmp_path / "redacted"
+    input_dir.mkdir()
+    ta = "[STUDENT_NAME] was an excellent teaching assistant who held office hours. " * 20
+    research = "[STUDENT_NAME] did research on parsing and wrote a paper on datasets. " * 20
+    (input_dir / "a_ta_stanford.md").write_text(ta + "Stanford")
+    (input_dir / "b_ta_berkeley.md").write_text(ta + "Berkeley")
+    (input_dir / "c_research.md").write_text(research)
+
+    extract_style_guide(input_dir, tmp_path / "out", strategy="sample")
+
+    prompt = mock_llm.call_args.kwargs["messages"][1]["content"]
+    assert "# Letter: a_ta_stanford" in prompt
+    assert "# Letter: b_ta_berkeley" not in prompt
+    assert "# Letter: c_research" in prompt
+    assert "Corpus Statistics" not in prompt
+
+
+@patch('lor.extract_style.call_llm')
+def test_extract_style_guide_incremental(mock_llm, tmp_path):
+    """Test that an incremental run sends only new letters along with the edited guide."""
+    input_dir = tmp_path / "redacted"
+    input_dir.mkdir()
+    output_dir = tmp_path / "out"
+    (input_dir / "letter1.md").write_text("Dear Committee, [STUDENT_NAME] is strong.")
+    (input_dir / "letter2.md").write_text("To whom it may concern, [STUDENT_NAME] excels.")
+
+    mock_llm.return_value = "# Style Guide"
+    extract_style_guide(input_dir, output_dir)
+    (output_dir / "style_guide.md").write_text("# Style Guide\n\nHand edit: never use 'very'.")
+
+    # Nothing changed: no call is made
+    mock_llm.reset_mock()
+    extract_style_guide(input_dir, output_dir, incremental=True)
+    mock_llm.assert_not_called()
+
+    (input_dir / "letter3.md").write_text("Dear Admissions, [STUDENT_NAME] is brilliant.")
+    mock_llm.return_value = "# Updated Style Guide"
+    extract_style_guide(input_dir, output_dir, incremental=True)
+
+    prompt = mock_llm.call_args.kwargs["messages"][1]["content"]
+    assert "Hand edit: never use 'very'." in prompt
+    assert "# Letter: letter3" in prompt
+    assert "# Letter: letter1" not in prompt
+    assert (output_dir / "style_guide.md").read_text() == "# Updated Style Guide"
+
+    # The new letter is now recorded too
+    mock_llm.reset_mock()
+    extract_style_guide(input_dir, output_dir, incremental=True)
+    mock_llm.assert_not_called()
+
+
+@patch('lor.extract_style.call_llm', return_value="# Updated Style Guide")
+def test_extract_style_guide_incremental_keeps_guide_without_manifest(mock_llm, tmp_path):
+    """Test that --incremental merges into a guide that has no manifest instead of rebuilding it."""
+    input_dir = tmp_path / "redacted"
+    input_dir.mkdir()
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+    (input_dir / "letter1.md").write_text("Dear Committee, [STUDENT_NAME] is strong.")
+    (input_dir / "letter2.md").write_text("To whom it may concern, [STUDENT_NAME] excels.")
+    (output_dir / "style_guide.md").write_text("# Style Guide\n\nHand edit: never use 'very'.")
+
+    extract_style_guide(input_dir, output_dir, incremental=True)
+
+    prompt = mock_llm.call_args.kwargs["messages"][1]["content"]
+    assert "## Current Style Guide" in prompt
+    assert "Hand edit: never use 'very'." in prompt
+    assert "# Letter: letter1" in prompt and "# Letter: letter2" in prompt
+
+    # Every letter is now recorded
+    mock_llm.reset_mock()
+    extract_style_guide(input_dir, output_dir, incremental=True)
+    mock_llm.assert_not_called()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Tests for file utilities.
+"""
+
+import logging
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from docx import Document
+from unittest.mock import patch
+
+from lor.file_utils import (
+    CONVERSION_MANIFEST_FILENAME,
+    DOCX_MEDIA_PREFIXES,
+    PDF_BACKENDS,
+    PdfBackend,
+    convert_docx_to_markdown,
+    convert_file_to_markdown_file,
+    convert_pdf_to_markdown,
+    find_student_materials,
+    index_student_materials,
+    iter_pdf_pages,
+    parse_page_range,
+    strip_docx_media,
+    write_markdown_stream,
+)
+from lor.synthesize_packet import convert_materials_to_markdown
+
+
+def test_parse_page_range():
+    """Test parsing single pages, closed and open-ended ranges."""
+    assert parse_page_range("3") == (3, 3)
+    assert parse_page_range("1-5") == (1, 5)
+    assert parse_page_range("2-") == (2, None)
+    for spec in ["0", "5-2", "a-b"]:
+        with pytest.raises(ValueError):
+            parse_page_range(spec)
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_convert_pdf_to_markdown_keeps_page_order(tmp_path, workers, caplog, write_pdf):
+    """Test that serial and page-parallel extraction give the same text in page order."""
+    pdf_path = tmp_path / "transcript.pdf"
+    texts = [f"Page {i}" for i in range(1, 15)]
+    texts[4] = ""
+    write_pdf(pdf_path, texts)
+
+    markdown = convert_pdf_to_markdown(pdf_path, workers=workers)
+
+    assert markdown.split("\n\n") == [text for text in texts if text]
+    assert "Page 5 of transcript.pdf appears empty or unreadable" in caplog.text
+
+
+def test_convert_pdf_to_markdown_page_range(tmp_path, write_pdf):
+    """Test that only the requested pages are extracted."""
+    pdf_path = tmp_path / "resume.pdf"
+    write_pdf(pdf_path, [f"Page {i}" for i in range(1, 6)])
+
+    assert convert_pdf_to_markdown(pdf_path, page_range=(2, 3)) == "Page 2\n\nPage 3"
+    assert convert_pdf_to_markdown(pdf_path, page_range=(4, None)) == "Page 4\n\nPage 5"
+    assert convert_pdf_to_markdown(pdf_path, page_range=(9, None)) == ""
+
+
+@pytest.mark.parametrize("backend", list(PDF_BACKENDS))
+def test_pdf_backends_extract_the_same_pages(tmp_path, write_pdf, backend):
+    """Test that every installed backend extracts pages in order, in and out of process."""
+    if not PDF_BACKENDS[backend].is_available():
+        pytest.skip(f"{backend} is not installed")
+    pdf_path = tmp_path / "cv.pdf"
+    write_pdf(pdf_path, [f"Page {i}" for i in range(1, 9)])
+
+    expected = "\n\n".join(f"Page {i}" for i in range(2, 9))
+    assert convert_pdf_to_markdown(pdf_path, page_range=(2, None), backend=backend) == expected
+    assert convert_pdf_to_markdown(pdf_path, page_range=(2, None), workers=2, backend=backend) == expected
+
+
+def test_parallel_pdf_extraction_bounds_slices_in_flight(tmp_path, write_pdf):
+    """Test that workers > 1 extracts short slices in order without submitting them all at once."""
+    pdf_path = tmp_path / "thesis.pdf"
+    write_pdf(pdf_path, [f"Page {i}" for i in range(1, 81)])
+    submitted = []
+
+    class RecordingPool(ThreadPoolExecutor):
+        def submit(self, fn, *args):
+            submitted.append(args[2:])
+            return super().submit(fn, *args)
+
+    with patch('lor.file_utils.ProcessPoolExecutor', RecordingPool):
+        pages = iter_pdf_pages(pdf_path, workers=2)
+        assert next(pages) == "Page 1"
+        # One slice per worker in flight; the next is queued only as the first is consumed
+        assert submitted == [(0, 16), (16, 32), (32, 48)]
+        assert list(pages) == [f"Page {i}" for i in range(2, 81)]
+    assert submitted[-1] == (64, 80)
+
+
+def test_pdf_conversion_streams_pages_to_file(tmp_path, write_pdf, caplog):
+    """Test that PDFs are written page by page and iter_pdf_pages is lazy."""
+    source = tmp_path / "thesis.pdf"
+    write_pdf(source, ["Chapter 1", "", "Chapter 2"])
+    output_path = tmp_path / "markdown" / "thesis.md"
+
+    pages = iter_pdf_pages(source)
+    assert next(pages) == "Chapter 1"
+    assert "appears empty" not in caplog.text
+    assert list(pages) == ["Chapter 2"]
+    assert "Page 2 of thesis.pdf appears empty or unreadable" in caplog.text
+
+    with patch('lor.file_utils.convert_file_to_markdown') as mock_convert:
+        convert_file_to_markdown_file(source, output_path)
+        mock_convert.assert_not_called()
+    assert output_path.read_text() == "Chapter 1\n\nChapter 2"
+    assert not output_path.with_name("thesis.md.tmp").exists()
+
+
+def test_write_markdown_stream_keeps_previous_output_on_failure(tmp_path):
+    """Test that an interrupted stream leaves the previous output in place."""
+    output_path = tmp_path / "resume.md"
+    output_path.write_text("previous")
+
+    def failing_pages():
+        yield "Page 1"
+        raise RuntimeError("corrupt page")
+
+    with pytest.raises(RuntimeError):
+        write_markdown_stream(failing_pages(), output_path)
+    assert output_path.read_text() == "previous"
+    assert list(tmp_path.iterdir()) == [output_path]
+
+
+def test_convert_materials_to_markdown_reuses_conversions_across_runs(tmp_path):
+    """Test that a second packet run converts nothing when inputs are unchanged."""
+    (tmp_path / "input").mkdir()
+    (tmp_path / "input" / "resume.txt").write_text("Resume text")
+    (tmp_path / "input" / "statement.txt").write_text("Statement text")
+
+    with patch('lor.file_utils.convert_file_to_markdown', side_effect=lambda path, *args: path.read_text()) as mock_convert:
+        first = convert_materials_to_markdown(tmp_path)
+        second = convert_materials_to_markdown(tmp_path)
+
+    assert mock_convert.call_count == 2
+    assert first == second == {"resume": "Resume text", "statement": "Statement text"}
+    assert (tmp_path / "markdown" / CONVERSION_MANIFEST_FILENAME).exists()
+
+    # Changing a file invalidates only its own conversion
+    (tmp_path / "input" / "resume.txt").write_text("Updated resume")
+    with patch('lor.file_utils.convert_file_to_markdown', side_effect=lambda path, *args: path.read_text()) as mock_convert:
+        third = convert_materials_to_markdown(tmp_path)
+    assert mock_convert.call_count == 1
+    assert third == {"resume": "Updated resume", "statement": "Statement text"}
+
+    # So does losing the saved output
+    (tmp_path / "markdown" / "statement.md").unlink()
+    assert convert_materials_to_markdown(tmp_path) == third
+
+
+def test_strip_docx_media_keeps_text(tmp_path):
+    """Test that stripping media drops the images but not the letter's text."""
+    png = bytes.fromhex(
+        "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+        "1f15c4890000000d4944415478da63f8cfc0f01f0005000201a5d1a3b50000000049454e44ae426082"
+    )
+    (tmp_path / "logo.png").write_bytes(png)
+    document = Document()
+    document.add_picture(str(tmp_path / "logo.png"))
+    document.add_paragraph("Jane Smith is an excellent student.")
+    docx_path = tmp_path / "letter.docx"
+    document.save(docx_path)
+
+    with zipfile.ZipFile(strip_docx_media(docx_path)) as stripped:
+        names = stripped.namelist()
+    assert "word/document.xml" in names
+    assert not any(name.startswith(DOCX_MEDIA_PREFIXES) for name in names)
+
+    stripped_markdown = convert_docx_to_markdown(docx_path, strip_media=True)
+    assert stripped_markdown == convert_docx_to_markdown(docx_path)
+    assert "Jane Smith is an excellent student" in stripped_markdown
+
+
+def test_index_student_materials_single_scan(tmp_path):
+    """Test classifying several files per type, format preference and caching."""
+    for name in ["resume.pdf", "resume.docx", "cv.pdf", "paper_2.pdf", "paper_1.pdf",
+                 "transcript.pdf", "professor_notes.md", "notes.md", "~$resume.docx", "statement.odt"]:
+        (tmp_path / name).write_bytes(b"x")
+
+    with patch('lor.file_utils.os.scandir', wraps=os.scandir) as mock_scandir:
+        index = index_student_materials(tmp_path)
+        assert index_student_materials(tmp_path) == index
+        assert mock_scandir.call_count == 1
+
+    assert {material_type: [path.name for path in paths] for material_type, paths in index.items()} == {
+        "resume": ["resume.docx", "cv.pdf"],
+        "transcript": ["transcript.pdf"],
+        "paper": ["paper_1.pdf", "paper_2.pdf"],
+        "professor_notes": ["professor_notes.md"],
+    }
+    assert list(find_student_materials(tmp_path)) == [
+        "resume_1", "resume_2", "transcript", "paper_1", "paper_2", "professor_notes"
+    ]
+
+    # Adding a file changes the directory, so it is scanned again
+    (tmp_path / "sop.txt").write_text("Statement")
+    assert [path.name for path in index_student_materials(tmp_path)["statement"]] == ["sop.txt"]
+    assert index_student_materials(tmp_path / "missing") == {}
+
+
+def test_convert_materials_converts_pdfs_concurrently(tmp_path, write_pdf, caplog):
+    """Test that PDFs convert in worker processes with results in discovery order."""
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    write_pdf(input_dir / "transcript.pdf", ["Algorithms A"])
+    write_pdf(input_dir / "paper_1.pdf", ["First paper"])
+    write_pdf(input_dir / "paper_2.pdf", ["Second paper"])
+    (input_dir / "professor_notes.md").write_text("Great TA")
+    caplog.set_level(logging.INFO)
+
+    materials = convert_materials_to_markdown(tmp_path, workers=3)
+
+    assert materials == {
+        "transcript": "Algorithms A",
+        "paper_1": "First paper",
+        "paper_2": "Second paper",
+        "professor_notes": "Great TA",
+    }
+    assert "Converted paper_2 (paper_2.pdf) in" in caplog.text
+
+    # Nothing is converted again on a second run
+    caplog.clear()
+    assert convert_materials_to_markdown(tmp_path, workers=3) == materials
+    assert "Converted" not in caplog.text
+
+
+def test_pdf_backend_requires_page_methods():
+    """Test that a backend missing page_count or iter_pages can't be instantiated."""
+    class IncompleteBackend(PdfBackend):
+        name = "incomplete"
+
+        def page_count(self, pdf_path):
+            return 0
+
+    with pytest.raises(TypeError, match="iter_pages"):
+        IncompleteBackend()
+    assert all(isinstance(backend, PdfBackend) for backend in PDF_BACKENDS.values())
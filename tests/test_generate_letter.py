@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Tests for letter generation fan-out and streaming.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import patch
+
+from lor.generate_letter import generate_letter, generate_letters, parse_targets
+from lor.llm import TokenUsage
+
+PACKET = """# Student Packet: Jane Smith
+
+## Student Profile
+
+- **Letter Type**: PhD Application
+
+## Research Contributions
+
+- LoRA baselines
+
+## Goals and Experience Alignment
+
+- PhD in ML
+
+## Additional Information
+
+- Robotics club
+"""
+
+
+def test_parse_targets():
+    """Test letter types, named targets and rejected specs."""
+    assert parse_targets("phd, ms,google=job") == {"phd": "phd", "ms": "ms", "google": "job"}
+    for spec in ["", "phd,phd", "postdoc", "a b=phd"]:
+        with pytest.raises(ValueError):
+            parse_targets(spec)
+
+
+@patch('lor.generate_letter.get_scheduler')
+def test_generate_letters_share_prompt_prefix(mock_get_scheduler, tmp_path, caplog):
+    """Test that every variant starts with the same prompt and reports cached tokens."""
+    prompts = []
+
+    async def fake_submit_with_usage(messages, model=None, temperature=None):
+        prompts.append(messages[1]["content"])
+        return f"Letter {len(prompts)}", TokenUsage(prompt_tokens=4000, cached_tokens=3072, completion_tokens=900)
+
+    mock_get_scheduler.return_value.submit_with_usage = fake_submit_with_usage
+    mock_get_scheduler.return_value.run = lambda coros, return_exceptions=False: [asyncio.run(coro) for coro in coros]
+    (tmp_path / "student_packet.md").write_text(PACKET)
+    style_guide = tmp_path / "style_guide.md"
+    style_guide.write_text("# Style")
+    caplog.set_level("INFO")
+
+    paths = generate_letters(tmp_path, style_guide, {"phd": "phd", "google": "job"}, warm_cache=True)
+
+    assert [path.name for path in paths.values()] == ["letter_phd.md", "letter_google.md"]
+    assert paths["google"].read_text() == "Letter 2"
+    prefix = prompts[0][:prompts[0].index("- This letter supports")]
+    assert prompts[1].startswith(prefix)
+    # The packet holds the sections both letter types need
+    assert "PhD in ML" in prefix and "Robotics club" in prefix
+    assert "- This letter supports a PhD program application\n" in prompts[0]
+    assert "- This letter supports a job application (google)\n" in prompts[1]
+    assert "google: 4000 prompt tokens, 3072 cached (77%), 900 completion tokens" in caplog.text
+
+
+@patch('lor.generate_letter.get_scheduler')
+def test_generate_letters_names_targets_of_the_same_type(mock_get_scheduler, tmp_path):
+    """Test that two targets of one letter type get distinct prompts and files."""
+    prompts = []
+
+    async def fake_submit_with_usage(messages, model=None, temperature=None):
+        prompts.append(messages[1]["content"])
+        return f"Letter {len(prompts)}", TokenUsage(prompt_tokens=4000, cached_tokens=0, completion_tokens=900)
+
+    mock_get_scheduler.return_value.submit_with_usage = fake_submit_with_usage
+    mock_get_scheduler.return_value.run = lambda coros, return_exceptions=False: [asyncio.run(coro) for coro in coros]
+    (tmp_path / "student_packet.md").write_text(PACKET)
+    style_guide = tmp_path / "style_guide.md"
+    style_guide.write_text("# Style")
+
+    paths = generate_letters(tmp_path, style_guide, parse_targets("stanford=phd,cmu=phd"))
+
+    assert "- This letter supports a PhD program application (stanford)\n" in prompts[0]
+    assert "- This letter supports a PhD program application (cmu)\n" in prompts[1]
+    assert paths["cmu"].read_text() == "Letter 2"
+
+
+@patch('lor.generate_letter.get_scheduler')
+def test_generate_letters_saves_variants_that_succeed(mock_get_scheduler, tmp_path, caplog):
+    """Test that one failed variant is reported without discarding the letters that finished."""
+    async def fake_submit_with_usage(messages, model=None, temperature=None):
+        if "(google)" in messages[1]["content"]:
+            raise TimeoutError("request timed out")
+        return "Dear Committee", TokenUsage(prompt_tokens=4000, cached_tokens=0, completion_tokens=900)
+
+    def fake_run(coros, return_exceptions=False):
+        async def gather_all():
+            return await asyncio.gather(*coros, return_exceptions=return_exceptions)
+        return asyncio.run(gather_all())
+
+    mock_get_scheduler.return_value.submit_with_usage = fake_submit_with_usage
+    mock_get_scheduler.return_value.run = fake_run
+    (tmp_path / "student_packet.md").write_text(PACKET)
+    style_guide = tmp_path / "style_guide.md"
+    style_guide.write_text("# Style")
+
+    with pytest.raises(RuntimeError, match=r"1 of 3 letter\(s\) failed \(google\)"):
+        generate_letters(tmp_path, style_guide, parse_targets("phd,google=job,ms"), warm_cache=True)
+
+    assert (tmp_path / "output" / "letter_phd.md").read_text() == "Dear Committee"
+    assert (tmp_path / "output" / "letter_ms.md").exists()
+    assert not (tmp_path / "output" / "letter_google.md").exists()
+    assert "google: letter generation failed: request timed out" in caplog.text
+
+
+def test_streamed_letter_is_written_progressively(tmp_path):
+    """Test that a streamed letter appears in the .tmp file and is renamed when done."""
+    (tmp_path / "student_packet.md").write_text(PACKET)
+    style_guide = tmp_path / "style_guide.md"
+    style_guide.write_text("# Style")
+    tmp_letter = tmp_path / "output" / "letter_draft.md.tmp"
+    shown = []
+
+    def fake_stream(messages, temperature):
+        yield "Dear Committee,\n\n"
+        assert tmp_letter.read_text() == "Dear Committee,\n\n"
+        yield "Jane is excellent."
+
+    with patch('lor.generate_letter.stream_llm', side_effect=fake_stream):
+        path = generate_letter(tmp_path, style_guide, stream=True, on_text=shown.append)
+
+    assert path.read_text() == "Dear Committee,\n\nJane is excellent."
+    assert shown == ["Dear Committee,\n\n", "Jane is excellent."]
+    assert not tmp_letter.exists()
+
+    # Cancelling a draft keeps the previous one
+    def cancelled_stream(messages, temperature):
+        yield "To whom"
+        raise KeyboardInterrupt
+
+    with patch('lor.generate_letter.stream_llm', side_effect=cancelled_stream):
+        with pytest.raises(KeyboardInterrupt):
+            generate_letter(tmp_path, style_guide, stream=True)
+    assert path.read_text() == "Dear Committee,\n\nJane is excellent."
+    assert not tmp_letter.exists()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Tests for the redaction leak scanner.
+"""
+
+from pathlib import Path
+from unittest.mock import patch
+from lor.leak_scanner import AhoCorasick, scan_text, verify_redaction
+from lor.pre_redaction import find_identifiers
+
+
+def test_aho_corasick_finds_overlapping_patterns():
+    """Test that every occurrence of every pattern is found."""
+    matcher = AhoCorasick(["he", "she", "his", "hers"])
+
+    assert sorted(matcher.finditer("ushers")) == [(1, "she"), (2, "he"), (2, "hers")]
+
+
+def test_scan_text_reports_locations_on_word_boundaries():
+    """Test that leaks carry line/column and partial-word matches are ignored."""
+    identifiers = {"Ann": ("[STUDENT_NAME]", "a.docx"), "ann@x.edu": ("[STUDENT_EMAIL]", "a.docx")}
+    text = "Annual report.\n\nThanks, Ann (ann@x.edu)."
+
+    leaks = scan_text(text, Path("a.md"), AhoCorasick(identifiers), identifiers)
+
+    assert [(leak.identifier, leak.line, leak.column) for leak in leaks] == [
+        ("Ann", 3, 9),
+        ("ann@x.edu", 3, 14),
+    ]
+
+
+ORIGINALS = {
+    "a.docx": "Dear Committee,\n\nI am writing to recommend Jane Smith. Email: jsmith@cmu.edu\n\nSincerely,\n\nProf",
+    "b.docx": "Dear Committee,\n\nI am writing to recommend Wei Zhang.\n\nSincerely,\n\nProf",
+}
+
+
+@patch('lor.leak_scanner.convert_docx_to_markdown', side_effect=lambda path: ORIGINALS[path.name])
+def test_verify_redaction_finds_leaks_across_files(mock_convert, tmp_path):
+    """Test that identifiers from any original letter are flagged in every redacted file."""
+    originals = tmp_path / "original"
+    originals.mkdir()
+    for name in ORIGINALS:
+        (originals / name).write_bytes(b"")
+    redacted = tmp_path / "redacted"
+    redacted.mkdir()
+    (redacted / "a.md").write_text("I am writing to recommend [STUDENT_NAME]. Email: [STUDENT_EMAIL]\n")
+    (redacted / "b.md").write_text("I am writing to recommend [STUDENT_NAME].\n\nSmith helped Wei.\n")
+
+    leaks = verify_redaction(originals, redacted)
+
+    assert [(leak.path.name, leak.identifier, leak.source) for leak in leaks] == [
+        ("b.md", "Smith", "a.docx"),
+        ("b.md", "Wei", "b.docx"),
+    ]
+
+
+HEADER_ORIGINALS = {
+    "c.docx": "Re: Letter of Recommendation for Maria Lopez\n\nDear Committee,\n\nShe was a strong student.\n\nSincerely,\n\nProf",
+}
+
+
+@patch('lor.leak_scanner.convert_docx_to_markdown', side_effect=lambda path: HEADER_ORIGINALS[path.name])
+def test_verify_redaction_finds_names_from_the_subject_header(mock_convert, tmp_path):
+    """Test that a name given only in a "Re: Letter of Recommendation for" header is scanned for."""
+    originals = tmp_path / "original"
+    originals.mkdir()
+    (originals / "c.docx").write_bytes(b"")
+    redacted = tmp_path / "redacted"
+    redacted.mkdir()
+    (redacted / "c.md").write_text("Re: Letter of Recommendation for Maria Lopez\n\nDear Committee,\n")
+
+    leaks = verify_redaction(originals, redacted)
+
+    assert sorted((leak.identifier, leak.line, leak.column) for leak in leaks) == [
+        ("Lopez", 1, 40),
+        ("Maria", 1, 34),
+        ("Maria Lopez", 1, 34),
+    ]
+
+
+MISSED_ORIGINALS = {
+    "d.docx": "Dear Committee,\n\nJune Park took my course in Fall 2022. June was my best TA.\n\nSincerely,\n\nProf",
+}
+
+
+@patch('lor.leak_scanner.convert_docx_to_markdown', side_effect=lambda path: MISSED_ORIGINALS[path.name])
+def test_verify_redaction_catches_names_pre_redaction_misses(mock_convert, tmp_path):
+    """Test that words the redaction replaced are scanned for even when the heuristics find no name."""
+    assert find_identifiers(MISSED_ORIGINALS["d.docx"]) == {}
+
+    originals = tmp_path / "original"
+    originals.mkdir()
+    (originals / "d.docx").write_bytes(b"")
+    redacted = tmp_path / "redacted"
+    redacted.mkdir()
+    (redacted / "d.md").write_text(
+        "Dear Committee,\n\n[STUDENT_NAME] took my course in Fall 2022. June was my best TA.\n\nSincerely,\n\nProf"
+    )
+    (redacted / "e.md").write_text("Park also helped.\n")
+
+    leaks = verify_redaction(originals, redacted)
+
+    assert [(leak.path.name, leak.identifier, leak.line, leak.column) for leak in leaks] == [
+        ("d.md", "June", 3, 45),
+        ("e.md", "Park", 1, 1),
+    ]
+    assert all(leak.placeholder == "[STUDENT_NAME]" for leak in leaks)
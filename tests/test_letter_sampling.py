@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Tests for representative letter sampling.
+"""
+
+from lor.letter_sampling import build_tfidf, drop_near_duplicates, select_representative
+
+
+TA_LETTER = "[STUDENT_NAME] was an outstanding teaching assistant who held office hours and graded homework. "
+RESEARCH_LETTER = "[STUDENT_NAME] did research on parsing and wrote a paper about neural models and datasets. "
+COURSE_LETTER = "[STUDENT_NAME] earned an A in my machine learning course and asked sharp questions in lecture. "
+
+
+def make_archive():
+    return [
+        TA_LETTER * 5 + "Stanford",
+        TA_LETTER * 5 + "Berkeley",
+        RESEARCH_LETTER * 5,
+        COURSE_LETTER * 5 + "teaching",
+        RESEARCH_LETTER * 5 + "MIT",
+    ]
+
+
+def test_drop_near_duplicates_keeps_one_variant():
+    """Test that program-specific variants of one letter collapse to the first."""
+    vectors = build_tfidf(make_archive())
+
+    assert drop_near_duplicates(vectors @ vectors.T) == [0, 2, 3]
+
+
+def test_select_representative_covers_each_kind_of_letter():
+    """Test that the selection is diverse and fits the budget."""
+    letters = make_archive()
+    one_letter = len(letters[0]) // 4 + 10
+
+    assert select_representative(letters, token_budget=3 * one_letter) == [0, 2, 3]
+    assert len(select_representative(letters, token_budget=one_letter)) == 1
+    assert select_representative(letters, token_budget=10) == []
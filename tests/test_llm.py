@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Tests for the LLM wrapper and its response cache.
+"""
+
+import asyncio
+import os
+import time
+import pytest
+from unittest.mock import patch, MagicMock
+from lor import llm
+from lor.llm_cache import ResponseCache, make_cache_key
+
+
+def make_response(content):
+    """Build a minimal litellm-style completion response."""
+    resp = MagicMock()
+    resp.choices = [MagicMock()]
+    resp.choices[0].message = {"content": content}
+    return resp
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Enable the response cache for a single test."""
+    active = llm.configure_cache(enabled=True, cache_dir=tmp_path / "cache")
+    yield active
+    llm.configure_cache(enabled=False)
+
+
+def test_cache_key_depends_on_request():
+    """Test that every request field changes the cache key."""
+    messages = [{"role": "user", "content": "hello"}]
+    key = make_cache_key("gpt-x", messages, 1.0)
+
+    assert key == make_cache_key("gpt-x", [{"role": "user", "content": "hello"}], 1.0)
+    assert key != make_cache_key("gpt-y", messages, 1.0)
+    assert key != make_cache_key("gpt-x", messages, 0.3)
+    assert key != make_cache_key("gpt-x", [{"role": "user", "content": "hello!"}], 1.0)
+
+
+@patch('lor.llm.completion')
+def test_call_llm_uses_cache(mock_completion, cache):
+    """Test that identical calls are served from the cache."""
+    mock_completion.return_value = make_response("redacted text")
+    messages = [{"role": "user", "content": "redact this"}]
+
+    assert llm.call_llm(messages) == "redacted text"
+    assert llm.call_llm(messages) == "redacted text"
+
+    assert mock_completion.call_count == 1
+    assert cache.stats() == {"hits": 1, "misses": 1, "writes": 1}
+
+
+@patch('lor.llm.completion')
+def test_call_llm_refresh_bypasses_reads(mock_completion, tmp_path):
+    """Test that refresh mode always calls the provider but updates the cache."""
+    mock_completion.return_value = make_response("fresh")
+    messages = [{"role": "user", "content": "hi"}]
+    try:
+        llm.configure_cache(enabled=True, cache_dir=tmp_path, refresh=True)
+        llm.call_llm(messages)
+        llm.call_llm(messages)
+        assert mock_completion.call_count == 2
+
+        # A normal cache sees the refreshed entry
+        llm.configure_cache(enabled=True, cache_dir=tmp_path)
+        assert llm.call_llm(messages) == "fresh"
+        assert mock_completion.call_count == 2
+    finally:
+        llm.configure_cache(enabled=False)
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """Test that the oldest entries are evicted once the size limit is exceeded."""
+    cache = ResponseCache(tmp_path, max_bytes=900)
+    cache.put("aa" + "0" * 62, "x" * 200, "m")
+    cache.put("bb" + "0" * 62, "y" * 200, "m")
+
+    # Make the first entry the least recently used
+    old = time.time() - 100
+    os.utime(tmp_path / "aa" / ("aa" + "0" * 62 + ".json"), (old, old))
+    cache.put("cc" + "0" * 62, "z" * 200, "m")
+
+    assert cache.get("aa" + "0" * 62) is None
+    assert cache.get("cc" + "0" * 62) == "z" * 200
+
+
+def test_cache_overwrite_does_not_inflate_size(tmp_path):
+    """Test that rewriting a key counts only its new size in the cache total."""
+    cache = ResponseCache(tmp_path, max_bytes=2000)
+    cache.put("aa" + "0" * 62, "x" * 200, "m")
+    cache.put("bb" + "0" * 62, "y" * 200, "m")
+    for _ in range(5):
+        cache.put("bb" + "0" * 62, "y" * 200, "m")
+
+    assert cache._total_bytes == sum(p.stat().st_size for p in tmp_path.rglob("*.json"))
+    with patch.object(cache, "_evict") as mock_evict:
+        cache.put("bb" + "0" * 62, "y" * 200, "m")
+    mock_evict.assert_not_called()
+
+
+def test_cache_expires_old_entries(tmp_path):
+    """Test that entries older than the maximum age are treated as misses."""
+    cache = ResponseCache(tmp_path, max_age_seconds=0)
+    cache.put("dd" + "0" * 62, "stale", "m")
+    time.sleep(0.01)
+
+    assert cache.get("dd" + "0" * 62) is None
+    assert cache.stats()["misses"] == 1
+
+
+@patch('lor.llm.acompletion')
+def test_acall_llm_with_usage_reports_cached_tokens(mock_acompletion, cache):
+    """Test that provider-cached prompt tokens are read from the response usage."""
+    resp = make_response("letter")
+    resp.usage.prompt_tokens = 5000
+    resp.usage.completion_tokens = 800
+    resp.usage.prompt_tokens_details.cached_tokens = 4096
+
+    async def fake_acompletion(**kwargs):
+        return resp
+
+    mock_acompletion.side_effect = fake_acompletion
+    messages = [{"role": "user", "content": "write a letter"}]
+
+    content, usage = asyncio.run(llm.acall_llm_with_usage(messages))
+    assert content == "letter"
+    assert (usage.prompt_tokens, usage.cached_tokens, usage.completion_tokens) == (5000, 4096, 800)
+    assert usage.cached_share == pytest.approx(0.8192)
+
+    # A local cache hit makes no request and reports no usage
+    content, usage = asyncio.run(llm.acall_llm_with_usage(messages))
+    assert content == "letter"
+    assert usage.from_cache and usage.prompt_tokens == 0
+
+
+def make_chunk(text, choices=True):
+    """Build a minimal litellm-style streaming chunk (choices=False: a usage or keep-alive chunk)."""
+    chunk = MagicMock()
+    chunk.choices = [MagicMock()] if choices else []
+    if choices:
+        chunk.choices[0].delta.content = text
+    return chunk
+
+
+@patch('lor.llm.completion')
+def test_stream_llm_caches_only_complete_responses(mock_completion, cache):
+    """Test that streamed text is yielded as it arrives and cached once complete."""
+    mock_completion.side_effect = lambda **kwargs: iter(
+        [make_chunk("Dear "), make_chunk(None), make_chunk(None, choices=False), make_chunk("Committee")]
+    )
+    messages = [{"role": "user", "content": "write a letter"}]
+
+    # Abandoning the stream early caches nothing
+    stream = llm.stream_llm(messages)
+    assert next(stream) == "Dear "
+    stream.close()
+    assert cache.stats()["writes"] == 0
+
+    assert list(llm.stream_llm(messages)) == ["Dear ", "Committee"]
+    assert mock_completion.call_args.kwargs["stream"] is True
+    assert list(llm.stream_llm(messages)) == ["Dear Committee"]
+    assert mock_completion.call_count == 2
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for the bounded-concurrency LLM scheduler.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import patch
+from lor.llm_scheduler import LLMScheduler, parse_model_limits
+
+
+def make_slow_llm(delay=0.01):
+    """Build a fake acall_llm that echoes the request's model after a short wait."""
+    async def fake_acall_llm(messages, model, temperature):
+        await asyncio.sleep(delay)
+        return f"{model}:{messages[0]['content']}"
+    return fake_acall_llm
+
+
+@patch('lor.llm_scheduler.acall_llm', new=make_slow_llm())
+def test_scheduler_caps_requests_in_flight():
+    """Test that no more than max_in_flight requests run at once."""
+    scheduler = LLMScheduler(max_in_flight=3)
+    coros = [
+        scheduler.submit([{"role": "user", "content": str(i)}], model="m")
+        for i in range(10)
+    ]
+
+    results = scheduler.run(coros)
+
+    assert results == [f"m:{i}" for i in range(10)]
+    assert scheduler.peak_in_flight == 3
+    assert scheduler.in_flight == 0
+
+
+@patch('lor.llm_scheduler.acall_llm', new=make_slow_llm())
+def test_scheduler_per_model_limit():
+    """Test that a per-model cap applies on top of the global limit."""
+    scheduler = LLMScheduler(max_in_flight=10, per_model_limits={"slow": 1})
+    coros = [
+        scheduler.submit([{"role": "user", "content": "x"}], model="slow")
+        for _ in range(4)
+    ]
+
+    scheduler.run(coros)
+
+    assert scheduler.peak_in_flight == 1
+
+
+def test_scheduler_returns_exceptions():
+    """Test that one failing request doesn't abort the batch when asked."""
+    async def flaky_acall_llm(messages, model, temperature):
+        if messages[0]["content"] == "bad":
+            raise RuntimeError("provider error")
+        return "ok"
+
+    scheduler = LLMScheduler(max_in_flight=2)
+    with patch('lor.llm_scheduler.acall_llm', new=flaky_acall_llm):
+        results = scheduler.run(
+            [scheduler.submit([{"role": "user", "content": c}]) for c in ["good", "bad"]],
+            return_exceptions=True,
+        )
+
+    assert results[0] == "ok"
+    assert isinstance(results[1], RuntimeError)
+
+
+def test_parse_model_limits():
+    """Test parsing MODEL=N command-line specs."""
+    assert parse_model_limits(["gpt-5.2=4", "anthropic/claude=2"]) == {
+        "gpt-5.2": 4,
+        "anthropic/claude": 2,
+    }
+    with pytest.raises(ValueError):
+        parse_model_limits(["gpt-5.2"])
+    with pytest.raises(ValueError):
+        parse_model_limits(["gpt-5.2=0"])
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Tests for the PDF backend benchmark.
+"""
+
+from lor.file_utils import PDF_BACKENDS
+from lor.pdf_bench import BenchResult, benchmark_pdf_backends, format_results, recommend_backend
+
+
+def test_recommend_backend_skips_incomplete_output():
+    """Test that a fast backend losing text is not recommended."""
+    results = [
+        BenchResult("pypdf2", pages=10, seconds=2.0, tokens=1000),
+        BenchResult("pypdfium2", pages=10, seconds=0.5, tokens=500),
+        BenchResult("pdfminer", pages=10, seconds=1.0, tokens=980),
+        BenchResult("pdfplumber", error="not installed"),
+    ]
+
+    assert recommend_backend(results) == "pdfminer"
+    assert recommend_backend(results, min_token_ratio=0.4) == "pypdfium2"
+    assert recommend_backend([BenchResult("pypdf2", error="boom")]) is None
+
+
+def test_benchmark_pdf_backends(tmp_path, write_pdf):
+    """Test benchmarking every installed backend on a small PDF."""
+    pdf_path = tmp_path / "transcript.pdf"
+    write_pdf(pdf_path, ["Intro to Algorithms A", "Operating Systems A-"])
+
+    results = benchmark_pdf_backends([pdf_path])
+
+    assert [result.backend for result in results] == [
+        name for name, backend in PDF_BACKENDS.items() if backend.is_available()
+    ]
+    for result in results:
+        assert result.error is None
+        assert result.pages == 2
+        assert result.tokens > 0
+    assert "pypdf2" in format_results(results)
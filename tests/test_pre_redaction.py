@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for the local pre-redaction pass.
+"""
+
+from unittest.mock import patch
+from lor.pre_redaction import pre_redact, find_student_names
+from lor.redact_student_info import DocumentRedactor
+
+
+LETTER = """__Matthew R. Gormley__
+__mgormley@cs.cmu.edu__
+
+Dear Admissions Committee,
+
+I am writing to recommend Jane Smith for your PhD program. Jane took my course in Fall 2022.
+
+You can reach her at jsmith@andrew.cmu.edu or 412-555-1234. Her student ID is 12345678.
+
+Sincerely,
+
+Matthew R. Gormley
+"""
+
+
+def test_find_student_names():
+    """Test that names are learned from recommendation phrases."""
+    assert find_student_names("I am delighted to strongly recommend Ms. Jane Smith for") == ["Jane Smith"]
+    assert find_student_names("Re: Recommendation for Wei Zhang\n\nDear Committee,") == ["Wei Zhang"]
+    assert find_student_names("Re: Letter of Recommendation for Jane Doe\n\nDear Committee,") == ["Jane Doe"]
+    assert find_student_names("RE: LETTER of recommendation for Jane Doe") == ["Jane Doe"]
+    assert find_student_names("Re: Letter of Recommendation\n\nDear Committee,") == []
+
+
+def test_pre_redact_resolves_simple_letter():
+    """Test that a letter with only regex/gazetteer identifiers is fully resolved."""
+    result = pre_redact(LETTER)
+
+    assert result.resolved
+    assert "I am writing to recommend [STUDENT_NAME] for your PhD program. [STUDENT_NAME] took" in result.text
+    assert "[STUDENT_EMAIL] or [STUDENT_INFO]. Her student ID is [STUDENT_ID]." in result.text
+    # The professor's letterhead and signature are untouched
+    assert "__mgormley@cs.cmu.edu__" in result.text
+    assert result.text.endswith("Matthew R. Gormley\n")
+
+
+def test_pre_redact_flags_ambiguous_paragraphs():
+    """Test that unknown capitalized words leave a paragraph for the LLM."""
+    letter = LETTER.replace("Sincerely,", "Jane and Priya built a parser.\n\nSincerely,")
+
+    result = pre_redact(letter)
+
+    assert not result.resolved
+    assert result.ambiguous_text() == "[STUDENT_NAME] and Priya built a parser."
+
+
+@patch('lor.redact_student_info.call_llm')
+def test_redactor_sends_only_ambiguous_paragraphs(mock_llm):
+    """Test that pre-redaction skips the LLM or sends only ambiguous paragraphs."""
+    redactor = DocumentRedactor(pre_redact=True)
+
+    assert redactor.redact_text(LETTER) == pre_redact(LETTER).text
+    mock_llm.assert_not_called()
+
+    letter = LETTER.replace("Sincerely,", "Jane and Priya built a parser.\n\nSincerely,")
+    mock_llm.return_value = "[STUDENT_NAME] and [STUDENT_NAME_2] built a parser."
+    redacted = redactor.redact_text(letter)
+
+    sent = mock_llm.call_args.kwargs["messages"][1]["content"]
+    assert sent.endswith("\n\n[STUDENT_NAME] and Priya built a parser.")
+    assert "[STUDENT_NAME] and [STUDENT_NAME_2] built a parser.\n\nSincerely," in redacted
+
+
+def test_pre_redact_does_not_trust_names_in_the_header():
+    """Test that a subject line naming the student doesn't make the name safe in the body."""
+    letter = (
+        "Re: Letter of Recommendation for Jane Doe\n\n"
+        "Dear Admissions Committee,\n\n"
+        "Jane took my course in Fall 2022. Doe worked hard.\n\n"
+        "Sincerely,\n\nMatthew R. Gormley\n"
+    )
+
+    result = pre_redact(letter)
+
+    assert "Jane" not in result.text and "Doe" not in result.text
+    assert "[STUDENT_NAME] took my course in Fall 2022. [STUDENT_NAME] worked hard." in result.text
+
+    # A name the patterns miss stays ambiguous even though the header mentions it
+    result = pre_redact(letter.replace("Jane Doe", "Jane Doe (Priya)").replace("Doe worked", "Priya worked"))
+    assert not result.resolved
+
+
+def test_pre_redact_catches_students_named_like_months():
+    """Test that a first name that is also a safe word ("June") is still redacted."""
+    letter = (
+        "Dear Admissions Committee,\n\n"
+        "I am writing to recommend June Park for your PhD program.\n\n"
+        "June took my course in Fall 2022 and was a TA in May.\n\n"
+        "Sincerely,\n\nMatthew R. Gormley\n"
+    )
+
+    assert find_student_names(letter) == ["June Park"]
+    result = pre_redact(letter)
+    assert "June" not in result.text and "Park" not in result.text
+    assert "[STUDENT_NAME] took my course in Fall 2022 and was a TA in May." in result.text
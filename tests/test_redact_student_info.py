@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for the redaction pipeline (with mocked conversion and LLM calls).
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from lor.redact_student_info import process_all
+
+
+def fake_convert(docx_path):
+    """Stand-in for mammoth conversion that fails on files named bad*.docx."""
+    if docx_path.name.startswith("bad"):
+        raise ValueError("corrupt document")
+    return f"Letter for {docx_path.stem}"
+
+
+def make_archive(tmp_path, names):
+    """Create empty .docx placeholders under tmp_path/in."""
+    in_dir = tmp_path / "in"
+    in_dir.mkdir()
+    for name in names:
+        (in_dir / name).write_bytes(b"")
+    return in_dir
+
+
+@patch('lor.redact_student_info.call_llm', side_effect=lambda messages: "[STUDENT_NAME]")
+@patch('lor.redact_student_info.convert_docx_to_markdown', side_effect=fake_convert)
+def test_process_all_counts_failures(mock_convert, mock_llm, tmp_path):
+    """Test that a bad file is counted as a failure without stopping the run."""
+    in_dir = make_archive(tmp_path, ["a.docx", "bad.docx", "c.docx"])
+    out_dir = tmp_path / "out"
+
+    assert process_all(str(in_dir), str(out_dir)) == (2, 1)
+    assert sorted(p.name for p in out_dir.glob("*.md")) == ["a.md", "c.md"]
+
+
+@patch('lor.redact_student_info.ProcessPoolExecutor', ThreadPoolExecutor)
+@patch('lor.redact_student_info.convert_docx_to_markdown', side_effect=fake_convert)
+def test_process_all_parallel(mock_convert, tmp_path):
+    """Test that worker mode redacts every document through the scheduler."""
+    async def fake_submit(messages):
+        return "redacted: " + messages[1]["content"].rsplit("\n", 1)[-1]
+
+    in_dir = make_archive(tmp_path, [f"letter{i}.docx" for i in range(5)] + ["bad.docx"])
+    out_dir = tmp_path / "out"
+
+    with patch('lor.redact_student_info.get_scheduler') as mock_get_scheduler:
+        mock_get_scheduler.return_value.submit = fake_submit
+        assert process_all(str(in_dir), str(out_dir), workers=3) == (5, 1)
+
+    assert (out_dir / "letter3.md").read_text() == "redacted: Letter for letter3"
+
+
+@patch('lor.redact_student_info.call_llm', side_effect=lambda messages: "[STUDENT_NAME]")
+@patch('lor.redact_student_info.convert_docx_to_markdown', side_effect=fake_convert)
+def test_process_all_is_incremental(mock_convert, mock_llm, tmp_path):
+    """Test that unchanged documents are skipped and deleted sources pruned."""
+    in_dir = make_archive(tmp_path, ["a.docx", "b.docx"])
+    out_dir = tmp_path / "out"
+    assert process_all(str(in_dir), str(out_dir)) == (2, 0)
+
+    # Only the new and the modified document are redacted again
+    (in_dir / "c.docx").write_bytes(b"new")
+    (in_dir / "a.docx").write_bytes(b"edited")
+    (in_dir / "b.docx").unlink()
+    mock_llm.reset_mock()
+
+    assert process_all(str(in_dir), str(out_dir)) == (2, 0)
+    assert mock_llm.call_count == 2
+    assert sorted(p.name for p in out_dir.glob("*.md")) == ["a.md", "c.md"]
+
+    # Nothing changed, so nothing is sent; --force redoes everything
+    mock_llm.reset_mock()
+    assert process_all(str(in_dir), str(out_dir)) == (0, 0)
+    assert process_all(str(in_dir), str(out_dir), force=True) == (2, 0)
+    assert mock_llm.call_count == 2
+
+
+@patch('lor.redact_student_info.call_llm', side_effect=lambda messages: "[STUDENT_NAME]")
+@patch('lor.redact_student_info.convert_docx_to_markdown', side_effect=fake_convert)
+def test_process_all_subdirectory_keeps_other_outputs(mock_convert, mock_llm, tmp_path):
+    """Test that redacting a subdirectory neither prunes nor redoes the rest of the archive."""
+    in_dir = make_archive(tmp_path, ["2024a.docx", "2024b.docx"])
+    (in_dir / "2025").mkdir()
+    (in_dir / "2025" / "a.docx").write_bytes(b"")
+    out_dir = tmp_path / "out"
+    assert process_all(str(in_dir), str(out_dir)) == (3, 0)
+
+    mock_llm.reset_mock()
+    assert process_all(str(in_dir / "2025"), str(out_dir)) == (0, 0)
+    mock_llm.assert_not_called()
+    assert sorted(p.name for p in out_dir.glob("*.md")) == ["2024a.md", "2024b.md", "a.md"]
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Tests for chunked redaction of long documents.
+"""
+
+import asyncio
+import json
+from unittest.mock import patch
+from lor.redaction_chunks import split_into_chunks, IdentifierMap
+from lor.redact_student_info import DocumentRedactor
+
+
+def test_split_into_chunks_round_trips():
+    """Test that chunks respect the budget and reassemble to the original text."""
+    text = "\n\n".join(f"Paragraph {i} " + "word " * 20 for i in range(10)) + "\n"
+
+    chunks = split_into_chunks(text, max_tokens=60)
+
+    assert len(chunks) > 1
+    assert "".join(chunk + separator for chunk, separator in chunks) == text
+    assert all(not chunk.endswith("\n") for chunk, _ in chunks)
+
+
+def test_identifier_map_reconciles_numbering():
+    """Test that the same student gets the same number in every chunk."""
+    identifiers = IdentifierMap(["Jane Smith"])
+
+    reconciled = identifiers.reconcile([
+        {"Jane": "[STUDENT_NAME]", "j@x.edu": "[STUDENT_EMAIL]"},
+        {"Wei Zhang": "[STUDENT_NAME_1]", "Smith": "[STUDENT_NAME_2]"},
+    ])
+
+    assert reconciled == [
+        {"Jane": "[STUDENT_NAME_1]", "j@x.edu": "[STUDENT_EMAIL]"},
+        {"Wei Zhang": "[STUDENT_NAME_2]", "Smith": "[STUDENT_NAME_1]"},
+    ]
+
+
+def fake_span_llm(text_to_spans):
+    """Build a fake scheduler submit that reports spans for whichever names a chunk contains."""
+    async def submit(messages):
+        chunk = messages[1]["content"]
+        spans = [
+            {"text": name, "placeholder": "[STUDENT_NAME]"}
+            for name in text_to_spans if name in chunk.rsplit("Document to analyze:", 1)[-1]
+        ]
+        return json.dumps({"replacements": spans})
+    return submit
+
+
+def test_chunked_span_redaction():
+    """Test that long documents are redacted per chunk with consistent placeholders."""
+    text = (
+        "I am writing to recommend Jane Smith.\n\n"
+        + "\n\n".join("Filler " * 30 for _ in range(3))
+        + "\n\nJane and Wei Zhang built a parser.\n\nWei was great.\n"
+    )
+    redactor = DocumentRedactor("spans", chunk_tokens=80)
+
+    with patch('lor.redact_student_info.get_scheduler') as mock_get_scheduler:
+        mock_get_scheduler.return_value.submit = fake_span_llm(["Jane Smith", "Jane", "Wei Zhang", "Wei"])
+        mock_get_scheduler.return_value.run = lambda coros: [asyncio.run(coro) for coro in coros]
+        redacted = redactor.redact_text(text)
+
+    assert redacted.startswith("I am writing to recommend [STUDENT_NAME_1].\n\n")
+    assert redacted.endswith("[STUDENT_NAME_1] and [STUDENT_NAME_2] built a parser.\n\n[STUDENT_NAME_2] was great.\n")
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for span-based redaction.
+"""
+
+import pytest
+from unittest.mock import patch
+from lor.redaction_spans import parse_replacements, apply_replacements
+from lor.redact_student_info import DocumentRedactor
+
+
+LETTER = "**Dear Committee,**\n\nI recommend Jane Smith (jsmith@cmu.edu). Jane is a Janeite.\n"
+
+
+def test_parse_replacements():
+    """Test parsing JSON replacements, with or without a code fence."""
+    reply = '{"replacements": [{"text": "Jane Smith", "placeholder": "[STUDENT_NAME]"}]}'
+    assert parse_replacements(reply) == {"Jane Smith": "[STUDENT_NAME]"}
+    assert parse_replacements(f"```json\n{reply}\n```") == {"Jane Smith": "[STUDENT_NAME]"}
+    assert parse_replacements('{"replacements": []}') == {}
+
+
+def test_parse_replacements_rejects_bad_output():
+    """Test that malformed replies and unknown placeholders raise ValueError."""
+    with pytest.raises(ValueError):
+        parse_replacements("Here is the redacted letter: ...")
+    with pytest.raises(ValueError):
+        parse_replacements('{"replacements": [{"text": "Jane", "placeholder": "[NAME]"}]}')
+
+
+def test_apply_replacements_preserves_formatting():
+    """Test that spans are replaced exactly, longest first, on word boundaries."""
+    redacted = apply_replacements(LETTER, {
+        "Jane Smith": "[STUDENT_NAME]",
+        "Jane": "[STUDENT_NAME]",
+        "jsmith@cmu.edu": "[STUDENT_EMAIL]",
+    })
+
+    assert redacted == (
+        "**Dear Committee,**\n\nI recommend [STUDENT_NAME] ([STUDENT_EMAIL]). "
+        "[STUDENT_NAME] is a Janeite.\n"
+    )
+
+
+def test_apply_replacements_rejects_missing_span():
+    """Test that a span absent from the document is rejected."""
+    with pytest.raises(ValueError):
+        apply_replacements(LETTER, {"John Doe": "[STUDENT_NAME]"})
+
+
+@patch('lor.redact_student_info.call_llm')
+def test_span_mode_falls_back_to_rewrite(mock_llm):
+    """Test that invalid span output triggers a full-rewrite redaction."""
+    mock_llm.side_effect = ["not json", "rewritten by LLM"]
+
+    assert DocumentRedactor("spans").redact_text(LETTER) == "rewritten by LLM"
+    assert mock_llm.call_count == 2
+
+
+@patch('lor.redact_student_info.call_llm')
+def test_span_mode_applies_spans(mock_llm):
+    """Test that span mode applies the LLM's replacements locally."""
+    mock_llm.return_value = '{"replacements": [{"text": "Jane Smith", "placeholder": "[STUDENT_NAME]"}]}'
+
+    redacted = DocumentRedactor("spans").redact_text(LETTER)
+
+    assert "I recommend [STUDENT_NAME] (jsmith@cmu.edu)" in redacted
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for the structured student packet and section-selective letter generation.
+"""
+
+import json
+from unittest.mock import patch
+
+from lor.generate_letter import generate_letter, load_student_packet
+from lor.student_packet import (
+    STRUCTURED_PACKET_FILENAME,
+    load_structured_packet,
+    split_packet_sections,
+)
+
+PACKET = """# Student Packet: Jane Smith
+
+## 1. Student Profile (Metadata)
+
+- **Name**: Jane Smith
+- **Pronouns**: she/her
+- **Letter Type**: PhD Application
+
+## 2. Academic Performance
+
+**Courses with Professor Gormley:**
+- 10-301 Introduction to Machine Learning (Fall 2022): A
+
+## 3. Teaching Assistant Work
+
+- TA for 10-601 (Fall 2023)
+
+## 4. Research Contributions
+
+### Efficient Fine-tuning
+
+- Implemented LoRA baselines
+
+## 5. Goals and Experience Alignment
+
+### Research Interests
+
+- Parameter-efficient learning
+
+## 6. Strengths from Professor's Perspective
+
+### Key Strengths
+
+- Debugs distributed training code independently
+
+## 7. Additional Information
+
+- Robotics club treasurer
+"""
+
+
+def test_split_packet_sections_keeps_subheadings():
+    """Test splitting on numbered section headings without splitting on subheadings."""
+    sections = split_packet_sections(PACKET)
+
+    assert list(sections) == ["profile", "academic", "ta_work", "research", "goals", "strengths", "additional"]
+    assert "### Research Interests" in sections["goals"]
+    assert "### Key Strengths" in sections["strengths"]
+    assert "Student Packet: Jane Smith" not in "".join(sections.values())
+    assert split_packet_sections("Just some notes") == {}
+
+
+def test_structured_packet_is_rebuilt_after_edits(tmp_path):
+    """Test that student_packet.json follows hand edits to student_packet.md."""
+    (tmp_path / "student_packet.md").write_text(PACKET)
+
+    packet = load_structured_packet(tmp_path)
+    assert packet["profile"] == {"Name": "Jane Smith", "Pronouns": "she/her", "Letter Type": "PhD Application"}
+    assert json.loads((tmp_path / STRUCTURED_PACKET_FILENAME).read_text()) == packet
+
+    (tmp_path / "student_packet.md").write_text(PACKET.replace("she/her", "they/them"))
+    assert load_structured_packet(tmp_path)["profile"]["Pronouns"] == "they/them"
+
+
+def test_letter_loads_only_the_sections_its_type_needs(tmp_path):
+    """Test the letter type, from the profile or given explicitly, selects packet sections."""
+    (tmp_path / "student_packet.md").write_text(PACKET)
+
+    phd = load_student_packet(tmp_path)
+    assert "Research Interests" in phd
+    assert "Robotics club" not in phd
+
+    job = load_student_packet(tmp_path, letter_type="job")
+    assert "Robotics club" in job
+    assert "Research Interests" not in job
+
+    full = load_student_packet(tmp_path, letter_type="full")
+    assert all(section in full for section in split_packet_sections(PACKET).values())
+
+    # A packet without recognizable sections is sent whole
+    (tmp_path / "student_packet.md").write_text("Jane was a great TA.")
+    assert load_student_packet(tmp_path) == "Jane was a great TA."
+
+    style_guide = tmp_path / "style_guide.md"
+    style_guide.write_text("# Style")
+    (tmp_path / "student_packet.md").write_text(PACKET)
+    with patch('lor.generate_letter.call_llm', return_value="Dear Committee") as mock_llm:
+        generate_letter(tmp_path, style_guide)
+    prompt = mock_llm.call_args.kwargs["messages"][1]["content"]
+    assert "Parameter-efficient learning" in prompt
+    assert "Robotics club" not in prompt
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Tests for local corpus stylometry.
+"""
+
+from lor.stylometry import compute_corpus_stats, format_stats_summary
+
+
+def make_letter(body_sentence):
+    return (
+        "__Letterhead__\n\n"
+        "Dear Committee,\n\n"
+        "I am writing to recommend [STUDENT_NAME] for your program. I know them well.\n\n"
+        f"{body_sentence}\n\n"
+        "I give [STUDENT_NAME] my highest recommendation.\n\n"
+        "Sincerely,\n\nProfessor"
+    )
+
+
+LETTERS = [
+    make_letter("[STUDENT_NAME] was a TA for my course. They were excellent."),
+    make_letter("[STUDENT_NAME] did research with me on parsing."),
+    make_letter("[STUDENT_NAME] was a TA for my course."),
+]
+
+
+def test_compute_corpus_stats_lengths_and_sections():
+    """Test sentence, paragraph and section statistics."""
+    stats = compute_corpus_stats(LETTERS)
+
+    assert stats.letter_count == 3
+    assert stats.paragraphs_per_letter.tolist() == [3, 3, 3]
+    assert stats.sentence_lengths[:2].tolist() == [9, 4]
+    assert stats.section_words["opening"].tolist() == [13, 13, 13]
+    assert stats.section_words["body"].tolist() == [10, 7, 7]
+    assert stats.opening_lines == [("i am writing to recommend [student_name] for your program.", 3)]
+    assert stats.closing_lines == [("i give [student_name] my highest recommendation.", 3)]
+
+
+def test_compute_corpus_stats_skips_markup_only_paragraphs():
+    """Test that separators such as *** or a lone __ are not counted as paragraphs."""
+    letter = "***\n\n" + make_letter("[STUDENT_NAME] was a TA for my course.\n\n__").replace("Sincerely,", "***\n\nSincerely,")
+    stats = compute_corpus_stats([letter, "__"])
+
+    assert stats.paragraphs_per_letter.tolist() == [3, 0]
+    assert stats.opening_lines == [("i am writing to recommend [student_name] for your program.", 1)]
+    assert stats.closing_lines == [("i give [student_name] my highest recommendation.", 1)]
+
+
+def test_top_phrases_count_letters_and_drop_subsumed():
+    """Test that phrases are counted once per letter and shorter duplicates are dropped."""
+    stats = compute_corpus_stats(LETTERS, ngram_sizes=(3, 5))
+    phrases = dict(stats.phrases)
+
+    assert phrases["i am writing to recommend"] == 3
+    assert phrases["was a ta for my"] == 2
+    # "am writing to" appears in exactly the letters that contain the longer phrase
+    assert "am writing to" not in phrases
+
+
+def test_format_stats_summary():
+    """Test that the summary renders counts against the corpus size."""
+    summary = format_stats_summary(compute_corpus_stats(LETTERS))
+
+    assert summary.startswith("## Corpus Statistics (3 letters, computed locally)")
+    assert "- (3/3) i give [student_name] my highest recommendation." in summary
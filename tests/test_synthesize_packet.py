@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Tests for student packet synthesis.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+from lor.synthesize_packet import (
+    allocate_material_budgets,
+    combine_materials_for_prompt,
+    condense_materials,
+    section_materials,
+    synthesize_student_packet,
+    truncate_material,
+    MIN_MATERIAL_TOKENS,
+)
+
+
+def test_allocate_material_budgets_keeps_professor_notes_whole():
+    """Test that small materials keep their size and the large ones share the rest."""
+    materials = {
+        "professor_notes": "n" * 40_000,  # 10,000 tokens
+        "statement": "s" * 8_000,  # 2,000 tokens
+        "transcript": "t" * 400_000,  # 100,000 tokens
+        "paper_1": "p" * 400_000,
+    }
+
+    budgets = allocate_material_budgets(materials, token_budget=30_000)
+
+    assert budgets == {"professor_notes": 10_000, "statement": 2_000, "transcript": 9_000, "paper_1": 9_000}
+    assert list(budgets) == list(materials)
+
+    # Professor notes over the whole budget still go through whole
+    budgets = allocate_material_budgets(materials, token_budget=5_000)
+    assert budgets["professor_notes"] == 10_000
+    assert budgets["transcript"] == MIN_MATERIAL_TOKENS
+
+
+def test_truncate_material_cuts_at_line_boundary():
+    """Test the deterministic fallback keeps whole lines and stays within budget."""
+    content = "\n".join(f"CS {100 + i}: Course {i} - A" for i in range(200))
+
+    truncated = truncate_material(content, token_budget=100)
+
+    assert truncated.startswith("CS 100: Course 0 - A\n")
+    assert "[... truncated about" in truncated
+    assert len(truncated) <= 100 * 4
+    assert truncate_material("short", token_budget=100) == "short"
+
+
+@patch('lor.synthesize_packet.get_scheduler')
+def test_condense_materials_only_condenses_oversized(mock_get_scheduler):
+    """Test that only oversized materials are condensed, concurrently, keeping order."""
+    calls = []
+
+    async def fake_submit(messages, model, temperature):
+        calls.append((model, messages[0]["content"]))
+        return "Condensed transcript"
+
+    mock_get_scheduler.return_value.submit = fake_submit
+    mock_get_scheduler.return_value.run = lambda coros: [asyncio.run(coro) for coro in coros]
+    materials = {"resume": "Resume", "transcript": "t" * 40_000, "professor_notes": "n" * 40_000}
+
+    condensed = condense_materials(materials, token_budget=12_000, model="cheap-model")
+
+    assert condensed == {"resume": "Resume", "transcript": "Condensed transcript", "professor_notes": "n" * 40_000}
+    assert len(calls) == 1
+    assert calls[0][0] == "cheap-model"
+    assert "## Material: transcript" in calls[0][1]
+
+
+def test_combine_materials_for_prompt_numbers_multiple_files():
+    """Test that several files of one type get numbered sections."""
+    prompt = combine_materials_for_prompt(
+        {"resume": "CV", "paper_1": "First", "paper_2": "Second", "professor_notes": "Notes"},
+        "PROMPT",
+    )
+
+    assert "## Research Paper 1\n\nFirst" in prompt
+    assert "## Research Paper 2\n\nSecond" in prompt
+    assert "## Academic Transcript\n\n[NOT PROVIDED]" in prompt
+    assert prompt.index("## Resume/CV") < prompt.index("## Research Paper 1") < prompt.index("## Professor Notes")
+
+
+NOTES = """# Professor's Notes
+
+- **Student Pronouns:** she/her
+- **Courses TAed with Professor Gormley:** 10-601, Fall 2023
+- **Key Strengths**: Independent debugging
+- **Weaknesses**: None observed
+"""
+
+PACKET = """# Student Packet: Jane Smith
+
+## Student Profile
+
+- **Pronouns**: she/her
+
+## Academic Performance
+
+- 10-301: A
+
+## Teaching Assistant Work
+
+- 10-601, Fall 2023
+
+## Research Contributions
+
+- LoRA baselines
+
+## Goals and Experience Alignment
+
+- PhD in ML
+
+## Strengths from Professor's Perspective
+
+- Independent debugging
+
+## Additional Information
+
+- Robotics club
+"""
+
+
+def test_section_materials_keeps_relevant_note_fields():
+    """Test that sections get their own note fields and any field no section claims."""
+    materials = {"transcript": "Transcript", "statement": "Statement", "professor_notes": NOTES}
+
+    strengths = section_materials(materials, "strengths")
+    assert list(strengths) == ["professor_notes"]
+    assert "Independent debugging" in strengths["professor_notes"]
+    assert "Weaknesses" in strengths["professor_notes"]
+    assert "10-601" not in strengths["professor_notes"]
+
+    assert list(section_materials(materials, "goals")) == ["statement"]
+    assert "Key Strengths" not in section_materials(materials, "academic")["professor_notes"]
+
+
+@patch('lor.synthesize_packet.get_scheduler')
+@patch('lor.synthesize_packet.call_llm', return_value=PACKET)
+def test_notes_edit_regenerates_only_affected_section(mock_llm, mock_get_scheduler, tmp_path):
+    """Test that editing one note field costs one section call, spliced into the packet."""
+    prompts = []
+
+    async def fake_submit(messages, model=None, temperature=None):
+        prompts.append(messages[1]["content"])
+        return "## Strengths from Professor's Perspective\n\n- Independent debugging\n- Mentors new TAs"
+
+    mock_get_scheduler.return_value.submit = fake_submit
+    mock_get_scheduler.return_value.run = lambda coros: [asyncio.run(coro) for coro in coros]
+    (tmp_path / "input").mkdir()
+    (tmp_path / "input" / "statement.txt").write_text("I want a PhD in ML")
+    (tmp_path / "input" / "professor_notes.md").write_text(NOTES)
+
+    synthesize_student_packet(tmp_path)
+    assert mock_llm.call_count == 1
+
+    # Nothing changed: no calls at all
+    synthesize_student_packet(tmp_path)
+    assert mock_llm.call_count == 1
+    assert prompts == []
+
+    # A hand edit elsewhere survives the section update
+    packet_path = tmp_path / "student_packet.md"
+    packet_path.write_text(packet_path.read_text().replace("Robotics club", "Robotics club president"))
+    (tmp_path / "input" / "professor_notes.md").write_text(NOTES + "- **Standout Moments**: Mentors new TAs\n")
+    synthesize_student_packet(tmp_path)
+
+    assert mock_llm.call_count == 1
+    assert len(prompts) == 1
+    assert "Mentors new TAs" in prompts[0]
+    assert "I want a PhD in ML" not in prompts[0]
+    packet = packet_path.read_text()
+    assert "- Mentors new TAs" in packet
+    assert "Robotics club president" in packet
+    assert packet.index("## Research Contributions") < packet.index("Mentors new TAs") < packet.index("## Additional")
+
+    synthesize_student_packet(tmp_path, force=True)
+    assert mock_llm.call_count == 2
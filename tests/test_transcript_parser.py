@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Tests for the local transcript parser.
+"""
+
+from lor.llm import estimate_tokens
+from lor.synthesize_packet import tabulate_transcripts
+from lor.transcript_parser import parse_transcript, transcript_to_table
+
+TRANSCRIPT = """\
+STANFORD UNIVERSITY Unofficial Transcript Page 1 of 2
+Name: Jane Smith    Student ID: 01234567
+Program: Computer Science BS    Major: Computer Science
+Course Title Units Grade Points
+Autumn Quarter 2022
+CS 106B Programming Abstractions 5.00 A 20.00
+MATH 51 Linear Algebra and Multivariable Calculus 5.00 A- 18.50
+PWR 1 Writing and Rhetoric 4.00 B+ 13.20
+Term GPA: 3.77
+Winter 2023
+CS 107 Computer Organization and Systems 5.00 A+ 20.00
+CS 103 Mathematical Foundations of Computing 5.00 A 20.00
+ESF 12 Education as Self-Fashioning 3.00 CR
+Dean's List, Winter 2023
+Cumulative GPA: 3.85
+"""
+
+
+def test_parse_transcript_groups_courses_by_term():
+    """Test recognizing courses, terms, stated GPAs and honors lines."""
+    transcript = parse_transcript(TRANSCRIPT)
+
+    assert [course.code for course in transcript.courses] == ["CS 106B", "MATH 51", "PWR 1", "CS 107", "CS 103", "ESF 12"]
+    assert transcript.terms == ["Autumn 2022", "Winter 2023"]
+    assert transcript.courses[1].title == "Linear Algebra and Multivariable Calculus"
+    assert transcript.courses[1].grade == "A-"
+    assert transcript.term_gpas == {"Autumn 2022": 3.77}
+    assert transcript.cumulative_gpa == 3.85
+    assert transcript.notes == ["Program: Computer Science BS Major: Computer Science", "Dean's List, Winter 2023"]
+    # Pass/fail grades don't count towards the computed GPA
+    assert transcript.computed_gpa("Winter 2023") == 4.0
+
+
+def test_transcript_to_table_is_compact_and_declines_unparseable_text():
+    """Test the table keeps every course but is smaller, and unknown layouts are left alone."""
+    table = transcript_to_table(TRANSCRIPT)
+
+    assert "### Winter 2023 (GPA 4.00 (computed))" in table
+    assert "| CS 107 | Computer Organization and Systems | 5 | A+ |" in table
+    assert "- Cumulative GPA: 3.85" in table
+    assert "Page 1 of 2" not in table
+    assert transcript_to_table("Jane took algorithms and got an A.") is None
+
+    padded = TRANSCRIPT + "\n".join("Grading legend and registrar boilerplate" for _ in range(50))
+    assert estimate_tokens(transcript_to_table(padded)) < estimate_tokens(padded)
+
+    materials = {"transcript": padded, "resume": "CS 106B Programming Abstractions 5.00 A 20.00\n" * 3}
+    tabulated = tabulate_transcripts(materials)
+    assert tabulated["transcript"] == transcript_to_table(padded)
+    assert tabulated["resume"] == materials["resume"]
+
+
+CMU_TRANSCRIPT = """\
+Carnegie Mellon University Academic Record
+Fall 2022
+10-301 Introduction to Machine Learning 12.0 A
+15-213 Introduction to Computer Systems 12.0 A
+21-241 Matrices and Linear Transformations 10.0 B
+Semester QPA: 3.75 Cumulative QPA: 3.75
+Spring 2023
+10-403 Deep Reinforcement Learning and Control 12.0 A
+Semester QPA: 4.00 Cumulative QPA: 3.81
+"""
+
+
+def test_parse_transcript_reads_cmu_course_codes():
+    """Test department-number course codes such as 10-301."""
+    transcript = parse_transcript(CMU_TRANSCRIPT)
+
+    assert [course.code for course in transcript.courses] == ["10-301", "15-213", "21-241", "10-403"]
+    assert transcript.terms == ["Fall 2022", "Spring 2023"]
+    assert transcript.unparsed_course_lines == []
+    assert "| 10-301 | Introduction to Machine Learning | 12 | A |" in transcript_to_table(CMU_TRANSCRIPT)
+
+
+def test_transcript_table_uses_stated_qpas():
+    """Test that CMU's stated QPAs are kept rather than recomputed from letter grades."""
+    transcript = parse_transcript(CMU_TRANSCRIPT)
+
+    assert transcript.term_gpas == {"Fall 2022": 3.75, "Spring 2023": 4.0}
+    assert transcript.cumulative_gpa == 3.81
+    assert round(transcript.computed_gpa("Fall 2022"), 2) == 3.71
+
+    table = transcript_to_table(CMU_TRANSCRIPT)
+    assert "### Fall 2022 (GPA 3.75)" in table
+    assert "- Cumulative GPA: 3.81" in table
+    assert "(computed)" not in table.split("\n", 1)[1]
+
+
+def test_transcript_to_table_declines_when_many_course_lines_dont_parse():
+    """Test a partial parse is not passed off as the whole transcript."""
+    partial = TRANSCRIPT + "\n".join(
+        f"(CSE{number}) Course number {number} 4.00 A" for number in range(300, 306)
+    )
+
+    assert len(parse_transcript(partial).courses) == 6
+    assert len(parse_transcript(partial).unparsed_course_lines) == 6
+    assert transcript_to_table(partial) is None